@@ -0,0 +1,193 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import time
+
+import numpy as np
+import pandas as pd
+
+import player_data
+import season_cube
+from catalog import catalog_path
+from dataset_generator import column_creator, dataset_generator, extra_player_columns
+from synthetic_data import SYNTHETIC_SEASONS, synthetic_data
+
+# Times the aggregation hot paths on a data tree, real or written by 'synthetic_data', and saves the results as JSON so
+# runs on different commits can be compared
+
+BENCHMARKS_PATH = "data/benchmarks"
+WINDOW_SIZES = [1, 5, 19, 38]  # gameweeks of each 'data_lister' window, starting from the first gameweek
+BENCHMARK_REPEAT = 3
+
+
+def timed(function, repeat=BENCHMARK_REPEAT, setup=None):
+    """
+    Times 'repeat' calls of 'function', calling 'setup' untimed before each of them
+
+    :return: dict, the seconds of each call and their minimum and median
+    """
+
+    seconds = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        seconds.append(time.perf_counter() - start)
+
+    return {"seconds": seconds, "min": min(seconds), "median": statistics.median(seconds)}
+
+
+def derived_clear(season):
+    """Removes the files PlayerData derives from a season's data, so the next query starts from the data alone"""
+    player_data.REGISTRY.clear()
+    paths = [player_data.PlayerData(season).cumulative_path(),
+             catalog_path("fpl_index", season)]
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+    shutil.rmtree(season_cube.cube_path(season), ignore_errors=True)
+
+
+def commit_id():
+    """Commit of the code benchmarked, marked '-dirty' when it has uncommitted changes. None outside a git repository"""
+    repository = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=repository, capture_output=True, text=True,
+                                check=True).stdout.strip()
+        changes = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=repository,
+                                 capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return commit + ("-dirty" if changes else "")
+
+
+def benchmark_suite(season=20, windows=WINDOW_SIZES, repeat=BENCHMARK_REPEAT, generator=True, jobs=1):
+    """
+    Times PlayerData on a season of the data tree in the current folder, then a full 'dataset_generator' run
+
+    'cold' calls start from a new PlayerData without the files it derives(see 'derived_clear'), 'warm' calls are
+    repeated on the same PlayerData.
+
+    :param
+        season: int -> season PlayerData is timed on
+        windows: list -> gameweeks of each 'data_lister' window timed
+        repeat: int -> calls timed of each benchmark, 'dataset_generator' is run once
+        generator: bool -> also time 'dataset_generator' with gameweeks 1 to 5 and a target of 5, which needs every
+            season it reads
+        jobs: int -> processes 'dataset_generator' collates seasons in
+
+    :return: dict, results of each benchmark(see 'timed') along with the commit, versions and data they were timed on
+    """
+
+    results = {}
+
+    def data():
+        return player_data.PlayerData(season)
+
+    # Creating PlayerData and reading fixtures, headers and players
+    def init():
+        data_obj = data()
+        return data_obj.fixtures, data_obj.headers, data_obj.players
+
+    results["init"] = timed(init, repeat, setup=player_data.headers_reader.cache_clear)
+
+    gameweeks = int(data().fixtures.dropna()["gameweek"].max())
+    for window in windows:
+        gameweek_range = [1, min(1 + window, gameweeks + 1)]
+        results[f"data_lister_{window}_cold"] = timed(
+            lambda: data().data_lister(gameweek_range=gameweek_range), repeat, setup=lambda: derived_clear(season))
+        warm = data()
+        warm.data_lister(gameweek_range=gameweek_range)
+        results[f"data_lister_{window}_warm"] = timed(
+            lambda: warm.data_lister(gameweek_range=gameweek_range), repeat)
+
+    # Every extra player column, on the player stats of every team over the season
+    season_stats = data().data_lister()
+    player_stats = pd.concat([season_stats[team]["player_stats"] for team in data().players], ignore_index=True)
+    stats_copy = {}
+
+    def column_setup():
+        stats_copy["df"] = player_stats.copy()
+
+    def columns_create():
+        for exprssn in extra_player_columns:
+            column_creator(df=stats_copy["df"], expression=exprssn)
+
+    results["column_creator"] = timed(columns_create, repeat, setup=column_setup)
+    results["column_creator"]["rows"] = len(player_stats)
+    results["column_creator"]["expressions"] = len(extra_player_columns)
+
+    if generator:
+        os.makedirs("datasets", exist_ok=True)
+
+        def generator_setup():
+            for generator_season in SYNTHETIC_SEASONS:
+                derived_clear(generator_season)
+
+        results["dataset_generator"] = timed(lambda: dataset_generator([1, 5], 0, 5, jobs=jobs), 1,
+                                             setup=generator_setup)
+        results["dataset_generator"]["jobs"] = jobs
+
+    fixtures = data().fixtures
+    return {
+        "commit": commit_id(),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "data": {"folder": os.getcwd(), "season": season, "teams": len(data().players),
+                 "fixtures_played": int(fixtures["score"].notna().sum()), "gameweeks": gameweeks},
+        "benchmarks": results
+    }
+
+
+def benchmark_save(summary):
+    """Writes the results of 'benchmark_suite' to the benchmarks folder, one JSON file per run, and returns its path"""
+    os.makedirs(BENCHMARKS_PATH, exist_ok=True)
+    commit = (summary["commit"] or "unknown")[:12]
+    file_path = f"{BENCHMARKS_PATH}/{summary['started_at'].replace(':', '')} {commit}.json"
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump(summary, file, indent=4)
+
+    return file_path
+
+
+def benchmark_report(summary):
+    data = summary["data"]
+    print(f"Commit {summary['commit']}, season {data['season']}: {data['teams']} teams, "
+          f"{data['fixtures_played']} fixtures played")
+    for name, result in summary["benchmarks"].items():
+        print(f"    {name}: min {result['min']:.3f}s, median {result['median']:.3f}s over {len(result['seconds'])} run(s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time PlayerData and dataset_generator on a data tree, saving the results to data/benchmarks")
+    parser.add_argument("root", help="folder holding the data tree")
+    parser.add_argument("--season", type=int, default=20)
+    parser.add_argument("--windows", type=int, nargs="+", default=WINDOW_SIZES)
+    parser.add_argument("--repeat", type=int, default=BENCHMARK_REPEAT)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--no-generator", action="store_true",
+                        help="skip the 'dataset_generator' run")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="first write a synthetic data tree to 'root', see 'synthetic_data'")
+    parser.add_argument("--teams", type=int, default=None,
+                        help="with 'synthetic', number of teams")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        options = {} if args.teams is None else {"teams": args.teams}
+        synthetic_data(args.root, **options)
+
+    os.chdir(args.root)
+    summary = benchmark_suite(season=args.season, windows=args.windows, repeat=args.repeat,
+                              generator=not args.no_generator, jobs=args.jobs)
+    benchmark_report(summary)
+    print(f"Benchmarks saved to '{benchmark_save(summary)}'")
@@ -0,0 +1,161 @@
+import os
+
+# Competitions and seasons the data is collated for. Each season of a competition is a partition of its own: every file
+# of it lives under the paths of PATHS filled in for that competition and season, so a query opens the partitions of the
+# competitions and seasons it asks for and nothing else.
+#
+# Seasons are the last two digits of the year they start in, e.g. 20 for 2020-2021. fbref season ids are those of
+# finished seasons, None for the ongoing one whose pages live at the competition's own address.
+
+COMPETITION = "Premier League"  # competition read when none is given
+COMPETITIONS = {
+    "Premier League": {
+        "code": "PL",
+        "fbref_id": 9,
+        "fbref_name": "Premier-League",
+        "fbref_seasons": {17: 1631, 18: 1889, 19: 3232, 20: 10728, 21: None},
+        "fpl": True,  # has Fantasy Premier League gameweek files
+        "fpl_id_names": 18  # first season whose FPL names end with the element id e.g. 'Mohamed_Salah_191', None if none
+    }
+}
+
+# Paths of each kind of file of a partition, filled in with 'competition', 'code', 'season_name'('2020-2021') and
+# 'short_name'('2020-21')
+PATHS = {
+    "headers": "data/{competition}/header information",
+    "fixtures": "data/{competition}/scores and fixtures/{season_name} {code} Scores & Fixtures.csv",
+    "players": "data/{competition}/player information/{season_name} player_info.json",
+    "reports": "data/{competition}/reports/{season_name}",  # as written by data_retriever
+    "reports_short": "data/{competition}/reports/{short_name}",  # as read by PlayerData before report folders moved
+    "snapshots": "data/{competition}/snapshots/{season_name}",
+    "store": "data/{competition}/store/{season_name}",
+    "aggregates": "data/{competition}/aggregates/{short_name}.pkl",
+    "cube": "data/{competition}/cube/{season_name}",
+    "scrape_stats": "data/{competition}/scrape stats/{season_name}",
+    "fpl_gameweeks": "data/Fantasy {competition}/{short_name} gws",
+    "fpl_index": "data/Fantasy {competition}/{short_name} player_index.json"
+}
+FPL_PATHS = ["fpl_gameweeks", "fpl_index"]  # only competitions with FPL data have them
+
+FBREF_PREFIX = "https://fbref.com/en/comps"
+
+
+def competition_info(competition=COMPETITION):
+    """Catalog entry of a competition"""
+    if competition not in COMPETITIONS:
+        raise Exception(
+            f"'competition' expects one of {', '.join(COMPETITIONS)}")
+
+    return COMPETITIONS[competition]
+
+
+def seasons(competition=COMPETITION):
+    """Seasons of a competition, oldest first"""
+    return sorted(competition_info(competition)["fbref_seasons"])
+
+
+def current_season(competition=COMPETITION):
+    """Latest season of a competition, the one still being played when it has no fbref season id"""
+    return seasons(competition)[-1]
+
+
+def season_name(season):
+    return f"{2000 + season}-{2001 + season}"
+
+
+def short_name(season):
+    return f"{2000 + season}-{(season + 1) % 100:02d}"
+
+
+def fpl_id_names(season, competition=COMPETITION):
+    """Whether the FPL gameweek files of a season end player names with their element id, see 'COMPETITIONS'"""
+    first = competition_info(competition).get("fpl_id_names")
+    return first is not None and season >= first
+
+
+def season_range_text(competition=COMPETITION):
+    """Seasons of a competition as described in error messages, e.g. '17 to 21 representing 2017-2018 to 2021-2022'"""
+    first, last = seasons(competition)[0], seasons(competition)[-1]
+    return f"{first} to {last} representing {season_name(first)} to {season_name(last)}"
+
+
+def season_exists(season, competition=COMPETITION):
+    """Whether a season of a competition is in the catalog"""
+    return season in competition_info(competition)["fbref_seasons"]
+
+
+def season_check(season, competition=COMPETITION):
+    """Raises an Exception when a season of a competition is not in the catalog"""
+    if not season_exists(season, competition):
+        raise Exception(
+            f"'season' expects value from {season_range_text(competition)} for {competition}")
+
+
+def catalog_path(kind, season=None, competition=COMPETITION):
+    """
+    Path of a kind of file of PATHS, for a season of a competition
+
+    :param
+        kind: str -> key of PATHS
+        season: int | None -> season of the partition, None for paths shared by every season
+        competition: str -> competition of the partition
+    """
+
+    info = competition_info(competition)
+    if kind in FPL_PATHS and not info["fpl"]:
+        raise Exception(f"{competition} has no FPL data")
+
+    fields = {"competition": competition, "code": info["code"]}
+    if season is not None:
+        fields.update(season_name=season_name(season), short_name=short_name(season))
+
+    return PATHS[kind].format(**fields)
+
+
+def fbref_url(page, season, competition=COMPETITION):
+    """
+    Address of a season's page on fbref
+
+    :param
+        page: str -> 'stats'(teams of a season) or 'schedule'(scores and fixtures)
+    """
+
+    season_check(season, competition)
+    info = competition_info(competition)
+    season_id = info["fbref_seasons"][season]
+    name = info["fbref_name"]
+    prefix = f"{FBREF_PREFIX}/{info['fbref_id']}"
+
+    if page == "stats":
+        if season_id is None:
+            return f"{prefix}/{name}-Stats"
+        return f"{prefix}/{season_id}/{season_name(season)}-{name}-Stats"
+    if page == "schedule":
+        if season_id is None:
+            return f"{prefix}/schedule/{name}-Scores-and-Fixtures"
+        return f"{prefix}/{season_id}/schedule/{season_name(season)}-{name}-Scores-and-Fixtures"
+
+    raise Exception("'page' expects 'stats' or 'schedule'")
+
+
+def partitions(competitions=None, seasons_wanted=None, kind="fixtures"):
+    """
+    Partitions of the catalog a query touches whose 'kind' of file exists
+
+    :param
+        competitions: list | None -> competitions queried, all when None
+        seasons_wanted: list | None -> seasons queried, all seasons of each competition when None
+        kind: str -> key of PATHS a partition needs to be returned
+
+    :return: list, (competition, season) of each partition, in catalog order
+    """
+
+    found = []
+    for competition in (COMPETITIONS if competitions is None else competitions):
+        for season in seasons(competition):
+            if seasons_wanted is not None and season not in seasons_wanted:
+                continue
+            if os.path.exists(catalog_path(kind, season, competition)):
+                found.append((competition, season))
+
+    return found
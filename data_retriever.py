@@ -1,13 +1,31 @@
+import argparse
+import gzip
+import hashlib
 import json
+import multiprocessing
 import os
+import queue
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
 
 import pandas as pd
-import requests
 from bs4 import BeautifulSoup
 
-# All data gotten here is from scraping the https://fbref.com website for Premier League
+import report_store
+from catalog import COMPETITION, catalog_path, current_season, fbref_url, season_exists, season_name, season_range_text
+from http_session import FetchSession
+from response_cache import ResponseCache
+from scrape_stats import ScrapeStats, StageClock
 
-SEASON_RANGE = range(17, 22)
+# All data gotten here is from scraping the https://fbref.com website, for the competitions and seasons of 'catalog'
+
+FBREF_RATE_LIMIT = 1  # requests per second sent to fbref
+CURRENT_SEASON_TTL = 6 * 60 * 60  # seconds before pages of the ongoing season are downloaded again
+RESPONSE_CACHE = ResponseCache()
+SESSION = FetchSession()  # shared by every request sent to fbref
 COLUMNS = ['player',
            'position',
            'age',
@@ -121,6 +139,204 @@ COLUMNS = ['player',
            'progressive_passes_received',
            ]
 
+COLUMN_INDEX = {column: indx for indx, column in enumerate(COLUMNS)}
+
+# Order in which the categories of the player stats header make up COLUMNS
+STATS_CATEGORIES = ['misc', 'passing', 'passing_types',
+                    'defense', 'attack', 'possession']
+
+# Categories of the player stats header filled by each of the six player stats tables of a match report, in page order
+STATS_KEY = {
+    0: ["misc", "attack"],
+    1: ["passing"],
+    2: ["passing_types"],
+    3: ["defense"],
+    4: ["possession"],
+    5: ["misc", "defense"]
+}
+
+
+class RateLimiter:
+    """Spaces out requests so each host receives at most 'rate' requests per second, shared across threads"""
+
+    def __init__(self, rate=None):
+        self.interval = 1 / rate if rate else 0
+        self.next_request = {}  # earliest time the next request to each host may be sent
+        self.lock = threading.Lock()
+
+    def wait(self, url):
+        """Blocks until a request to the host of 'url' is allowed"""
+        if not self.interval:
+            return
+
+        host = urlparse(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_request.get(host, now))
+            self.next_request[host] = slot + self.interval
+
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def season_ttl(season, competition=COMPETITION):
+    """Time to live for pages of a season, pages of finished seasons never expire"""
+    return CURRENT_SEASON_TTL if season == current_season(competition) else None
+
+
+def fetch_page(url, ttl=None, rate_limiter=None, cache=RESPONSE_CACHE, stats=None, fixture=None):
+    """
+    Returns the html of 'url', from 'cache' when it holds an unexpired copy
+
+    stats: ScrapeStats | None -> records the time spent and bytes downloaded, towards 'fixture' if given
+    """
+    start = time.perf_counter()
+    if cache is not None:
+        text = cache.get(url)
+        if text is not None:
+            if stats is not None:
+                stats.add(fixture, fetch_seconds=time.perf_counter() - start, cache_hits=1)
+            return text
+
+    # Every attempt, retries included, waits for the rate limiter
+    response = SESSION.get(url, rate_limiter=rate_limiter)
+    if stats is not None:
+        stats.add(fixture, fetch_seconds=time.perf_counter() - start,
+                  bytes_downloaded=len(response.content))
+
+    # Error pages are not cached so they are retried on the next run
+    if cache is not None and response.status_code == 200:
+        cache.put(url, response.text, ttl=ttl)
+
+    return response.text
+
+
+def stats_dispatch(header_dictionary):
+    """
+    Maps the 'data-stat' of each cell in every player stats table to the category and column of COLUMNS it fills
+
+    :return: list, one dictionary per table in STATS_KEY order of the form {data-stat: (category, column)}
+    """
+
+    # Columns are COLUMNS in the order of STATS_CATEGORIES
+    columns = {}
+    offset = 0
+    for category in STATS_CATEGORIES:
+        for indx, stat in enumerate(header_dictionary[category]):
+            columns[(category, stat)] = COLUMNS[offset + indx]
+        offset += len(header_dictionary[category])
+
+    dispatch = []
+    for indx in range(len(STATS_KEY)):
+        table_dispatch = {}
+        for category in STATS_KEY[indx]:
+            for stat in header_dictionary[category]:
+                table_dispatch.setdefault(stat, (category, columns[(category, stat)]))
+        dispatch.append(table_dispatch)
+
+    return dispatch
+
+
+def player_stats_tables(soup, teams, dispatch, clock=None):
+    """
+    Collates the player stats tables of each team in 'teams' from a match report into one DataFrame with COLUMNS as columns
+
+    Cells shown in more than one table(e.g. 'position', 'interceptions') are taken from the first table showing them.
+    clock: StageClock | None -> splits the time spent between the 'parse' and 'frame' stages
+
+    :return: dict, team name -> pandas DataFrame
+    """
+
+    # Single pass over the page to find the stats tables of every team
+    captions = {f"{team} Player Stats Table": [] for team in teams}
+    for caption in soup.find_all(text=list(captions.keys())):
+        captions[str(caption)].append(caption.parent.parent)
+
+    team_dfs = {}
+    for team in teams:
+        rows = {}  # player name -> row of values in COLUMNS order
+
+        stats_tables = captions[f"{team} Player Stats Table"]
+        for indx in range(len(stats_tables)):
+            table_dispatch = dispatch[indx]
+            trows = stats_tables[indx].find("tbody").find_all("tr", recursive=False)
+            for row in trows:
+                name = row.find("th").find("a").text
+                values = rows.get(name)
+                if values is None:
+                    values = [None] * len(COLUMNS)
+                    values[COLUMN_INDEX["player"]] = name
+                    rows[name] = values
+
+                for datum in row.find_all("td", recursive=False):
+                    target = table_dispatch.get(datum["data-stat"])
+                    if target is not None:
+                        column = COLUMN_INDEX[target[1]]
+                        if values[column] is None:
+                            values[column] = datum.text
+
+        if clock is not None:
+            clock.lap("parse")
+        team_dfs[team] = pd.DataFrame(list(rows.values()), columns=COLUMNS)
+        if clock is not None:
+            clock.lap("frame")
+
+    return team_dfs
+
+
+def file_hashes(folder_path):
+    """sha256 of each file in a folder"""
+    hashes = {}
+    for file_name in sorted(os.listdir(folder_path)):
+        with open(f"{folder_path}/{file_name}", "rb") as file:
+            hashes[file_name] = hashlib.sha256(file.read()).hexdigest()
+
+    return hashes
+
+
+def report_complete(folder_path):
+    """Checks a report folder holds match_info.json, shot_stats.csv and the player and goalkeeper stats of both teams"""
+    try:
+        with open(f"{folder_path}/match_info.json", encoding="utf-8") as file:
+            teams = list(json.load(file)["formations"].keys())
+        file_names = set(os.listdir(folder_path))
+    except (OSError, ValueError, KeyError):
+        return False
+
+    expected = {"match_info.json", "shot_stats.csv"}
+    for team in teams:
+        expected.update({f"{team} stats.csv", f"{team} gk_stats.csv"})
+
+    return len(teams) == 2 and expected.issubset(file_names)
+
+
+def report_intact(folder_path, entry, verify=False):
+    """Checks every file recorded for a report in the manifest exists, and if 'verify', still has its recorded hash"""
+    if verify:
+        try:
+            return file_hashes(folder_path) == entry["files"]
+        except OSError:
+            return False
+
+    return all(os.path.isfile(f"{folder_path}/{file_name}") for file_name in entry["files"])
+
+
+def manifest_load(reports_path):
+    """Reads the manifest of completed fixtures in a season's report folder"""
+    try:
+        with open(f"{reports_path}/manifest.json", encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {"fixtures": {}}
+
+
+def manifest_save(reports_path, manifest):
+    """Writes the manifest of completed fixtures, replacing the previous one atomically"""
+    with open(f"{reports_path}/manifest.json.tmp", "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=4)
+    os.replace(f"{reports_path}/manifest.json.tmp",
+               f"{reports_path}/manifest.json")
+
 
 def folder_create(folder_path):
     # Creates folder for each fixture retrieved
@@ -146,332 +362,836 @@ def file_create(file_details, file_name, file_path):
         return False
 
 
-def players_with_team_position(season):
-    """Returns list of players in a team and whether or not they are an outfield player or a goalkeeper"""
+def snapshots_path(season, competition=COMPETITION):
+    """Folder holding the compressed html snapshots of a season"""
+    return catalog_path("snapshots", season, competition)
+
+
+def snapshot_save(page, file_path):
+    """Stores a gzip compressed copy of a page's html"""
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with gzip.open(f"{file_path}.tmp", "wt", encoding="utf-8") as file:
+        file.write(page)
+    os.replace(f"{file_path}.tmp", file_path)
 
-    if season not in SEASON_RANGE:
-        print("Season should range from 17 to 21 representing 2017-2018 to 2021-2022.")
-        return
 
-    # Links corresponding to seasons specified
-    SEASON_STATS = {
-        "2021-2022": "https://fbref.com/en/comps/9/Premier-League-Stats",
-        "2020-2021": "https://fbref.com/en/comps/9/10728/2020-2021-Premier-League-Stats",
-        "2019-2020": "https://fbref.com/en/comps/9/3232/2019-2020-Premier-League-Stats",
-        "2018-2019": "https://fbref.com/en/comps/9/1889/2018-2019-Premier-League-Stats",
-        "2017-2018": "https://fbref.com/en/comps/9/1631/2017-2018-Premier-League-Stats"
+def snapshot_load(file_path):
+    """Reads the html of a page stored by 'snapshot_save'"""
+    with gzip.open(file_path, "rt", encoding="utf-8") as file:
+        return file.read()
+
+
+def headers_load(competition=COMPETITION):
+    """Reads the player, goalkeeper and shots stats header information"""
+    path = catalog_path("headers", competition=competition)
+
+    # Player stats header information
+    with open(f"{path}/headers.json", encoding="utf-8") as hdr:
+        header_dictionary = json.load(hdr)
+
+    # Goalkeeper stats header information
+    with open(f"{path}/gk_headers.json", encoding="utf-8") as gk_hdr:
+        gk_header_dictionary = json.load(gk_hdr)
+    gk_header_dictionary = gk_header_dictionary["List"]
+
+    # Shots stats header information
+    with open(f"{path}/sh_headers.json", encoding="utf-8") as sh_hdr:
+        sh_header_dictionary = json.load(sh_hdr)
+    sh_header_dictionary = sh_header_dictionary["List"]
+
+    return {
+        "header": header_dictionary,
+        "gk_header": gk_header_dictionary,
+        "sh_header": sh_header_dictionary,
+        "stats_dispatch": stats_dispatch(header_dictionary)
     }
 
-    # Links of teams belonging to a season and link to players list
+
+def parse_team_links(page):
+    """Links of teams listed on a season's stats page"""
     team_links = {}
-    response = requests.get(SEASON_STATS[f"20{season}-20{season + 1}"])
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = BeautifulSoup(page, "html.parser")
     table = soup.find("caption").parent
     trows = table.find("tbody").find_all("tr")
     for row in trows:
         link = row.find("td").find("a")
         team_links[link.text] = link["href"]
 
+    return team_links
+
+
+def parse_squad(page):
+    """Outfield players and goalkeepers listed on a team's squad page"""
+    squad = {
+        "outfield": [],
+        "goalkeeper": []
+    }
+    soup = BeautifulSoup(page, "html.parser")
+    trows = soup.find("tbody").find_all("tr")
+    for row in trows:
+        if row.get("class") is None:
+            player = row.find("th").text
+            outfield = False if row.find(
+                "td", {"data-stat": "position"}).text == "GK" else True
+            if outfield:
+                squad["outfield"].append(player)
+            else:
+                squad["goalkeeper"].append(player)
+
+    return squad
+
+
+def parse_scores_and_fixtures(page, timings=None):
+    """
+    Scores and fixtures listed on a season's schedule page as a pandas DataFrame
+
+    timings: dict | None -> filled with the seconds spent parsing html('parse') and building the DataFrame('frame')
+    """
+    clock = StageClock(timings)
+    soup = BeautifulSoup(page, "html.parser")
+    trows = soup.find("tbody").find_all("tr")
+
+    headers = ["gameweek", "date", "squad_a",
+               "score", "squad_b", "match_report"]
+    match_reports = {}
+
+    for i in headers:
+        match_reports[i] = []
+    for row in trows:
+        gmwk = row.find("th")
+        if gmwk.text not in ["", "Wk"]:
+            match_reports["gameweek"].append(gmwk.text)
+            match_stats = row.find_all("td")
+            for stat in match_stats:
+                if stat["data-stat"] in headers:
+                    if stat["data-stat"] != "match_report":
+                        match_reports[stat["data-stat"]].append(stat.text)
+                    else:
+                        href = stat.find("a")
+                        link = href["href"].split(
+                            "?")[0] if href != None else None
+                        match_reports["match_report"].append(link)
+
+    clock.lap("parse")
+    scores_and_fixtures_df = pd.DataFrame(match_reports)
+    clock.lap("frame")
+
+    return scores_and_fixtures_df
+
+
+def parse_match_report(page, squad_a, squad_b, headers, timings=None):
+    """
+    Collates match information, shots stats and player and goalkeeper stats of both teams from a match report
+
+    timings: dict | None -> filled with the seconds spent parsing html('parse') and building DataFrames('frame')
+
+    :return: dict, with keys 'match_info'(dict), 'shot_stats'(pandas DataFrame), 'player_stats' and 'gk_stats'(dict of
+        team name -> pandas DataFrame)
+    """
+
+    header_dictionary = headers["header"]
+    gk_header_dictionary = headers["gk_header"]
+    sh_header_dictionary = headers["sh_header"]
+    clock = StageClock(timings)
+
+    # Match information includes scores, manager and captain names, score xG, formations, team names, possession
+    soup = BeautifulSoup(page, "html.parser")
+
+    match_info = {}
+
+    scorebox = soup.find("div", class_="scorebox")
+    mngrs_caps = scorebox.find_all("div", class_="datapoint")
+    managers_captains = []
+    for item in mngrs_caps:
+        managers_captains.append(item.text)
+
+    match_info["managers_captains"] = managers_captains
+
+    xgs = scorebox.find_all("div", class_="score_xg")
+    score_xgs = []
+    for i in xgs:
+        score_xgs.append(i.text)
+
+    match_info["score_xgs"] = score_xgs
+
+    frmtns = soup.find_all("div", class_="lineup")
+    formations = {}
+
+    for f in frmtns:
+        text = f.find("th").text
+        team_frmtn = text.split(" (")
+        formations[team_frmtn[0]] = team_frmtn[1].replace(")", "")
+
+    match_info["formations"] = formations
+
+    trows = soup.find("div", {"id": "team_stats"}).find(
+        "table").find_all("tr")
+
+    possession = trows[2].text.replace("\n", "").split("%")[:-1]
+    match_info["possession"] = possession
+
+    events = soup.find(text="Match Summary").parent.parent
+
+    home = events.find_all(class_="event a")
+    away = events.find_all(class_="event b")
+
+    substitutes = {}
+
+    substitutes[squad_a] = {}
+    for event in home:
+        if event.find("div", class_="event_icon substitute_in") is not None:
+            playrs = event.find_all("a")
+            if len(playrs) == 2:
+                substitutes[squad_a
+                            ][playrs[0].text] = playrs[1].text
+
+    substitutes[squad_b] = {}
+    for event in away:
+        if event.find("div", class_="event_icon substitute_in") is not None:
+            playrs = event.find_all("a")
+            if len(playrs) == 2:
+                substitutes[squad_b
+                            ][playrs[0].text] = playrs[1].text
+
+    match_info["substitutes"] = substitutes
+
+    # Shots stats based on column names specified in shots stats header information
+    sh_match_stats_table = {s: [] for s in sh_header_dictionary}
+
+    sh_stats_table = soup.find(text="Shots Table").parent.parent
+    trows = sh_stats_table.find("tbody").find_all("tr")
+    for row in trows:
+        tdata = row.find_all("td")
+        for datum in tdata:
+            if datum["data-stat"] in list(sh_match_stats_table.keys()):
+                if datum.find("a") is not None:
+                    sh_match_stats_table[datum["data-stat"]
+                                         ].append(datum.find("a").text)
+                else:
+                    sh_match_stats_table[datum["data-stat"]
+                                         ].append(datum.text)
+
+    clock.lap("parse")
+    sh_stat_df = pd.DataFrame(sh_match_stats_table)
+    clock.lap("frame")
+
+    # Player and goalkeeper data based on column names specified in player and goalkeeper stats header information
+    dispatch = headers.get("stats_dispatch") or stats_dispatch(header_dictionary)
+    teams = list(match_info["formations"].keys())
+    team_dfs = player_stats_tables(soup, teams, dispatch, clock)
+
+    gk_dfs = {}
+    for team in teams:
+        gk_match_info = {item: [] for item in gk_header_dictionary}
+        gk_match_stats_table = {team: gk_match_info}
+
+        gk_stats_table = soup.find(
+            text=f"{team} Goalkeeper Stats Table").parent.parent
+        trows = gk_stats_table.find("tbody").find_all("tr")
+        for row in trows:
+            name = row.find("th").find("a").text
+            gk_match_stats_table[team]["player"].append(name)
+            tdata = row.find_all("td")
+            for datum in tdata:
+                if datum["data-stat"] in list(gk_match_info.keys()):
+                    gk_match_stats_table[team][datum["data-stat"]
+                                               ].append(datum.text)
+
+        clock.lap("parse")
+        gk_dfs[team] = pd.DataFrame(gk_match_stats_table[team])
+        clock.lap("frame")
+
+    return {
+        "match_info": match_info,
+        "shot_stats": sh_stat_df,
+        "player_stats": team_dfs,
+        "gk_stats": gk_dfs
+    }
+
+
+def report_rows(report):
+    """Number of rows in the shots, player and goalkeeper stats tables of a report"""
+    return len(report["shot_stats"]) + sum(len(df) for table in ["player_stats", "gk_stats"]
+                                           for df in report[table].values())
+
+
+def report_write(report, path):
+    """
+    Writes a report collated by 'parse_match_report' to its report folder
+
+    Files are written to a '.partial' folder that is renamed to 'path' once complete, so an interrupted write never
+    leaves a folder that looks finished.
+
+    :return: dict, sha256 of each file written to the report folder
+    """
+
+    tmp_path = f"{path}.partial"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    file_create(file_details=report["match_info"], file_path=tmp_path,
+                file_name="match_info.json")
+    report["shot_stats"].to_csv(f"{tmp_path}/shot_stats.csv", index=False)
+
+    for team in report["match_info"]["formations"].keys():
+        report["player_stats"][team].to_csv(
+            f'{tmp_path}/{team} stats.csv', index=False)
+        report["gk_stats"][team].to_csv(
+            f"{tmp_path}/{team} gk_stats.csv", index=False)
+
+    hashes = file_hashes(tmp_path)
+
+    # Folder left by a download interrupted before reports were committed atomically
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+
+    return hashes
+
+
+def players_with_team_position(season, snapshot=False, stats=None, competition=COMPETITION):
+    """
+    Returns list of players in a team and whether or not they are an outfield player or a goalkeeper
+
+    snapshot: bool -> also store compressed copies of the pages downloaded in the season's snapshots folder
+    stats: ScrapeStats | None -> records stage timings and counters of the scrape. When None, they are recorded for this
+        call alone and saved once it ends
+    competition: str -> competition of the season, see 'catalog'
+    """
+
+    if not season_exists(season, competition):
+        print(f"Season should range from {season_range_text(competition)}.")
+        return
+
+    own_stats = stats is None
+    if own_stats:
+        stats = ScrapeStats(season, competition, session=SESSION)
+
+    # Links of teams belonging to a season and link to players list
+    page = fetch_page(fbref_url("stats", season, competition), ttl=season_ttl(season, competition), stats=stats)
+    if snapshot:
+        snapshot_save(page, f"{snapshots_path(season, competition)}/season_stats.html.gz")
+    with stats.stage("parse"):
+        team_links = parse_team_links(page)
+    stats.add(pages_parsed=1)
+
     PREFIX = "https://fbref.com"
 
     plyrs_tm_pstn = {}
 
     # Scrape data from website to locate outfield players and goalkeepers
     for team, link in team_links.items():
-        plyrs_tm_pstn[team] = {
-            "outfield": [],
-            "goalkeeper": []
-        }
-        response = requests.get(PREFIX + link)
-        soup = BeautifulSoup(response.text, "html.parser")
-        trows = soup.find("tbody").find_all("tr")
-        for row in trows:
-            if row.get("class") is None:
-                player = row.find("th").text
-                outfield = False if row.find(
-                    "td", {"data-stat": "position"}).text == "GK" else True
-                if outfield:
-                    plyrs_tm_pstn[team]["outfield"].append(player)
-                else:
-                    plyrs_tm_pstn[team]["goalkeeper"].append(player)
+        page = fetch_page(PREFIX + link, ttl=season_ttl(season, competition), stats=stats)
+        if snapshot:
+            snapshot_save(page, f"{snapshots_path(season, competition)}/squads/{team}.html.gz")
+        with stats.stage("parse"):
+            plyrs_tm_pstn[team] = parse_squad(page)
+        stats.add(pages_parsed=1)
+
+    RESPONSE_CACHE.flush()
+    if own_stats:
+        stats.finish()
 
     return plyrs_tm_pstn
 
 
-def score_and_fixtures(season):
-    """Return scores and fixtures belonging a particular season"""
+def score_and_fixtures(season, snapshot=False, stats=None, competition=COMPETITION):
+    """
+    Return scores and fixtures belonging a particular season
+
+    snapshot: bool -> also store a compressed copy of the schedule page in the season's snapshots folder
+    stats: ScrapeStats | None -> records stage timings and counters of the scrape. When None, they are recorded for this
+        call alone and saved once it ends
+    competition: str -> competition of the season, see 'catalog'
+    """
 
-    if season not in SEASON_RANGE:
+    if not season_exists(season, competition):
         raise Exception(
-            f"Season should range from {SEASON_RANGE.start} to {SEASON_RANGE.stop - 1} representing 20{SEASON_RANGE.start}-20{SEASON_RANGE.start + 1} to 20{SEASON_RANGE.stop - 1}-20{SEASON_RANGE.stop}.")
+            f"Season should range from {season_range_text(competition)}.")
 
     else:
-        # Links corresponding to seasons specified
-        SEASONS = {
-            "2021-2022": "https://fbref.com/en/comps/9/schedule/Premier-League-Scores-and-Fixtures",
-            "2020-2021": "https://fbref.com/en/comps/9/10728/schedule/2020-2021-Premier-League-Scores-and-Fixtures",
-            "2019-2020": "https://fbref.com/en/comps/9/3232/schedule/2019-2020-Premier-League-Scores-and-Fixtures",
-            "2018-2019": "https://fbref.com/en/comps/9/1889/schedule/2018-2019-Premier-League-Scores-and-Fixtures",
-            "2017-2018": "https://fbref.com/en/comps/9/1631/schedule/2017-2018-Premier-League-Scores-and-Fixtures"
+        own_stats = stats is None
+        if own_stats:
+            stats = ScrapeStats(season, competition, session=SESSION)
+
+        fxtr_link = fbref_url("schedule", season, competition)
+        page = fetch_page(fxtr_link, ttl=season_ttl(season, competition), stats=stats)
+        if snapshot:
+            snapshot_save(page, f"{snapshots_path(season, competition)}/schedule.html.gz")
+
+        timings = {}
+        scores_and_fixtures_df = parse_scores_and_fixtures(page, timings)
+        stats.add_timings(timings)
+        stats.add(pages_parsed=1)
+
+        with stats.stage("write"):
+            fixtures_path = catalog_path("fixtures", season, competition)
+            os.makedirs(os.path.dirname(fixtures_path), exist_ok=True)
+            scores_and_fixtures_df.to_csv(fixtures_path, index=False)
+        stats.add(rows_written=len(scores_and_fixtures_df))
+
+        RESPONSE_CACHE.flush()
+        if own_stats:
+            stats.finish()
+
+
+def match_report(link, path, squad_a, squad_b, headers, rate_limiter=None, snapshot_path=None, stats=None,
+                 fixture=None):
+    """
+    Downloading match report for a single fixture into its report folder
+
+    snapshot_path: str | None -> file in which to store a compressed copy of the match report page
+    stats: ScrapeStats | None -> records stage timings and counters of the download towards 'fixture'
+
+    :return: dict, sha256 of each file written to the report folder
+    """
+
+    # Reports of played matches do not change, so they never expire from the cache
+    page = fetch_page(link, rate_limiter=rate_limiter, stats=stats, fixture=fixture)
+    if snapshot_path is not None:
+        snapshot_save(page, snapshot_path)
+
+    timings = {}
+    report = parse_match_report(page, squad_a, squad_b, headers, timings)
+
+    start = time.perf_counter()
+    hashes = report_write(report, path)
+
+    if stats is not None:
+        stats.add_timings(timings, fixture)
+        stats.add(fixture, write_seconds=time.perf_counter() - start, pages_parsed=1, rows_written=report_rows(report))
+
+    return hashes
+
+
+class PipelineStats:
+    """Items handled and time spent by each stage of 'report_pipeline', and the depth of the queues between stages"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages = {stage: {"items": 0, "busy_seconds": 0.0}
+                       for stage in ["fetch", "parse", "write"]}
+        self.queues = {}
+        self.lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        with self.lock:
+            self.stages[stage]["items"] += 1
+            self.stages[stage]["busy_seconds"] += seconds
+
+    def depth(self, queue_name, depth):
+        with self.lock:
+            depths = self.queues.setdefault(
+                queue_name, {"samples": 0, "total": 0, "max": 0})
+            depths["samples"] += 1
+            depths["total"] += depth
+            depths["max"] = max(depths["max"], depth)
+
+    def summary(self):
+        """Returns items per second and mean busy seconds per item of each stage, and mean and max depth of each queue"""
+        elapsed = time.perf_counter() - self.start
+        with self.lock:
+            stages = {
+                stage: {
+                    "items": values["items"],
+                    "items_per_second": values["items"] / elapsed if elapsed > 0 else 0,
+                    "seconds_per_item": values["busy_seconds"] / values["items"] if values["items"] else 0
+                }
+                for stage, values in self.stages.items()
+            }
+            queues = {
+                name: {
+                    "mean_depth": values["total"] / values["samples"],
+                    "max_depth": values["max"]
+                }
+                for name, values in self.queues.items()
+            }
+
+        return {"elapsed_seconds": elapsed, "stages": stages, "queues": queues}
+
+    def report(self):
+        summary = self.summary()
+        for stage, values in summary["stages"].items():
+            print(f"{stage}: {values['items']} items, {values['items_per_second']:.2f} items/s, "
+                  f"{values['seconds_per_item']:.2f}s per item")
+        for name, values in summary["queues"].items():
+            print(f"{name}: mean depth {values['mean_depth']:.1f}, max depth {values['max_depth']}")
+
+
+def timed_parse_match_report(page, squad_a, squad_b, headers):
+    """'parse_match_report' returning the seconds spent in each of its stages as well, run in the parsing processes"""
+    timings = {}
+    report = parse_match_report(page, squad_a, squad_b, headers, timings)
+    return report, timings
+
+
+def report_pipeline(pending, reports_path, headers, commit, workers=1, parsers=1, rate_limiter=None, queue_size=None,
+                    scrape_stats=None):
+    """
+    Downloads, parses and writes match reports in three stages connected by bounded queues
+
+    'workers' threads download pages into a queue read by a pool of 'parsers' processes, whose reports are written by
+    a single thread. At most 'queue_size' pages wait between stages, so a slow stage holds back the ones before it.
+
+    :param
+        pending: list -> (fixture, match report link, squad_a, squad_b, snapshot path | None) of each fixture
+        reports_path: str -> folder holding the report folders of the season
+        headers: dict -> header information from 'headers_load'
+        commit: function(fixture, match report link, hashes) -> called once a report folder is written
+        scrape_stats: ScrapeStats | None -> records stage timings and counters of each fixture
+
+    :return: PipelineStats
+    """
+
+    queue_size = queue_size or 2 * parsers
+    stats = PipelineStats()
+    parse_queue = queue.Queue(maxsize=queue_size)
+    write_queue = queue.Queue()
+    in_flight = threading.BoundedSemaphore(queue_size)  # pages being parsed or waiting to be written
+    errors = []
+    PREFIX = "https://fbref.com"
+
+    def fetch(fixture, report_link, squad_a, squad_b, snapshot_path):
+        start = time.perf_counter()
+        page = fetch_page(PREFIX + report_link, rate_limiter=rate_limiter,
+                          stats=scrape_stats, fixture=fixture)
+        if snapshot_path is not None:
+            snapshot_save(page, snapshot_path)
+        stats.record("fetch", time.perf_counter() - start)
+
+        parse_queue.put((fixture, report_link, squad_a, squad_b, page))
+        stats.depth("parse_queue", parse_queue.qsize())
+
+    def dispatch(process_pool):
+        # Reports are handed to the writer in the order they were submitted. A page that cannot be submitted is
+        # recorded as an error and the queue keeps draining, so fetchers blocked on it finish and the writer always
+        # gets its sentinel
+        try:
+            while True:
+                item = parse_queue.get()
+                if item is None:
+                    break
+                fixture, report_link, squad_a, squad_b, page = item
+                in_flight.acquire()
+                try:
+                    future = process_pool.submit(
+                        timed_parse_match_report, page, squad_a, squad_b, headers)
+                except Exception as error:
+                    errors.append(error)
+                    in_flight.release()
+                    continue
+                write_queue.put((fixture, report_link, future))
+                stats.depth("write_queue", write_queue.qsize())
+        finally:
+            write_queue.put(None)
+
+    def write():
+        while True:
+            item = write_queue.get()
+            if item is None:
+                break
+            fixture, report_link, future = item
+            try:
+                report, timings = future.result()
+                stats.record("parse", sum(timings.values()))
+
+                start = time.perf_counter()
+                hashes = report_write(report, f"{reports_path}/{fixture}")
+                write_seconds = time.perf_counter() - start
+                stats.record("write", write_seconds)
+                if scrape_stats is not None:
+                    scrape_stats.add_timings(timings, fixture)
+                    scrape_stats.add(fixture, write_seconds=write_seconds, pages_parsed=1,
+                                     rows_written=report_rows(report))
+                commit(fixture, report_link, hashes)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                in_flight.release()
+
+    # Parsers are started by the dispatcher while fetch threads run. Spawned rather than forked, a process forked from
+    # a threaded one may copy a lock held by another thread and hang on it
+    with ProcessPoolExecutor(max_workers=parsers, mp_context=multiprocessing.get_context("spawn")) as process_pool:
+        dispatcher = threading.Thread(target=dispatch, args=(process_pool,))
+        writer = threading.Thread(target=write)
+        dispatcher.start()
+        writer.start()
+
+        with ThreadPoolExecutor(max_workers=workers) as fetch_pool:
+            fetches = [fetch_pool.submit(fetch, *item) for item in pending]
+            for future in as_completed(fetches):
+                if future.exception() is not None:
+                    errors.append(future.exception())
+
+        parse_queue.put(None)
+        dispatcher.join()
+        writer.join()
+
+    if errors:
+        raise errors[0]
+
+    return stats
+
+
+def match_reports(season, workers=1, rate_limit=FBREF_RATE_LIMIT, verify=False, snapshot=False, parsers=0, store=False,
+                  remove_folders=False, stats=None, competition=COMPETITION):
+    """
+    Downloading match report for matches played in a particular season
+
+    Completed fixtures are recorded with the sha256 of their files in the season's 'manifest.json'. Only fixtures
+    missing from the manifest, or whose folder is missing files, are downloaded.
+
+    :param
+        season: int -> season to download, one of the competition's seasons in 'catalog'
+        workers: int -> number of fixtures downloaded at the same time
+        rate_limit: float | None -> maximum number of requests per second sent to fbref, None for no limit
+        verify: bool -> also compare the hashes of recorded files, downloading fixtures whose files have changed
+        snapshot: bool -> also store compressed copies of the match report pages downloaded in the season's snapshots folder
+        parsers: int -> number of processes parsing match reports, see 'report_pipeline'. 0 parses on the downloading
+            threads
+        store: bool -> also copy the fixtures downloaded into the season's columnar store, see 'report_store'
+        remove_folders: bool -> with 'store', delete the report folders of the fixtures once stored. Kept otherwise
+        stats: ScrapeStats | None -> records stage timings and counters of each fixture downloaded. When None, they are
+            recorded for this call alone and saved once it ends
+        competition: str -> competition of the season, see 'catalog'
+    """
+
+    if not season_exists(season, competition):
+        print(f"Season should range from {season_range_text(competition)}.")
+        return
+
+    own_stats = stats is None
+    if own_stats:
+        stats = ScrapeStats(season, competition, session=SESSION)
+
+    headers = headers_load(competition)
+
+    # Initialise scores and fixtures belonging to a season and removing all unplayed matches
+    scores_and_fixtures_df = pd.read_csv(catalog_path("fixtures", season, competition))
+    scores_and_fixtures_df.dropna(inplace=True)
+
+    squad_a = list(scores_and_fixtures_df["squad_a"])
+    squad_b = list(scores_and_fixtures_df["squad_b"])
+    report_links = list(scores_and_fixtures_df["match_report"])
+
+    reports_path = catalog_path("reports", season, competition)
+    os.makedirs(reports_path, exist_ok=True)
+    manifest = manifest_load(reports_path)
+
+    # Remove folders of downloads interrupted by an earlier run
+    for folder in os.listdir(reports_path):
+        if folder.endswith(".partial"):
+            shutil.rmtree(f"{reports_path}/{folder}", ignore_errors=True)
+
+    # Requests from every worker share the same per-host limit
+    rate_limiter = RateLimiter(rate_limit)
+
+    start = time.perf_counter()
+    downloaded = 0
+    up_to_date = 0
+
+    # Fixtures whose folders were moved into the columnar store are not downloaded again
+    stored = report_store.store_fixtures(season, competition)
+
+    pending = []
+    for indx in range(len(report_links)):
+        fixture = f"{squad_a[indx]} v {squad_b[indx]}"
+        path = f"{reports_path}/{fixture}"
+
+        if fixture in stored and not os.path.isdir(path):
+            up_to_date += 1
+            continue
+
+        entry = manifest["fixtures"].get(fixture)
+        if entry is not None and entry["match_report"] == report_links[indx] and report_intact(path, entry, verify):
+            up_to_date += 1
+            continue
+
+        # Complete folders downloaded before the manifest existed are recorded rather than downloaded again
+        if entry is None and report_complete(path):
+            manifest["fixtures"][fixture] = {
+                "match_report": report_links[indx],
+                "files": file_hashes(path)
+            }
+            up_to_date += 1
+            continue
+
+        snapshot_path = f"{snapshots_path(season, competition)}/reports/{fixture}.html.gz" if snapshot else None
+        pending.append((fixture, report_links[indx], squad_a[indx], squad_b[indx], snapshot_path))
+
+    manifest_save(reports_path, manifest)
+
+    committed = []
+
+    def commit(fixture, report_link, hashes):
+        # Record a fixture in the manifest once its folder is complete
+        manifest["fixtures"][fixture] = {
+            "match_report": report_link,
+            "files": hashes
+        }
+        manifest_save(reports_path, manifest)
+        committed.append(fixture)
+
+    PREFIX = "https://fbref.com"
+    if parsers:
+        pipeline_stats = report_pipeline(pending, reports_path, headers, commit, workers=workers,
+                                         parsers=parsers, rate_limiter=rate_limiter, scrape_stats=stats)
+        downloaded = pipeline_stats.stages["write"]["items"]
+        pipeline_stats.report()
+
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for fixture, report_link, squad_1, squad_2, snapshot_path in pending:
+                future = executor.submit(match_report, PREFIX + report_link, f"{reports_path}/{fixture}",
+                                         squad_1, squad_2, headers, rate_limiter, snapshot_path, stats, fixture)
+                futures[future] = (fixture, report_link)
+
+            for future in as_completed(futures):
+                fixture, report_link = futures[future]
+                commit(fixture, report_link, future.result())
+                downloaded += 1
+
+    if store and committed:
+        report_store.store_convert(season, fixtures=committed, remove_folders=remove_folders, competition=competition)
+
+    elapsed = time.perf_counter() - start
+    rate = downloaded / elapsed if elapsed > 0 else 0
+    print(f"{season_name(season)}: {downloaded} fixtures downloaded in {elapsed:.1f}s ({rate:.2f} fixtures/s), {up_to_date} already up to date")
+
+    RESPONSE_CACHE.flush()
+    if own_stats:
+        stats.finish()
+
+
+def sync(season, workers=1, rate_limit=FBREF_RATE_LIMIT, verify=False, snapshot=False, parsers=0, store=False,
+         remove_folders=False, competition=COMPETITION):
+    """
+    Refreshes scores and fixtures of a season, then downloads match reports of fixtures newly played or incomplete
+
+    Stage timings and counters of both steps are saved as one summary in the season's scrape stats folder.
+    """
+    stats = ScrapeStats(season, competition, session=SESSION)
+    score_and_fixtures(season, snapshot=snapshot, stats=stats, competition=competition)
+    match_reports(season, workers=workers, rate_limit=rate_limit, verify=verify,
+                  snapshot=snapshot, parsers=parsers, store=store, remove_folders=remove_folders, stats=stats,
+                  competition=competition)
+    stats.finish()
+
+
+def replay_reports(season, competition=COMPETITION):
+    """Rebuilds the report folders of a season from its match report snapshots, without any network access"""
+
+    headers = headers_load(competition)
+
+    scores_and_fixtures_df = pd.read_csv(catalog_path("fixtures", season, competition))
+    scores_and_fixtures_df.dropna(inplace=True)
+
+    reports_path = catalog_path("reports", season, competition)
+    os.makedirs(reports_path, exist_ok=True)
+    manifest = manifest_load(reports_path)
+
+    start = time.perf_counter()
+    replayed = 0
+    missing = 0
+    for squad_a, squad_b, report_link in zip(scores_and_fixtures_df["squad_a"], scores_and_fixtures_df["squad_b"],
+                                             scores_and_fixtures_df["match_report"]):
+        fixture = f"{squad_a} v {squad_b}"
+        try:
+            page = snapshot_load(
+                f"{snapshots_path(season, competition)}/reports/{fixture}.html.gz")
+        except FileNotFoundError:
+            missing += 1
+            continue
+
+        report = parse_match_report(page, squad_a, squad_b, headers)
+        manifest["fixtures"][fixture] = {
+            "match_report": report_link,
+            "files": report_write(report, f"{reports_path}/{fixture}")
         }
+        replayed += 1
 
-        fxtr_link = SEASONS[f"20{season}-20{season + 1}"]
-        response = requests.get(fxtr_link)
-        soup = BeautifulSoup(response.text, "html.parser")
-        trows = soup.find("tbody").find_all("tr")
+    manifest_save(reports_path, manifest)
 
-        headers = ["gameweek", "date", "squad_a",
-                   "score", "squad_b", "match_report"]
-        match_reports = {}
+    elapsed = time.perf_counter() - start
+    print(f"{season_name(season)}: {replayed} fixtures replayed in {elapsed:.1f}s, {missing} without a snapshot")
 
-        for i in headers:
-            match_reports[i] = []
-        for row in trows:
-            gmwk = row.find("th")
-            if gmwk.text not in ["", "Wk"]:
-                match_reports["gameweek"].append(gmwk.text)
-                match_stats = row.find_all("td")
-                for stat in match_stats:
-                    if stat["data-stat"] in headers:
-                        if stat["data-stat"] != "match_report":
-                            match_reports[stat["data-stat"]].append(stat.text)
-                        else:
-                            href = stat.find("a")
-                            link = href["href"].split(
-                                "?")[0] if href != None else None
-                            match_reports["match_report"].append(link)
-        scores_and_fixtures_df = pd.DataFrame(match_reports)
-        scores_and_fixtures_df.to_csv(
-            f"data/Premier League/scores and fixtures/20{season}-20{season + 1} PL Scores & Fixtures.csv", index=False)
-
-
-def match_reports(season):
-    """Downloading match report for matches played in a particular season"""
-
-    if season not in SEASON_RANGE:
-        print("Season should range from 17 to 21 representing 2017-2018 to 2021-2022.")
 
+def parse_benchmark(season, competition=COMPETITION):
+    """
+    Measures how fast the snapshots of a season are parsed, without any network access
+
+    :return: dict, for each kind of page('schedule', 'squad', 'match_report'), the number of pages and megabytes parsed,
+        the time taken and the resulting pages per second and megabytes per second
+    """
+
+    path = snapshots_path(season, competition)
+    headers = headers_load(competition)
+
+    def squad_names(file_name):
+        return file_name[:-len(".html.gz")].split(" v ")
+
+    page_kinds = {
+        "schedule": (["schedule.html.gz"], lambda page, _: parse_scores_and_fixtures(page)),
+        "squad": ([f"squads/{f}" for f in sorted(os.listdir(f"{path}/squads"))] if os.path.isdir(f"{path}/squads") else [],
+                  lambda page, _: parse_squad(page)),
+        "match_report": ([f"reports/{f}" for f in sorted(os.listdir(f"{path}/reports"))] if os.path.isdir(f"{path}/reports") else [],
+                         lambda page, file_name: parse_match_report(page, *squad_names(os.path.basename(file_name)), headers))
+    }
+
+    results = {}
+    for kind, (file_names, parser) in page_kinds.items():
+        pages = []
+        for file_name in file_names:
+            try:
+                pages.append((file_name, snapshot_load(f"{path}/{file_name}")))
+            except FileNotFoundError:
+                pass
+
+        megabytes = sum(len(page.encode("utf-8")) for _, page in pages) / 1024 ** 2
+
+        start = time.perf_counter()
+        for file_name, page in pages:
+            parser(page, file_name)
+        elapsed = time.perf_counter() - start
+
+        results[kind] = {
+            "pages": len(pages),
+            "megabytes": megabytes,
+            "seconds": elapsed,
+            "pages_per_second": len(pages) / elapsed if elapsed > 0 else 0,
+            "megabytes_per_second": megabytes / elapsed if elapsed > 0 else 0
+        }
+        print(f"{kind}: {len(pages)} pages, {megabytes:.1f} MB in {elapsed:.2f}s "
+              f"({results[kind]['pages_per_second']:.1f} pages/s, {results[kind]['megabytes_per_second']:.2f} MB/s)")
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Download, replay and benchmark fbref data of a competition")
+    parser.add_argument("command", choices=["sync", "replay", "benchmark", "store"])
+    parser.add_argument("season", type=int,
+                        help="season of the competition in 'catalog', e.g. 20 for 2020-2021")
+    parser.add_argument("--competition", default=COMPETITION)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--parsers", type=int, default=0,
+                        help="processes parsing match reports, 0 parses on the downloading threads")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="store compressed copies of the pages downloaded")
+    parser.add_argument("--store", action="store_true",
+                        help="copy the fixtures downloaded into the columnar store")
+    parser.add_argument("--remove-folders", action="store_true",
+                        help="with 'store' or 'sync --store', delete the report folders once copied")
+    args = parser.parse_args()
+
+    if args.command == "sync":
+        sync(args.season, workers=args.workers, snapshot=args.snapshot,
+             parsers=args.parsers, store=args.store, remove_folders=args.remove_folders, competition=args.competition)
+    elif args.command == "replay":
+        replay_reports(args.season, args.competition)
+    elif args.command == "store":
+        report_store.store_convert(
+            args.season, remove_folders=args.remove_folders, competition=args.competition)
     else:
-        # Player stats header information
-        with open("data/Premier League/header information/headers.json", encoding="utf-8") as hdr:
-            header_dictionary = json.load(hdr)
-
-        # Goalkeeper stats header information
-        with open("data/Premier League/header information/gk_headers.json", encoding="utf-8") as gk_hdr:
-            gk_header_dictionary = json.load(gk_hdr)
-        gk_header_dictionary = gk_header_dictionary["List"]
-
-        # Shots stats header information
-        with open("data/Premier League/header information/sh_headers.json", encoding="utf-8") as sh_hdr:
-            sh_header_dictionary = json.load(sh_hdr)
-        sh_header_dictionary = sh_header_dictionary["List"]
-
-        # Initialise scores and fixtures belonging to a season and removing all unplayed matches
-        scores_and_fixtures_df = pd.read_csv(
-            f"data/Premier League/scores and fixtures/20{season}-20{season + 1} PL Scores & Fixtures.csv")
-        scores_and_fixtures_df.dropna(inplace=True)
-
-        squad_a = list(scores_and_fixtures_df["squad_a"])
-        squad_b = list(scores_and_fixtures_df["squad_b"])
-        report_links = list(scores_and_fixtures_df["match_report"])
-
-        PREFIX = "https://fbref.com"
-        for indx in range(len(report_links)):
-            PREFIX = "https://fbref.com"
-            link = PREFIX + report_links[indx]
-            path = f"data/Premier League/reports/20{season}-20{season + 1}/{squad_a[indx]} v {squad_b[indx]}"
-
-            if folder_create(path):
-                # Match information includes scores, manager and captain names, score xG, formations, team names, possession
-                response = requests.get(link)
-                soup = BeautifulSoup(response.text, "html.parser")
-
-                match_info = {}
-
-                scorebox = soup.find("div", class_="scorebox")
-                mngrs_caps = scorebox.find_all("div", class_="datapoint")
-                managers_captains = []
-                for item in mngrs_caps:
-                    managers_captains.append(item.text)
-
-                match_info["managers_captains"] = managers_captains
-
-                xgs = scorebox.find_all("div", class_="score_xg")
-                score_xgs = []
-                for i in xgs:
-                    score_xgs.append(i.text)
-
-                match_info["score_xgs"] = score_xgs
-
-                frmtns = soup.find_all("div", class_="lineup")
-                formations = {}
-
-                for f in frmtns:
-                    text = f.find("th").text
-                    team_frmtn = text.split(" (")
-                    formations[team_frmtn[0]] = team_frmtn[1].replace(")", "")
-
-                match_info["formations"] = formations
-
-                trows = soup.find("div", {"id": "team_stats"}).find(
-                    "table").find_all("tr")
-
-                possession = trows[2].text.replace("\n", "").split("%")[:-1]
-                match_info["possession"] = possession
-
-                events = soup.find(text="Match Summary").parent.parent
-
-                home = events.find_all(class_="event a")
-                away = events.find_all(class_="event b")
-
-                substitutes = {}
-
-                substitutes[squad_a[indx]] = {}
-                for event in home:
-                    if event.find("div", class_="event_icon substitute_in") is not None:
-                        playrs = event.find_all("a")
-                        if len(playrs) == 2:
-                            substitutes[squad_a[indx]
-                                        ][playrs[0].text] = playrs[1].text
-
-                substitutes[squad_b[indx]] = {}
-                for event in away:
-                    if event.find("div", class_="event_icon substitute_in") is not None:
-                        playrs = event.find_all("a")
-                        if len(playrs) == 2:
-                            substitutes[squad_b[indx]
-                                        ][playrs[0].text] = playrs[1].text
-
-                match_info["substitutes"] = substitutes
-
-                file_create(file_details=match_info, file_path=path,
-                            file_name="match_info.json")
-
-                # Shots stats based on column names specified in shots stats header information
-                sh_match_stats_table = {s: [] for s in sh_header_dictionary}
-
-                sh_stats_table = soup.find(text="Shots Table").parent.parent
-                trows = sh_stats_table.find("tbody").find_all("tr")
-                for row in trows:
-                    tdata = row.find_all("td")
-                    for datum in tdata:
-                        if datum["data-stat"] in list(sh_match_stats_table.keys()):
-                            if datum.find("a") is not None:
-                                sh_match_stats_table[datum["data-stat"]
-                                                     ].append(datum.find("a").text)
-                            else:
-                                sh_match_stats_table[datum["data-stat"]
-                                                     ].append(datum.text)
-
-                sh_stat_df = pd.DataFrame(sh_match_stats_table)
-                sh_stat_df.to_csv(f"{path}/shot_stats.csv", index=False)
-
-                # Player and goalkeeper data based on column names specified in player and goalkeeper stats header information
-                teams = list(match_info["formations"].keys())
-                for team in teams:
-                    match_stats_info = {}
-                    for table_name, table_columns in header_dictionary.items():
-                        table = {column: [] for column in table_columns}
-                        match_stats_info[table_name] = table
-
-                    match_stats_table = {team: match_stats_info}
-
-                    STATS_KEY = {
-                        0: ["misc", "attack"],
-                        1: ["passing"],
-                        2: ["passing_types"],
-                        3: ["defense"],
-                        4: ["possession"],
-                        5: ["misc", "defense"]
-                    }
-
-                    stats_tables = soup.find_all(
-                        text=f"{team} Player Stats Table")
-
-                    for indx in range(len(stats_tables)):
-                        stat_table = stats_tables[indx].parent.parent
-                        trows = stat_table.find("tbody").find_all("tr")
-                        for row in trows:
-                            name = row.find("th").find("a").text
-                            if name not in match_stats_table[team]["misc"]["player"]:
-                                match_stats_table[team]["misc"]["player"].append(
-                                    name)
-
-                            if "misc" in STATS_KEY[indx]:
-                                tdata = row.find_all('td')
-                                for datum in tdata:
-                                    if datum["data-stat"] in header_dictionary["misc"]:
-                                        match_stats_table[team]["misc"][datum["data-stat"]].append(
-                                            datum.text)
-
-                            if "attack" in STATS_KEY[indx]:
-                                tdata = row.find_all('td')
-                                for datum in tdata:
-                                    if datum["data-stat"] in header_dictionary["attack"]:
-                                        match_stats_table[team]["attack"][datum["data-stat"]].append(
-                                            datum.text)
-
-                            if "passing" in STATS_KEY[indx]:
-                                tdata = row.find_all('td')
-                                for datum in tdata:
-                                    if datum["data-stat"] in header_dictionary["passing"]:
-                                        match_stats_table[team]["passing"][datum["data-stat"]].append(
-                                            datum.text)
-
-                            if "passing_types" in STATS_KEY[indx]:
-                                tdata = row.find_all('td')
-                                for datum in tdata:
-                                    if datum["data-stat"] in header_dictionary["passing_types"]:
-                                        match_stats_table[team]["passing_types"][datum["data-stat"]].append(
-                                            datum.text)
-
-                            if "defense" in STATS_KEY[indx]:
-                                tdata = row.find_all('td')
-                                for datum in tdata:
-                                    if datum["data-stat"] in header_dictionary["defense"]:
-                                        match_stats_table[team]["defense"][datum["data-stat"]].append(
-                                            datum.text)
-
-                            if "possession" in STATS_KEY[indx]:
-                                tdata = row.find_all('td')
-                                for datum in tdata:
-                                    if datum["data-stat"] in header_dictionary["possession"]:
-                                        match_stats_table[team]["possession"][datum["data-stat"]].append(
-                                            datum.text)
-
-                    # Removing of duplicate data from player stats for each team
-                    for column in ["position", "age", "minutes", "cards_yellow", "cards_red"]:
-                        column_length = int(
-                            len(match_stats_table[team]['misc'][column]) / 2)
-                        match_stats_table[team]['misc'][column] = match_stats_table[team]['misc'][column][:column_length]
-
-                    for column in ["interceptions", "tackles_won"]:
-                        column_length = int(
-                            len(match_stats_table[team]['defense'][column]) / 2)
-                        match_stats_table[team]['defense'][column] = match_stats_table[team]['defense'][column][:column_length]
-
-                    stat_dfs = [pd.DataFrame(match_stats_table[team][s])
-                                for s in ['misc', 'passing', 'passing_types', 'defense', 'attack', 'possession']]
-
-                    team_df = pd.concat(stat_dfs, axis=1)
-                    team_df.columns = COLUMNS
-                    team_df.to_csv(f'{path}/{team} stats.csv', index=False)
-
-                    gk_match_info = {item: [] for item in gk_header_dictionary}
-                    gk_match_stats_table = {team: gk_match_info}
-
-                    gk_stats_table = soup.find(
-                        text=f"{team} Goalkeeper Stats Table").parent.parent
-                    trows = gk_stats_table.find("tbody").find_all("tr")
-                    for row in trows:
-                        name = row.find("th").find("a").text
-                        gk_match_stats_table[team]["player"].append(name)
-                        tdata = row.find_all("td")
-                        for datum in tdata:
-                            if datum["data-stat"] in list(gk_match_info.keys()):
-                                gk_match_stats_table[team][datum["data-stat"]
-                                                           ].append(datum.text)
-
-                    gk_stat_df = pd.DataFrame(gk_match_stats_table[team])
-                    gk_stat_df.to_csv(
-                        f"{path}/{team} gk_stats.csv", index=False)
+        parse_benchmark(args.season, args.competition)
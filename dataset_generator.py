@@ -1,7 +1,11 @@
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pandas as pd
 
-from player_data import PlayerData
+from catalog import COMPETITION, current_season, partitions
+from phase_stats import PhaseClock, PhaseStats, profiling_enabled
+from player_data import season_data
 
 
 def column_creator(df: pd.DataFrame, expression: str):
@@ -223,7 +227,31 @@ discipline_outcomes = [
 ]
 
 
-def dataset_generator(gameweek_range, threshold, target):
+def season_lister(season, gameweek_ranges, profile=False):
+    """
+    Collates the data of 'season'('YY/YY') over each of 'gameweek_ranges', see PlayerData 'data_lister'
+
+    Runs in the process it is called from, or in a worker process of 'dataset_generator'. When 'profile' is set, the
+    profile of the queries is returned for the caller to nest in its own, see 'phase_stats'
+
+    :return: (list of the data of each range, summary of the profile | None)
+    """
+
+    queries = [{"gameweek_range": gameweek_range} for gameweek_range in gameweek_ranges]
+    data = season_data(int(season.split('/')[0]))
+    if not profile:
+        return data.data_lister_many(queries, profile=False), None
+
+    stats = PhaseStats(f"season_lister {season}")
+    try:
+        results = data.data_lister_many(queries, profile=True)
+    finally:
+        summary = stats.close()
+
+    return results, summary
+
+
+def dataset_generator(gameweek_range, threshold, target, jobs=1, profile=None):
     """
     Generates a dataset having X having columns specified in 'Dataset columns' and y having columns specified in 'Outcomes'
 
@@ -231,15 +259,34 @@ def dataset_generator(gameweek_range, threshold, target):
         gameweek_range: int | list -> matches with gameweek(s) to be considered
         threshold: int -> any player with minutes less than threshold is dropped
         target: int -> specifies number of matches over which we are predicting
+        jobs: int -> number of processes seasons are collated in, one season per process. The dataset does not depend
+            on it
+        profile: bool -> records the time, calls and peak memory of each stage, then prints and saves the summary(see
+            'phase_stats'). Defaults to whether FPL_PROFILE is set
 
     Dataset is stored in a .csv file from the pandas DataFrame
     """
 
-    # Seasons is set from 17/18 to 20/21, 21/22 is left for simulation
-    seasons = [f'{i}/{i + 1}' for i in range(17, 21)]
+    if not profiling_enabled(profile):
+        return dataset_builder(gameweek_range, threshold, target, jobs)
+
+    stats = PhaseStats("dataset_generator")
+    try:
+        return dataset_builder(gameweek_range, threshold, target, jobs, PhaseClock(stats))
+    finally:
+        stats.finish()
 
-    # Initialisiton of PlayerData classes
-    all_data = {season: PlayerData(
+
+def dataset_builder(gameweek_range, threshold, target, jobs=1, clock=None):
+    """Generates the dataset, see 'dataset_generator'. 'clock' times its stages"""
+    clock = PhaseClock() if clock is None else clock
+
+    # Seasons of the competition with data, the current season is left for simulation
+    seasons = [f'{season}/{season + 1}' for _, season in partitions([COMPETITION])
+               if season != current_season(COMPETITION)]
+
+    # PlayerData of each season, shared between calls along with the data they have read
+    all_data = {season: season_data(
         int(season.split('/')[0])) for season in seasons}
 
     # Column names specified in 'headers' attribute from PlayerData class
@@ -252,11 +299,26 @@ def dataset_generator(gameweek_range, threshold, target):
     teams = {key: sorted(value.players.keys())
              for key, value in all_data.items()}
 
+    # Data of X and y parts of dataset, collated for each season at once. Seasons are independent and collated
+    # in parallel when 'jobs' is more than one
+    gameweek_ranges = [gameweek_range, [gameweek_range[1], gameweek_range[1]+target]]
+    profile = clock.stats is not None
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(seasons))) as executor:
+            collated = dict(zip(seasons, executor.map(
+                season_lister, seasons, [gameweek_ranges] * len(seasons), [profile] * len(seasons))))
+    else:
+        collated = {season: season_lister(season, gameweek_ranges, profile) for season in seasons}
+    season_prep = {season: results for season, (results, _) in collated.items()}
+    if profile:
+        # Profiles of the seasons, collated here or in worker processes, are saved along with this one
+        clock.stats.nested += [summary for _, summary in collated.values()]
+    clock.lap("collate")
+
     # Generating X part of dataset
 
     # Dataset containing DFs from PlayerData 'data_lister' method
-    X_prep = {key: value.data_lister(gameweek_range=gameweek_range)
-              for key, value in all_data.items()}
+    X_prep = {season: season_prep[season][0] for season in seasons}
 
     # Appending of extra columns from 'player related' columns
     for season in seasons:
@@ -271,36 +333,9 @@ def dataset_generator(gameweek_range, threshold, target):
             column_creator(df=X_prep[season]
                            ['teams_stats'], expression=exprssn)
 
-    # Find which position most represents the player i.e. position with the most frequency. If tie, pick position that occurs first
-    for season in seasons:
-        for team in teams[season]:
-            positions = X_prep[season][team]['player_stats']['position']
-            places = []
-            for p in positions:
-                keys = list(p.keys())
-                values = list(p.values())
-                if len(values) > 0:
-                    mx = max(values)
-                    ind = values.index(mx)
-
-                    top_pstn = keys[ind]
-                    if top_pstn[-1] == 'K':
-                        places.append('Gkp')
-                    elif top_pstn[-1] == 'B':
-                        places.append('Def')
-                    elif top_pstn[-1] == 'M':
-                        places.append('Mid')
-                    else:
-                        places.append('Fwd')
-                else:
-                    places.append("Nil")
-
-            X_prep[season][team]['player_stats']['place'] = places
+    # 'place', the place of the position each player played in most, is listed by 'data_lister', see 'player_places'
 
-            # Get age of player from age column
-            ages = X_prep[season][team]['player_stats']['age']
-            ages = [int(age.split('-')[0]) if age != 0 else 0 for age in ages]
-            X_prep[season][team]['player_stats']['age'] = ages
+    clock.lap("derived_columns")
 
     # Filtering of player_stats, given players have been filtered by threshold
     filtered_players = {}
@@ -322,6 +357,8 @@ def dataset_generator(gameweek_range, threshold, target):
         X_prep[season]['teams_stats']['team_position'] = teams_positions.index
         X_prep[season]['teams_stats']['team_position'] += 1
 
+    clock.lap("filtering")
+
     cols = ['player'] + columns['player_stats']
 
     X = {}
@@ -342,11 +379,12 @@ def dataset_generator(gameweek_range, threshold, target):
             X[season][team] = pd.concat(
                 [X_prep[season][team]["player_stats"][cols], t_col_stats], axis=1)
 
+    clock.lap("X")
+
     # Generating y part of dataset
 
     # Dataset containing DFs from PlayerData 'data_lister' method
-    y_prep = {key: value.data_lister(gameweek_range=[gameweek_range[1], gameweek_range[1]+target])
-              for key, value in all_data.items()}
+    y_prep = {season: season_prep[season][1] for season in seasons}
 
     y = {}
     for season in seasons:
@@ -404,6 +442,8 @@ def dataset_generator(gameweek_range, threshold, target):
                     y[season][team].loc[idx, 'CONCEDED_2_GOALS+'] += conceded_2
                     y[season][team].loc[idx, 'CLEANSHEETS'] += cleansheets
 
+    clock.lap("y")
+
     # Joining of X, y parts of datasets
     datasets_prep = {}
     for season in seasons:
@@ -422,3 +462,4 @@ def dataset_generator(gameweek_range, threshold, target):
     df = pd.concat(datasets, ignore_index=True)
     df.to_csv(
         f'datasets/dataset_{gameweek_range[0]}_to_{gameweek_range[1]}_{target}.csv', index=False)
+    clock.lap("write")
@@ -0,0 +1,149 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def retry_after(response):
+    """Seconds asked for by the 'Retry-After' header of 'response', None if absent or unreadable"""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def endpoint(url):
+    """Groups urls by host and first two path segments e.g. fbref.com/en/matches"""
+    parsed = urlparse(url)
+    segments = [s for s in parsed.path.split("/") if s][:2]
+    return "/".join([parsed.netloc] + segments)
+
+
+class FetchSession:
+    """
+    Keep-alive http session shared by every scraper, with a bounded connection pool, timeouts and retries.
+
+    Connection errors, timeouts and responses with a status in RETRY_STATUSES are retried up to 'retries' times.
+    Each retry waits for the time asked for in 'Retry-After', otherwise for an exponential backoff with full jitter,
+    then for the rate limiter the request was sent with, if any.
+    Request counts, retries, failures and latency are recorded per endpoint, see 'stats'.
+    """
+
+    def __init__(self, pool_size=10, timeout=(10, 60), retries=5, backoff=1, max_backoff=120):
+        self.timeout = timeout  # (connect, read) seconds
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size,
+                              pool_maxsize=pool_size, pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.endpoint_stats = {}
+        self.lock = threading.Lock()
+
+    def _record(self, url, latency=0.0, retried=False, failed=False):
+        with self.lock:
+            stats = self.endpoint_stats.setdefault(endpoint(url), {
+                "requests": 0,
+                "retries": 0,
+                "failures": 0,
+                "total_latency": 0.0,
+                "max_latency": 0.0
+            })
+            stats["requests"] += 1
+            stats["retries"] += int(retried)
+            stats["failures"] += int(failed)
+            stats["total_latency"] += latency
+            stats["max_latency"] = max(stats["max_latency"], latency)
+
+    def _delay(self, attempt, response=None):
+        wait = retry_after(response) if response is not None else None
+        if wait is None:
+            wait = random.uniform(
+                0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+        return wait
+
+    def get(self, url, rate_limiter=None):
+        """
+        Sends a GET request to 'url', retrying failed attempts. Raises once every attempt has failed
+
+        rate_limiter: object with a 'wait(url)' method | None -> called before every attempt, retries included
+        """
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            if rate_limiter is not None:
+                rate_limiter.wait(url)
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(url, time.perf_counter() - start,
+                             retried=not last_attempt, failed=last_attempt)
+                if last_attempt:
+                    raise
+                time.sleep(self._delay(attempt))
+                continue
+
+            latency = time.perf_counter() - start
+            if response.status_code in RETRY_STATUSES:
+                self._record(url, latency, retried=not last_attempt,
+                             failed=last_attempt)
+                if last_attempt:
+                    response.raise_for_status()
+                time.sleep(self._delay(attempt, response))
+                continue
+
+            self._record(url, latency)
+            return response
+
+    def stats(self):
+        """Returns request counts, retries, failures and latency(seconds) recorded for each endpoint"""
+        with self.lock:
+            stats = {key: dict(value)
+                     for key, value in self.endpoint_stats.items()}
+
+        for value in stats.values():
+            value["mean_latency"] = value["total_latency"] / value["requests"]
+
+        return stats
+
+    def stats_since(self, baseline):
+        """
+        Returns the stats of each endpoint recorded since 'baseline', a copy of 'stats' taken earlier. 'max_latency'
+        is the largest since the session was created
+        """
+        stats = {}
+        for key, value in self.stats().items():
+            before = baseline.get(key, {})
+            requests_sent = value["requests"] - before.get("requests", 0)
+            if requests_sent == 0:
+                continue
+            record = {name: value[name] - before.get(name, 0) for name in ["requests", "retries", "failures",
+                                                                            "total_latency"]}
+            record["max_latency"] = value["max_latency"]
+            record["mean_latency"] = record["total_latency"] / requests_sent
+            stats[key] = record
+
+        return stats
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,76 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+MATCH_CACHE_MAX_SIZE = 512 * 1024 ** 2  # bytes of tables kept in memory before least recently used ones are evicted
+
+
+def value_size(value):
+    """Approximate bytes of memory held by a table, or by a dict, list or tuple of them"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(value_size(k) + value_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(value_size(v) for v in value)
+
+    return sys.getsizeof(value)
+
+
+class MatchCache:
+    """
+    In-memory cache for the tables read while collating a season: match information, player and goalkeeper stats of
+    each fixture and FPL gameweek tables.
+
+    Tables are kept under a key until the cache holds more than 'max_size' bytes, then the least recently used ones are
+    evicted. Cached tables are shared between callers and must not be modified.
+    """
+
+    def __init__(self, max_size=MATCH_CACHE_MAX_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()  # key -> (value, size), least recently used first
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, loader):
+        """Returns the table cached under 'key', calling 'loader()' to read and cache it when it is missing"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = loader()
+        size = value_size(value)
+
+        with self.lock:
+            if key not in self.entries and size <= self.max_size:
+                self.entries[key] = (value, size)
+                self.size += size
+                self._evict()
+
+        return value
+
+    def _evict(self):
+        while self.size > self.max_size:
+            _, (_, size) = self.entries.popitem(last=False)
+            self.size -= size
+
+    def stats(self):
+        """Returns the number of tables and bytes held, and the hits and misses since the cache was created"""
+        with self.lock:
+            return {"tables": len(self.entries), "size": self.size, "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        """Removes every cached table"""
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
@@ -0,0 +1,144 @@
+import json
+import os
+import time
+import tracemalloc
+
+PROFILE_ENV = "FPL_PROFILE"  # profiles every call when set to anything but '' or '0'
+PROFILES_PATH = "data/profiles"
+
+ACTIVE = []  # PhaseStats recording in this process, innermost last
+
+
+def profiling_enabled(profile=None):
+    """Whether to profile a call: 'profile' when given, else whether PROFILE_ENV is set"""
+    if profile is not None:
+        return bool(profile)
+
+    return os.environ.get(PROFILE_ENV, "") not in ("", "0")
+
+
+def reset_peak():
+    """
+    Resets the peak of traced memory, first keeping it as the peak of the running phase of every clock of the ACTIVE
+    PhaseStats, so the laps of a nested clock do not lose the memory of the phase they run in
+    """
+
+    peak = tracemalloc.get_traced_memory()[1]
+    for stats in ACTIVE:
+        for clock in stats.clocks:
+            clock.peak = max(clock.peak, peak)
+    tracemalloc.reset_peak()
+
+
+class PhaseClock:
+    """
+    Splits the time spent in a function between phases, recording the seconds and peak traced memory since the
+    previous lap in 'stats'(see PhaseStats)
+
+    'stats' may be None, in which case nothing is recorded.
+    """
+
+    def __init__(self, stats=None):
+        self.stats = stats
+        self.peak = 0  # peak traced memory of the running phase before the peak was last reset, see 'reset_peak'
+        if stats is not None:
+            reset_peak()
+            stats.clocks.append(self)
+        self.last = time.perf_counter()
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        if self.stats is not None:
+            reset_peak()
+            self.stats.record(phase, now - self.last, self.peak)
+            self.peak = 0
+        self.last = now
+
+
+class PhaseStats:
+    """
+    Wall time, number of calls and peak traced memory of each phase of a call, and counters such as files read.
+
+    Phases are recorded by a PhaseClock. Memory is traced with tracemalloc from creation to 'finish', which slows the
+    profiled call down, and the peak of a phase is that since its clock's previous lap, phases of clocks nested in it
+    included. A PhaseStats created while another is recording is nested in it, see 'finish'. Not to be shared between
+    threads.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.start = time.perf_counter()
+        self.started_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.phases = {}
+        self.counters = {}
+        self.clocks = []
+        self.nested = []  # summaries of the PhaseStats nested in this one
+        self.parent = ACTIVE[-1] if ACTIVE else None
+        self.tracing = not tracemalloc.is_tracing()
+        if self.tracing:
+            tracemalloc.start()
+        ACTIVE.append(self)
+
+    def add(self, counter, value=1):
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def record(self, phase, seconds, peak):
+        """Adds a call of 'phase' lasting 'seconds' and tracing at most 'peak' bytes"""
+        record = self.phases.setdefault(phase, {"seconds": 0.0, "calls": 0, "peak_bytes": 0})
+        record["seconds"] += seconds
+        record["calls"] += 1
+        record["peak_bytes"] = max(record["peak_bytes"], peak)
+
+    def summary(self):
+        """Returns the phases and counters recorded, and the elapsed seconds and peak traced memory of the call"""
+        return {
+            "name": self.name,
+            "started_at": self.started_at,
+            "elapsed_seconds": time.perf_counter() - self.start,
+            "peak_bytes": max([record["peak_bytes"] for record in self.phases.values()]
+                              + [tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0]),
+            "phases": {name: dict(record) for name, record in self.phases.items()},
+            "counters": dict(self.counters),
+            "nested": list(self.nested)
+        }
+
+    def save(self, summary):
+        """Writes 'summary' to the profiles folder, one JSON file per call, and returns its path"""
+        os.makedirs(PROFILES_PATH, exist_ok=True)
+        file_path = f"{PROFILES_PATH}/{summary['started_at'].replace(':', '')} {self.name}.json"
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(summary, file, indent=4)
+
+        return file_path
+
+    def report(self, summary):
+        print(f"{self.name}: {summary['elapsed_seconds']:.2f}s, peak {summary['peak_bytes'] / 1024 ** 2:.1f} MB")
+        for name, record in summary["phases"].items():
+            print(f"    {name}: {record['seconds']:.3f}s in {record['calls']} call(s), "
+                  f"peak {record['peak_bytes'] / 1024 ** 2:.1f} MB")
+        if summary["counters"]:
+            print("    " + ", ".join(f"{counter} {value}" for counter, value in summary["counters"].items()))
+
+    def close(self):
+        """Stops recording, and tracing memory if tracing started with this PhaseStats. Returns the summary"""
+        summary = self.summary()
+        ACTIVE.remove(self)
+        if self.tracing:
+            tracemalloc.stop()
+
+        return summary
+
+    def finish(self):
+        """
+        Stops recording and returns the summary. The summary of a PhaseStats nested in another is added to that one's
+        'nested' summaries, otherwise it is printed and saved(see 'save'), so a profiled run writes a single file
+        """
+
+        summary = self.close()
+        if self.parent in ACTIVE:
+            self.parent.nested.append(summary)
+        else:
+            self.report(summary)
+            print(f"Profile saved to '{self.save(summary)}'")
+
+        return summary
@@ -1,60 +1,1329 @@
+import hashlib
 import json
+import os
+import pickle
+import threading
+import unicodedata
+from functools import cached_property, lru_cache
 
 import numpy as np
 import pandas as pd
 
+import report_store
+import season_cube
+from catalog import COMPETITION, catalog_path, competition_info, fpl_id_names, season_check, season_name
+from match_cache import MATCH_CACHE_MAX_SIZE, MatchCache
+from phase_stats import PhaseClock, PhaseStats, profiling_enabled
 
-class PlayerData:
-    def __init__(self, season):
-        if season not in range(17, 22):
-            raise Exception(
-                "'season' expects value between 17 and 21 inclusive(2017/18 to 2021/22)")
+KEYS = ["squad", "player"]  # identify a player's rows across fixtures
+
+# Contains FPL related columns names and appearance related column names
+EXTRAS = ["appearances", "starts", "sub_ins", "sub_outs", "played_60", "influence", "creativity", "threat", "ict_index",
+          "total_points", "transfers_balance", "transfers_in", "transfers_out", "bonus", "bps", "value", "value_change"]
+
+# Team stats summed over fixtures
+TEAM_TOTALS = ["matches_played", "pts", "home_pts", "away_pts", "xG", "wins", "draws", "losses", "home_wins", "away_wins",
+               "home_draws", "away_draws", "home_losses", "away_losses", "cleansheets", "home_cleansheets",
+               "away_cleansheets", "goals_for", "goals_against", "home_goals_for", "home_goals_against", "away_goals_for",
+               "away_goals_against", "pct_possession"]
+
+FORM_LENGTH = 5  # matches in a team's form
+
+CUMULATIVE_VERSION = 3  # saved totals of another version are built again
+# Arrays of the totals cumulated over gameweeks, with the index of their entries
+CUMULATED = {"player_sums": "player_index", "player_missing": "player_index", "player_counts": "player_index",
+             "fpl_sums": "player_index", "fpl_missing": "player_index", "positions": "player_index",
+             "gk_sums": "gk_index", "gk_missing": "gk_index", "gk_counts": "gk_index"}
+# Rows kept per gameweek: (table, index of their entries, column, whether the last two rows are kept rather than the first)
+FIRST_ROWS = {"player_ages": ("player_stats", "player_index", "age", False),
+              "gk_ages": ("gk_stats", "gk_index", "age", False),
+              "fpl_values": ("fpl", "player_index", "value", True)}
+
+# fbref positions grouped by the place they are played in
+POSITIONS = {"Gkp": ["GK"], "Def": ["DF", "CB", "LB", "RB", "WB"], "Mid": ["MF", "DM", "CM", "LM", "RM", "AM"],
+             "Fwd": ["FW", "LW", "RW"]}
+# Matches played in each position and in each place, in place of the 'position' column of the reports
+POSITION_COLUMNS = [f"position_{position}" for positions in POSITIONS.values() for position in positions]
+PLACE_COLUMNS = [f"{place.lower()}_matches" for place in POSITIONS]
+# Place of a player named by the last letter of the position they played in most: goalkeepers(GK), backs(CB, LB, RB,
+# WB), midfielders(DM, CM, LM, RM, AM) and forwards otherwise, the generic DF and MF included
+POSITION_PLACES = {f"position_{position}": {"K": "Gkp", "B": "Def", "M": "Mid"}.get(position[-1], "Fwd")
+                   for positions in POSITIONS.values() for position in positions}
+PLACES = list(POSITIONS) + ["Nil"]  # 'Nil' for players without a match
+LISTED_MAX = 16  # positions listed in a report row are fewer, see 'position_rows'
+
+# Player and goalkeeper stats kept as floats along with percentages, other stats are counts
+RATE_COLUMNS = ["xg", "npxg", "xa", "influence", "creativity", "threat", "ict_index", "value", "value_change"]
+
+
+def grouped_sum(df, keys, columns):
+    """
+    Sums 'columns' of 'df' over the rows sharing 'keys', in order of first appearance
+
+    A missing value in any row leaves the sum missing, as adding the rows one after the other would.
+    """
+    values = df[columns].astype(float)
+    groups = [df[key] for key in keys]
+    sums = values.groupby(groups, sort=False).sum()
+
+    return sums.mask(values.isna().groupby(groups, sort=False).any())
+
+
+def place_counts(positions):
+    """Adds PLACE_COLUMNS to a frame of POSITION_COLUMNS, the matches played in the positions of each place"""
+    return positions.assign(**{column: positions[[f"position_{position}" for position in POSITIONS[place]]].sum(axis=1)
+                               for place, column in zip(POSITIONS, PLACE_COLUMNS)})
+
+
+def position_rows(plyr_matches):
+    """
+    One row per position listed in each row of 'plyr_matches', with its POSITION_COLUMNS name as 'position' and a
+    'played' key ordering positions as they were first played: by fixture, then as listed e.g. FW before MF in 'FW,MF'
+    """
+
+    rows = plyr_matches[["fixture_index", "gameweek"] + KEYS].assign(
+        position=plyr_matches["position"].str.split(",")).reset_index(drop=True).explode("position")
+    rows["played"] = rows["fixture_index"].to_numpy(dtype=np.int64) * LISTED_MAX + rows.groupby(level=0).cumcount()
+    rows = rows.dropna(subset=["position"]).reset_index(drop=True)
+
+    return rows.assign(position="position_" + rows["position"])
+
+
+def player_places(counts, played):
+    """
+    Place(see POSITION_PLACES) of the position each player played in most, 'Nil' for players without a match. Ties go
+    to the position played first
+
+    :param
+        counts: numpy array -> matches played by each player in each position of POSITION_COLUMNS
+        played: numpy array -> 'played' key(see 'position_rows') of the first match of each player in each position
+
+    :return: numpy array, of PLACES
+    """
+
+    most = counts.max(axis=1, initial=0)
+    tied = (counts == most[:, None]) & (counts > 0)
+    chosen = np.where(tied, played, np.iinfo(np.int64).max).argmin(axis=1)
+    places = np.array([POSITION_PLACES[column] for column in POSITION_COLUMNS])
+    return np.where(most > 0, places[chosen], "Nil").astype(object)
+
+
+def compact_stats(stats):
+    """
+    Player or goalkeeper stats with compact dtypes: 'player' and 'place' categorical, 'age' in years(int16), RATE_COLUMNS,
+    percentages and columns with missing or fractional values float32, other counts int16, or int32 when too large for
+    int16
+    """
+
+    dtypes = {}
+    if "player" in stats.columns:
+        dtypes["player"] = "category"
+    if "place" in stats.columns:
+        dtypes["place"] = pd.CategoricalDtype(PLACES)
+    if "age" in stats.columns:
+        dtypes["age"] = np.int16
+        # Ages are read as 'years-days', 0 for players without a match
+        years = pd.to_numeric(stats["age"].astype(str).str.split("-").str[0], errors="coerce")
+        stats = stats.assign(age=years.fillna(0))
+
+    # Checked over every numeric column at once. Missing values are not whole numbers, NaN % 1 being NaN
+    numeric = [column for column in stats.columns if column not in dtypes]
+    values = stats[numeric].to_numpy(dtype=np.float64)
+    whole = (values % 1 == 0).all(axis=0)
+    small = np.abs(values).max(axis=0, initial=0) <= np.iinfo(np.int16).max
+    for column, column_whole, column_small in zip(numeric, whole, small):
+        if column in RATE_COLUMNS or "_pct" in column or not column_whole:
+            dtypes[column] = np.float32
         else:
-            self.season = season
-        self.fixtures = self.fixtures_lister()  # fixtures corresponding to season
-        # headers corresponding to season, headers contain column names
-        self.headers = self.headers_lister()
-        self.players = self.players_lister()  # players corresponding to season
+            dtypes[column] = np.int16 if column_small else np.int32
+
+    return stats.astype(dtypes)
+
+
+def file_fingerprint(path):
+    """
+    (modification time in nanoseconds, size) of a file, None when it is missing
+
+    Saved state built from files keeps the fingerprints of its sources, taken before the files are read, so a file
+    changing while it is read no longer matches and is read again next time
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+def file_digest(path):
+    """sha256 of a file's contents, None when it is missing"""
+    try:
+        with open(path, "rb") as source_file:
+            return hashlib.sha256(source_file.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def name_key(name):
+    """Name folded to compare names spelt differently by fbref and FPL e.g. 'Martin Ødegaard' and 'Martin Odegaard'"""
+    folded = unicodedata.normalize("NFKD", name).encode(
+        "ascii", "ignore").decode("ascii")
+    return " ".join(folded.lower().replace("-", " ").split())
+
+
+@lru_cache(maxsize=None)
+def headers_reader(competition=COMPETITION):
+    """
+    Reads the header files of a competition, the same for every season, once per process. The dictionary returned is
+    shared
+    """
+    header_dctnry = {}  # Dictonary to store all header values
+    path = catalog_path("headers", competition=competition)
+
+    # Header for outfield player stats
+    with open(f"{path}/headers.json") as hdr:
+        header = json.load(hdr)
+
+    # Header for goalkeeper stats
+    with open(f"{path}/gk_headers.json") as gk_hdr:
+        gk_header = json.load(gk_hdr)
+    gk_header = gk_header["List"]
+
+    # Header for shot related stats
+    with open(f"{path}/sh_headers.json") as sh_hdr:
+        sh_header = json.load(sh_hdr)
+    sh_header = sh_header["List"]
+
+    header_dctnry["header"] = header
+    header_dctnry["gk_header"] = gk_header
+    header_dctnry["sh_header"] = sh_header
+
+    return header_dctnry
+
+
+REGISTRY = {}  # PlayerData of each (competition, season), see 'season_data'
+REGISTRY_LOCK = threading.Lock()
+
+
+def season_data(season, reload=False, competition=COMPETITION):
+    """
+    PlayerData of 'season' of 'competition', created on first use and shared afterwards, with the matches and totals
+    it has read
+
+    :param reload: bool, creates a new PlayerData e.g. after the season's files have been updated. Its saved totals
+        are checked against the files they were read from, see 'cumulative_reader'
+    """
+
+    with REGISTRY_LOCK:
+        if reload or (competition, season) not in REGISTRY:
+            REGISTRY[(competition, season)] = PlayerData(season, competition=competition)
+
+        return REGISTRY[(competition, season)]
+
+
+class PlayerData:
+    def __init__(self, season, cache_size=MATCH_CACHE_MAX_SIZE, competition=COMPETITION):
+        # Only the files of this season of 'competition' are read, see 'catalog'
+        season_check(season, competition)
+        self.season = season
+        self.competition = competition
+        # 'fixtures', 'headers' and 'players' are read on first use
+        self.store = None  # match reports read from the season's columnar store, loaded on first use
+        # match reports and FPL gameweeks read from files, kept in memory up to 'cache_size' bytes
+        self.cache = MatchCache(cache_size)
+        self.cumulative = None  # season totals cumulated over gameweeks, computed on first use
+        self.fpl_index = None  # FPL element id of each player, loaded on first use
+        self.cube = None  # players x fixtures x stats array of the season, memory-mapped on first use
+        self.profile = None  # PhaseStats of the running profiled query, see 'data_lister_many'
+        self.profile_summary = None  # summary of the last profiled query
+
+    @cached_property
+    def fixtures(self):
+        """Fixtures corresponding to season"""
+        return self.fixtures_lister()
+
+    @cached_property
+    def fixture_table(self):
+        """Played fixtures of the season with sorted date, gameweek and team lookups, see 'fixture_table_lister'"""
+        return self.fixture_table_lister()
+
+    @cached_property
+    def headers(self):
+        """Headers corresponding to season, headers contain column names"""
+        return self.headers_lister()
+
+    @cached_property
+    def players(self):
+        """Players corresponding to season"""
+        return self.players_lister()
+
+    @cached_property
+    def reports_path(self):
+        """Folder holding the season's report folders, see 'report_store.reports_path'"""
+        return report_store.reports_path(self.season, self.competition)
 
     def fixtures_lister(self):
         """Read fixtures file for season"""
-        fixture_df = pd.read_csv(
-            f"data/Premier League/scores and fixtures/20{self.season}-20{self.season + 1} PL Scores & Fixtures.csv")
+        fixture_df = pd.read_csv(catalog_path("fixtures", self.season, self.competition))
         fixture_df["date"] = pd.to_datetime(fixture_df["date"])
 
         return fixture_df
 
-    def headers_lister(self):
-        """Read header files for season"""
-        header_dctnry = {}  # Dictonary to store all header values
-
-        # Header for outfield player stats
-        with open("data/Premier League/header information/headers.json") as hdr:
-            header = json.load(hdr)
+    def fixture_table_lister(self):
+        """
+        Indexes the season's played fixtures so filters are lookups rather than scans of every fixture
 
-        # Header for goalkeeper stats
-        with open("data/Premier League/header information/gk_headers.json") as gk_hdr:
-            gk_header = json.load(gk_hdr)
-        gk_header = gk_header["List"]
+        Fixtures are numbered by position among the played fixtures, in the order of the fixtures file. Each lookup
+        returns sorted positions, so filters compose by intersecting them.
 
-        # Header for shot related stats
-        with open("data/Premier League/header information/sh_headers.json") as sh_hdr:
-            sh_header = json.load(sh_hdr)
-        sh_header = sh_header["List"]
+        :return: dict, 'played'(pandas DataFrame of played fixtures with the fixtures file index), 'dates'(sorted
+            DatetimeIndex) and 'gameweeks'(sorted numpy array) along with 'date_order' and 'gameweek_order', the
+            positions of the fixtures in that order, 'home', 'away' and 'teams'(team -> positions of its home, away and
+            all fixtures) and 'positions'(pandas Series, 'squad_a v squad_b' -> position)
+        """
 
-        header_dctnry["header"] = header
-        header_dctnry["gk_header"] = gk_header
-        header_dctnry["sh_header"] = sh_header
+        played = self.fixtures.dropna()
+        positions = np.arange(len(played))
+
+        date_order = np.argsort(played["date"].to_numpy(), kind="stable")
+        gameweek_order = np.argsort(played["gameweek"].to_numpy(), kind="stable")
+
+        home = {team: rows.to_numpy() for team, rows in pd.Series(positions).groupby(
+            played["squad_a"].to_numpy(), sort=False)}
+        away = {team: rows.to_numpy() for team, rows in pd.Series(positions).groupby(
+            played["squad_b"].to_numpy(), sort=False)}
+        teams = {team: np.union1d(home.get(team, []), away.get(team, [])).astype(int)
+                 for team in set(home) | set(away)}
+
+        return {
+            "played": played,
+            "dates": pd.DatetimeIndex(played["date"].to_numpy()[date_order]),
+            "date_order": date_order,
+            "gameweeks": played["gameweek"].to_numpy()[gameweek_order],
+            "gameweek_order": gameweek_order,
+            "home": home,
+            "away": away,
+            "teams": teams,
+            "positions": pd.Series(positions, index=(played["squad_a"] + " v " + played["squad_b"]).to_numpy())
+        }
 
-        return header_dctnry
+    def headers_lister(self):
+        """Read header files for season, see 'headers_reader'"""
+        return headers_reader(self.competition)
 
     def players_lister(self):
         """Read players file for season"""
-        with open(f"data/Premier League/player information/20{self.season}-20{self.season + 1} player_info.json", encoding="utf-8") as players_with_team:
+        with open(catalog_path("players", self.season, self.competition), encoding="utf-8") as players_with_team:
             plyrs_dctnry = json.load(players_with_team)
 
         return plyrs_dctnry
 
+    def count(self, counter, value=1):
+        """Adds 'value' to a counter of the running profiled query, if any"""
+        if self.profile is not None:
+            self.profile.add(counter, value)
+
+    def fpl_lister(self, gameweek):
+        """Read FPL data for gameweek, once while it stays in 'cache'"""
+        return self.cache.get(("fpl", gameweek), lambda: self.fpl_reader(gameweek))
+
+    def fpl_reader(self, gameweek):
+        """Read FPL data file for gameweek. Competitions without FPL data have no rows"""
+        if not competition_info(self.competition)["fpl"]:
+            return pd.DataFrame(columns=["name", "element"] + EXTRAS[5:-1])
+
+        self.count("files_read")
+        fpl_data = pd.read_csv(
+            f"{catalog_path('fpl_gameweeks', self.season, self.competition)}/gw{gameweek}.csv", encoding="ISO-8859-1")
+
+        # FPL element id of each row, from the 'element' column, else from the number ending names in seasons whose names
+        # end with it(see 'catalog.fpl_id_names'). Names are used as ids when neither is available
+        if "element" in fpl_data.columns:
+            fpl_data["element"] = fpl_data["element"].astype(str)
+        else:
+            ids = fpl_data["name"].str.extract(r"_(\d+)$")[0]
+            fpl_data["element"] = ids.fillna(fpl_data["name"])
+
+        # Seasons whose names end with the element id store names of players differently (presence of '_' and number in 'name' column)
+        # Process it to align with names gotten from 'players'
+        if fpl_id_names(self.season, self.competition):
+            names = [name.split("_") for name in list(fpl_data["name"])]
+            names = [n[0] + ' ' + n[1]
+                     if len(n) > 1 else n[0] for n in names]
+            fpl_data["name"] = names
+        else:
+            names = [name.replace("_", ' ')
+                     for name in list(fpl_data["name"])]
+            fpl_data["name"] = names
+
+        return fpl_data
+
+    def fpl_index_lister(self, rebuild=False):
+        """
+        Maps each player in 'players' to their FPL element id, built once from the gameweek files and saved alongside them
+
+        Names are matched exactly, then with accents, case and hyphens ignored. A name matching more than one element
+        is left unmatched. The index is built again when gameweeks have been played since it was saved, or when the
+        players file or gameweek files it was built from have changed, see 'fpl_sources'.
+
+        :return: dict, 'gameweeks'(list of gameweeks indexed), 'players'(team -> player -> element id),
+            'unmatched_players'(team -> names without an element), 'unmatched_elements'(FPL names matched to no player)
+            and 'sources'(see 'fpl_sources')
+        """
+
+        if self.fpl_index is not None and not rebuild:
+            return self.fpl_index
+
+        gameweeks = sorted(int(gameweek) for gameweek in self.fixtures.dropna()["gameweek"].unique())
+        if not competition_info(self.competition)["fpl"]:
+            self.fpl_index = {"gameweeks": gameweeks, "players": {}, "unmatched_players": {}, "unmatched_elements": []}
+            return self.fpl_index
+
+        path = catalog_path("fpl_index", self.season, self.competition)
+
+        if not rebuild and os.path.exists(path):
+            with open(path, encoding="utf-8") as index_file:
+                fpl_index = json.load(index_file)
+            if set(gameweeks).issubset(fpl_index["gameweeks"]) and fpl_index.get(
+                    "sources") == self.fpl_sources(fpl_index["gameweeks"]):
+                self.fpl_index = fpl_index
+                return fpl_index
+
+        # Players file and gameweek files, see 'file_fingerprint'
+        sources = self.fpl_sources(gameweeks)
+
+        # Name of each element, the latest one when it changed during the season
+        element_names = {}
+        for gameweek in gameweeks:
+            try:
+                fpl_data = self.fpl_lister(gameweek)
+            except FileNotFoundError:
+                continue
+            element_names.update(zip(fpl_data["element"], fpl_data["name"]))
+
+        by_name = {}
+        by_key = {}
+        for element, name in element_names.items():
+            by_name.setdefault(name, set()).add(element)
+            by_key.setdefault(name_key(name), set()).add(element)
+
+        players = {}
+        unmatched_players = {}
+        matched = set()
+        for team in sorted(self.players.keys()):
+            players[team] = {}
+            for name in self.players[team]["outfield"] + self.players[team]["goalkeeper"]:
+                elements = by_name.get(name) or by_key.get(name_key(name), set())
+                if len(elements) == 1:
+                    players[team][name] = next(iter(elements))
+                    matched.update(elements)
+                else:
+                    unmatched_players.setdefault(team, []).append(name)
+
+        fpl_index = {
+            "gameweeks": gameweeks,
+            "players": players,
+            "unmatched_players": unmatched_players,
+            "unmatched_elements": sorted(name for element, name in element_names.items() if element not in matched),
+            "sources": sources
+        }
+
+        with open(f"{path}.tmp", "w", encoding="utf-8") as index_file:
+            json.dump(fpl_index, index_file, indent=4, ensure_ascii=False)
+        os.replace(f"{path}.tmp", path)
+
+        self.fpl_index = fpl_index
+        return fpl_index
+
+    def fpl_sources(self, gameweeks):
+        """
+        Fingerprints of the files the FPL index of 'gameweeks' is built from: the digest of the players file and the
+        fingerprint of each gameweek file, see 'file_digest' and 'file_fingerprint'. As saved in JSON
+        """
+
+        gameweeks_path = catalog_path("fpl_gameweeks", self.season, self.competition)
+        fingerprints = {str(gameweek): file_fingerprint(f"{gameweeks_path}/gw{gameweek}.csv") for gameweek in gameweeks}
+
+        return {
+            "players": file_digest(catalog_path("players", self.season, self.competition)),
+            "gameweeks": {gameweek: list(fingerprint) if fingerprint is not None else None
+                          for gameweek, fingerprint in fingerprints.items()}
+        }
+
+    def store_lister(self, gameweeks):
+        """
+        Read the partitions of 'gameweeks' from the season's columnar store, grouping their tables by fixture.
+        Partitions already read are kept and not read again. Returns None if there is no store
+        """
+        if self.store is None:
+            if not report_store.store_exists(self.season, self.competition):
+                return None
+            self.store = {"gameweeks": set(), "match_info": {}, "player_stats": {}, "gk_stats": {}}
+
+        missing = {int(gameweek) for gameweek in gameweeks} - self.store["gameweeks"]
+        if missing:
+            tables = report_store.store_read(self.season, gameweeks=missing, competition=self.competition, tables=[
+                                             "match_info", "player_stats", "gk_stats"])
+            self.count("store_tables_read", len(tables))
+
+            self.store["match_info"].update({fixture: json.loads(info) for fixture, info in zip(
+                tables["match_info"]["fixture"], tables["match_info"]["match_info"])})
+
+            # Stats stored per fixture and squad, with the columns of the report folder's .csv files
+            for table in ["player_stats", "gk_stats"]:
+                columns = [column for column in tables[table].columns
+                           if column not in ["fixture", "squad", "gameweek"]]
+                if len(tables[table]):
+                    self.store[table].update({key: df[columns].reset_index(drop=True)
+                                              for key, df in tables[table].groupby(["fixture", "squad"])})
+
+            self.store["gameweeks"] |= missing
+
+        return self.store
+
+    def report_lister(self, squads, squad, gameweek):
+        """
+        Read match information and the player and goalkeeper stats of 'squad' for the fixture between 'squads', played
+        in 'gameweek'
+        """
+        fixture = f"{squads[0]} v {squads[1]}"
+        store = self.store_lister([gameweek])
+        if store is not None and fixture in store["match_info"]:
+            return (store["match_info"][fixture],
+                    store["player_stats"][(fixture, squad)],
+                    store["gk_stats"][(fixture, squad)])
+
+        # Path to report folder corresponding to fixture
+        path = f"{self.reports_path}/{fixture}"
+
+        def match_info_reader():
+            self.count("files_read")
+            with open(f"{path}/match_info.json", encoding="utf-8") as match_file:
+                return json.load(match_file)
+
+        def csv_reader(file_path):
+            self.count("files_read")
+            return pd.read_csv(file_path)
+
+        # Files are read once while they stay in 'cache'
+        return (self.cache.get(("match_info", fixture), match_info_reader),
+                self.cache.get(("player_stats", fixture, squad),
+                               lambda: csv_reader(f"{path}/{squad} stats.csv")),
+                self.cache.get(("gk_stats", fixture, squad),
+                               lambda: csv_reader(f"{path}/{squad} gk_stats.csv")))
+
+    def player_columns(self):
+        """Numeric columns of the player and goalkeeper stats tables of a match report"""
+        # specifies columns that are not string-based
+        plyr_numeric = [column for stat in self.headers["header"].values() for column in stat
+                        if column not in ["player", "position", "age"]]
+        gk_numeric = [column for column in self.headers["gk_header"]
+                      if column not in ["player", "age"]]
+
+        return plyr_numeric, gk_numeric
+
+    def match_lister(self, played_fixtures, team_list):
+        """
+        Reads the reports of 'played_fixtures' for teams in 'team_list' into one row per player in each fixture
+
+        Only players listed in 'players' for their team are kept.
+
+        :return: dict, 'player_stats' and 'gk_stats'(pandas DataFrame of the report rows with 'fixture_index',
+            'gameweek' and 'squad' columns and appearance related columns), 'fpl'(pandas DataFrame of FPL rows matched
+            to player rows, in fixture order) and 'reports'(list of (fixture index, squads, squad, is_home, match_info))
+        """
+
+        plyr_frames = []
+        gk_frames = []
+        subs_in = []  # (fixture index, squad, player) of players subbed in
+        subs_out = []  # (fixture index, squad, player) of players subbed out
+        reports = []
+
+        # Store partitions of every gameweek played are read at once, see 'store_lister'
+        self.store_lister(played_fixtures["gameweek"].unique())
+
+        for index in played_fixtures.index:
+            # Get home and away teams corresponding to fixture
+            squads = (played_fixtures["squad_a"][index],
+                      played_fixtures["squad_b"][index])
+            gameweek = played_fixtures["gameweek"][index]
+
+            for squad in squads:
+                if squad in team_list:
+                    # Collate match_info stats which includes substitutes information
+                    match_info, squad_stats_df, gk_squad_stats_df = self.report_lister(
+                        squads, squad, gameweek)
+                    reports.append(
+                        (index, squads, squad, squad == squads[0], match_info))
+
+                    subs = match_info["substitutes"][squad]
+                    subs_in += [(index, squad, name) for name in subs.values()]
+                    subs_out += [(index, squad, name) for name in subs.keys()]
+
+                    # Ages are kept as the text of the report they are first read from
+                    plyr_frames.append(squad_stats_df.assign(
+                        fixture_index=index, squad=squad, gameweek=gameweek, age=squad_stats_df["age"].astype("str")))
+                    gk_frames.append(gk_squad_stats_df.assign(
+                        fixture_index=index, squad=squad, gameweek=gameweek, age=gk_squad_stats_df["age"].astype("str")))
+
+        # PLAYER STATS
+        plyr_matches = pd.concat(plyr_frames, ignore_index=True)
+        roster = pd.MultiIndex.from_tuples([(team, name) for team in team_list
+                                            for name in self.players[team]["outfield"] + self.players[team]["goalkeeper"]],
+                                           names=KEYS)
+        plyr_matches = plyr_matches[pd.MultiIndex.from_frame(
+            plyr_matches[KEYS]).isin(roster)]
+
+        # Appearance related columns: a player not subbed in started the match
+        match_keys = pd.MultiIndex.from_frame(
+            plyr_matches[["fixture_index"] + KEYS])
+        sub_in = match_keys.isin(pd.MultiIndex.from_tuples(
+            subs_in, names=["fixture_index"] + KEYS))
+        sub_out = match_keys.isin(pd.MultiIndex.from_tuples(
+            subs_out, names=["fixture_index"] + KEYS))
+        plyr_matches = plyr_matches.assign(
+            appearances=1,
+            starts=(~sub_in).astype(int),
+            sub_ins=sub_in.astype(int),
+            sub_outs=sub_out.astype(int),
+            played_60=(plyr_matches["minutes"].astype(float) > 60).astype(int))
+
+        # FPL related data, joined on each player's FPL element id, see 'fpl_index_lister'.
+        # Elements appearing more than once in a gameweek are skipped
+        elements = pd.DataFrame([(team, name, element) for team, names in self.fpl_index_lister()["players"].items()
+                                 for name, element in names.items()], columns=KEYS + ["element"])
+        fpl_frames = []
+        for gameweek in played_fixtures["gameweek"].unique():
+            fpl_data = self.fpl_lister(gameweek)
+            fpl_data = fpl_data[~fpl_data["element"].duplicated(keep=False)]
+            fpl_frames.append(
+                fpl_data[["element"] + EXTRAS[5:-1]].assign(gameweek=gameweek))
+
+        fpl_matches = plyr_matches[["fixture_index", "gameweek"] + KEYS].merge(elements, on=KEYS).merge(
+            pd.concat(fpl_frames, ignore_index=True), on=["gameweek", "element"]).sort_values("fixture_index", kind="stable")
+        fpl_matches["value"] = fpl_matches["value"].astype(float)
+
+        # GOALKEEPER STATS
+        gk_matches = pd.concat(gk_frames, ignore_index=True)
+        gk_roster = pd.MultiIndex.from_tuples([(team, name) for team in team_list
+                                               for name in self.players[team]["goalkeeper"]], names=KEYS)
+        gk_matches = gk_matches[pd.MultiIndex.from_frame(
+            gk_matches[KEYS]).isin(gk_roster)].assign(appearances=1)
+
+        return {
+            "player_stats": plyr_matches,
+            "gk_stats": gk_matches,
+            "fpl": fpl_matches,
+            "reports": reports
+        }
+
+    def match_slicer(self, matches, fixture_index, team_list):
+        """Rows read by 'match_lister' belonging to fixtures at 'fixture_index' and teams in 'team_list'"""
+        fixture_index = set(fixture_index)
+        team_list = set(team_list)
+
+        def selected(rows):
+            return rows[rows["fixture_index"].isin(fixture_index) & rows["squad"].isin(team_list)]
+
+        return {
+            "player_stats": selected(matches["player_stats"]),
+            "gk_stats": selected(matches["gk_stats"]),
+            "fpl": selected(matches["fpl"]),
+            "reports": [report for report in matches["reports"]
+                        if report[0] in fixture_index and report[2] in team_list]
+        }
+
+    def totals_lister(self, matches):
+        """
+        Sums the rows read by 'match_lister' for each player and goalkeeper
+
+        :return: dict, 'player_stats' and 'gk_stats'(pandas DataFrame indexed by (squad, player))
+        """
+
+        plyr_numeric, gk_numeric = self.player_columns()
+        plyr_matches = matches["player_stats"]
+        plyr_totals = pd.concat([grouped_sum(plyr_matches, KEYS, plyr_numeric),
+                                 plyr_matches.groupby(KEYS, sort=False)[EXTRAS[:5]].sum()], axis=1)
+
+        fpl_matches = matches["fpl"]
+        fpl_totals = grouped_sum(fpl_matches, KEYS, EXTRAS[5:-2])
+
+        # 'value' is the latest value, 'value_change' the change since the previous matched gameweek
+        fpl_values = fpl_matches.assign(value_change=fpl_matches["value"] - fpl_matches.groupby(KEYS)["value"].shift(
+            fill_value=0)).drop_duplicates(KEYS, keep="last").set_index(KEYS)[["value", "value_change"]]
+
+        plyr_ages = plyr_matches.drop_duplicates(KEYS).set_index(KEYS)["age"]
+
+        # Collating positions played by each player, counting matches played in each
+        positions = position_rows(plyr_matches).groupby(KEYS + ["position"], sort=False)["played"]
+        position_counts = positions.size().unstack(fill_value=0).reindex(
+            index=plyr_totals.index, columns=POSITION_COLUMNS, fill_value=0)
+        position_played = positions.min().unstack().reindex(
+            index=plyr_totals.index, columns=POSITION_COLUMNS).fillna(np.iinfo(np.int64).max)
+        plyr_positions = place_counts(position_counts).assign(place=player_places(
+            position_counts.to_numpy(), position_played.to_numpy(dtype=np.int64)))
+
+        plyr_totals = pd.concat([plyr_totals,
+                                 fpl_totals.reindex(
+                                     plyr_totals.index, fill_value=0),
+                                 fpl_values.reindex(
+                                     plyr_totals.index, fill_value=0),
+                                 plyr_ages, plyr_positions], axis=1)
+
+        gk_matches = matches["gk_stats"]
+        gk_totals = pd.concat([grouped_sum(gk_matches, KEYS, gk_numeric),
+                               gk_matches.groupby(KEYS, sort=False)[
+                                   "appearances"].sum(),
+                               gk_matches.drop_duplicates(KEYS).set_index(KEYS)["age"]], axis=1)
+
+        return {
+            "player_stats": plyr_totals,
+            "gk_stats": gk_totals
+        }
+
+    def team_match_lister(self, reports, played_fixtures):
+        """
+        One row per team in each fixture of 'reports'(see 'match_lister') with what the fixture adds to its team stats
+
+        :return: pandas DataFrame with 'fixture_index', 'gameweek', 'team_name', 'is_home', 'result', 'manager',
+            'formation' and TEAM_TOTALS columns
+        """
+
+        # Match information of each team, the home team's first
+        team_matches = pd.DataFrame(
+            [(index, squad, is_home, match_info["managers_captains"][0 if is_home else 2].split(": ")[-1],
+              list(match_info["formations"].values())[0 if is_home else 1],
+              match_info["score_xgs"][0 if is_home else 1], match_info["possession"][0 if is_home else 1])
+             for index, squads, squad, is_home, match_info in reports],
+            columns=["fixture_index", "team_name", "is_home", "manager", "formation", "xG", "pct_possession"])
+        team_matches["is_home"] = team_matches["is_home"].astype(bool)
+
+        # Scores of each fixture, joined to its teams
+        fixtures = played_fixtures.loc[team_matches["fixture_index"]]
+        scores = fixtures["score"].str.split('–', expand=True).reindex(columns=[0, 1])
+        is_home = team_matches["is_home"].to_numpy()
+        home_score, away_score = scores[0].to_numpy(), scores[1].to_numpy()
+        score_for = np.where(is_home, home_score, away_score)
+        score_against = np.where(is_home, away_score, home_score)
+        goals_for, goals_against = score_for.astype(int), score_against.astype(int)
+
+        # Scores are compared as text, as 'data_lister' always has
+        result = np.select([score_for > score_against, score_for == score_against], ['W', 'D'], 'L')
+        pts = np.select([result == 'W', result == 'D'], [3, 1], 0)
+        home, away = is_home.astype(int), (~is_home).astype(int)
+        wins, draws, losses = (result == 'W').astype(int), (result == 'D').astype(int), (result == 'L').astype(int)
+        # away clean sheets have always been counted from the home score
+
+        team_matches = team_matches.assign(
+            gameweek=fixtures["gameweek"].to_numpy(),
+            result=result,
+            matches_played=1,
+            pts=pts, home_pts=pts * home, away_pts=pts * away,
+            xG=team_matches["xG"].astype(float),
+            wins=wins, draws=draws, losses=losses,
+            home_wins=wins * home, away_wins=wins * away,
+            home_draws=draws * home, away_draws=draws * away,
+            home_losses=losses * home, away_losses=losses * away,
+            cleansheets=(goals_against == 0).astype(int),
+            home_cleansheets=(goals_against == 0).astype(int) * home,
+            away_cleansheets=(away_score.astype(int) == 0).astype(int) * away,
+            goals_for=goals_for, goals_against=goals_against,
+            home_goals_for=goals_for * home, home_goals_against=goals_against * home,
+            away_goals_for=goals_for * away, away_goals_against=goals_against * away,
+            pct_possession=team_matches["pct_possession"].astype(int))
+
+        return team_matches[["fixture_index", "gameweek", "team_name", "is_home", "result", "manager", "formation"]
+                            + TEAM_TOTALS]
+
+    def team_stats_lister(self, team_matches, team_list):
+        """
+        Team stats of the teams in 'team_list' summed over the rows of 'team_matches'(see 'team_match_lister')
+
+        :return: pandas DataFrame indexed by team name with TEAM_TOTALS columns, 'form', 'home_form' and 'away_form'
+            (results of the last FORM_LENGTH matches) and 'manager(s)' and 'formation(s)'(in order of first use)
+        """
+
+        team_list = sorted(set(team_list))
+        teams_stats = team_matches.groupby("team_name", sort=False)[TEAM_TOTALS].sum().reindex(
+            team_list, fill_value=0).astype(team_matches[TEAM_TOTALS].dtypes)
+
+        def listed(rows, column):
+            lists = rows.groupby("team_name", sort=False)[column].apply(list).reindex(team_list)
+            return [value if isinstance(value, list) else [] for value in lists]
+
+        def form(rows):
+            # Rolling window over each team's latest results
+            latest = rows.groupby("team_name", sort=False).cumcount(ascending=False) < FORM_LENGTH
+            return listed(rows[latest], "result")
+
+        teams_stats["form"] = form(team_matches)
+        teams_stats["home_form"] = form(team_matches[team_matches["is_home"]])
+        teams_stats["away_form"] = form(team_matches[~team_matches["is_home"]])
+        teams_stats["manager(s)"] = listed(team_matches.drop_duplicates(["team_name", "manager"]), "manager")
+        teams_stats["formation(s)"] = listed(team_matches.drop_duplicates(["team_name", "formation"]), "formation")
+
+        return teams_stats
+
+    def cumulative_lister(self):
+        """
+        Totals of every player, goalkeeper and team summed over the season's played gameweeks
+
+        Arrays of CUMULATED are indexed by position in 'gameweeks' + 1, their first row holding zeros, so the totals
+        over the gameweeks between positions lo and hi are 'array[hi] - array[lo]'. Values that are not sums, first
+        ages and FPL values(FIRST_ROWS) and team results, are kept per gameweek and resolved for each window.
+
+        Totals are read from the season's saved state, see 'cumulative_reader', and fixtures played since it was saved
+        are added to it.
+        """
+
+        if self.cumulative is None:
+            self.cumulative = self.cumulative_reader()
+            if self.cumulative_updater():
+                self.cumulative_writer()
+
+        return self.cumulative
+
+    def cumulative_path(self):
+        return catalog_path("aggregates", self.season, self.competition)
+
+    def season_sources(self):
+        """
+        Digests of what every gameweek's totals depend on: the header files, the players file and the FPL element ids
+        players are matched to(see 'fpl_index_lister'). Contents are compared, these files being few and small, so a
+        file written again unchanged keeps its digest
+        """
+
+        headers_path = catalog_path("headers", competition=self.competition)
+        paths = [f"{headers_path}/{name}" for name in ["headers.json", "gk_headers.json"]] + [
+            catalog_path("players", self.season, self.competition)]
+        elements = json.dumps(self.fpl_index_lister()["players"], sort_keys=True)
+
+        return {
+            "files": {path: file_digest(path) for path in paths},
+            "fpl_elements": hashlib.sha256(elements.encode("utf-8")).hexdigest()
+        }
+
+    def gameweek_sources(self, gameweek, fixtures):
+        """
+        Fingerprints of the files a gameweek's totals are read from: the fixtures file rows of its 'fixtures', their
+        report folders, the gameweek's partitions in the columnar store and its FPL gameweek file
+
+        :param
+            gameweek: int -> gameweek of 'fixtures'
+            fixtures: pandas DataFrame -> played fixtures of the gameweek, rows of the fixtures file
+        """
+
+        names = fixtures["squad_a"] + " v " + fixtures["squad_b"]
+        paths = []
+        for name, squad_a, squad_b in zip(names, fixtures["squad_a"], fixtures["squad_b"]):
+            folder_path = f"{self.reports_path}/{name}"
+            paths += [f"{folder_path}/match_info.json"] + [f"{folder_path}/{squad} {table}.csv"
+                                                          for squad in (squad_a, squad_b) for table in ["stats", "gk_stats"]]
+        store_path = report_store.store_path(self.season, self.competition)
+        paths += [f"{store_path}/{table}/gameweek={gameweek}/part.parquet"
+                  for table in ["match_info", "player_stats", "gk_stats"]]
+        if competition_info(self.competition)["fpl"]:
+            paths.append(f"{catalog_path('fpl_gameweeks', self.season, self.competition)}/gw{gameweek}.csv")
+
+        return {
+            "fixtures": {name: (int(index),) + tuple(str(value) for value in row)
+                         for name, index, row in zip(names, fixtures.index, fixtures.itertuples(index=False))},
+            "files": {path: file_fingerprint(path) for path in paths}
+        }
+
+    def cumulative_reader(self):
+        """
+        Reads the season's saved totals, see 'cumulative_lister', checked against the files they were read from:
+
+        - totals without any fixture are returned when there are none, or when the files of 'season_sources' changed
+        - gameweeks whose files of 'gameweek_sources' changed, or whose fixtures changed in the fixtures file, are
+          dropped along with every later gameweek, for 'cumulative_updater' to add their fixtures again
+        """
+
+        path = self.cumulative_path()
+        if os.path.exists(path):
+            with open(path, "rb") as state_file:
+                state = pickle.load(state_file)
+
+            if state.get("version") == CUMULATIVE_VERSION and state["sources"]["season"] == self.season_sources():
+                played_fixtures = self.fixtures.dropna()
+                fixture_names = played_fixtures["squad_a"] + " v " + played_fixtures["squad_b"]
+                for gameweek, sources in sorted(state["sources"]["gameweeks"].items()):
+                    fixtures = played_fixtures[fixture_names.isin(list(sources["fixtures"]))]
+                    if self.gameweek_sources(gameweek, fixtures) != sources:
+                        return self.cumulative_truncated(state, gameweek)
+                return state
+
+        plyr_numeric, gk_numeric = self.player_columns()
+        columns = {"player_sums": plyr_numeric, "player_missing": plyr_numeric, "player_counts": EXTRAS[:5],
+                   "fpl_sums": EXTRAS[5:-2], "fpl_missing": EXTRAS[5:-2], "positions": POSITION_COLUMNS,
+                   "gk_sums": gk_numeric, "gk_missing": gk_numeric, "gk_counts": ["appearances"]}
+        dtypes = {"player_sums": float, "fpl_sums": float, "gk_sums": float}
+
+        state = {
+            "version": CUMULATIVE_VERSION,
+            "fixtures": {},  # fixtures added, with their index in the fixtures file
+            "gameweeks": np.array([], dtype=np.int64),
+            "player_index": pd.MultiIndex.from_tuples([], names=KEYS),
+            "gk_index": pd.MultiIndex.from_tuples([], names=KEYS),
+            "team_list": sorted(self.players.keys()),
+            "team_matches": None,
+            # fingerprints of the files read, see 'season_sources' and 'gameweek_sources'(gameweek -> fingerprints)
+            "sources": {"season": self.season_sources(), "gameweeks": {}}
+        }
+        for name, index in CUMULATED.items():
+            state[name] = np.zeros((1, 0, len(columns[name])), dtype=dtypes.get(name, np.int64))
+        for name, (table, index, column, last) in FIRST_ROWS.items():
+            state[name] = (np.zeros((0, 2 if last else 1, 0), dtype=np.int64),
+                           np.zeros((0, 2 if last else 1, 0), dtype=object if column == "age" else float))
+        # 'played' key(see 'position_rows') of the first match of each player in each position, per gameweek
+        state["positions_played"] = np.zeros((0, 0, len(POSITION_COLUMNS)), dtype=np.int64)
+
+        return state
+
+    def cumulative_truncated(self, state, gameweek):
+        """The season's totals 'state' without 'gameweek' and the gameweeks after it, nor the fixtures they held"""
+        position = int(np.searchsorted(state["gameweeks"], gameweek))
+        for name in CUMULATED:
+            state[name] = state[name][:position + 1]
+        for name in FIRST_ROWS:
+            state[name] = tuple(array[:position] for array in state[name])
+        state["positions_played"] = state["positions_played"][:position]
+        if state["team_matches"] is not None:
+            state["team_matches"] = state["team_matches"][
+                state["team_matches"]["gameweek"] < gameweek].reset_index(drop=True)
+
+        dropped = {name for dropped_gameweek, sources in state["sources"]["gameweeks"].items()
+                   if dropped_gameweek >= gameweek for name in sources["fixtures"]}
+        state["fixtures"] = {name: index for name, index in state["fixtures"].items() if name not in dropped}
+        state["sources"]["gameweeks"] = {kept_gameweek: sources for kept_gameweek, sources
+                                         in state["sources"]["gameweeks"].items() if kept_gameweek < gameweek}
+        state["gameweeks"] = state["gameweeks"][:position]
+
+        return state
+
+    def cumulative_writer(self):
+        """Saves the season's totals, see 'cumulative_lister'"""
+        path = self.cumulative_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.tmp", "wb") as state_file:
+            pickle.dump(self.cumulative, state_file)
+        os.replace(f"{path}.tmp", path)
+
+    def cumulative_updater(self):
+        """
+        Adds the played fixtures missing from the season's totals, reading only their reports and FPL gameweeks.
+        Fixtures played late, in a gameweek already added, are added to that gameweek
+
+        Players are matched to the players listed when their fixture is added.
+
+        :return: int, number of fixtures added
+        """
+
+        state = self.cumulative
+        played_fixtures = self.fixtures.dropna()
+        fixture_names = played_fixtures["squad_a"] + " v " + played_fixtures["squad_b"]
+        new = ~fixture_names.isin(list(state["fixtures"].keys()))
+        if not new.any():
+            return 0
+
+        # Sources of each gameweek fixtures are added to(see 'file_fingerprint'), covering its fixtures added before too
+        sources = {}
+        for gameweek in played_fixtures[new]["gameweek"].unique():
+            names = set(state["sources"]["gameweeks"].get(int(gameweek), {"fixtures": {}})["fixtures"]) | set(
+                fixture_names[new & (played_fixtures["gameweek"] == gameweek)])
+            sources[int(gameweek)] = self.gameweek_sources(
+                int(gameweek), played_fixtures[fixture_names.isin(list(names))])
+
+        # Fixtures are identified by their index in the fixtures file, which orders them
+        matches = self.match_lister(played_fixtures[new], state["team_list"])
+        plyr_numeric, gk_numeric = self.player_columns()
+
+        previous_gameweeks = state["gameweeks"]
+        gameweeks = np.union1d(previous_gameweeks, played_fixtures[new]["gameweek"].unique())
+        size = len(gameweeks)
+
+        def entries(index, rows):
+            """'index' followed by the (squad, player) of 'rows' missing from it"""
+            keys = pd.concat([index.to_frame(index=False), rows[KEYS]], ignore_index=True).drop_duplicates()
+            return pd.MultiIndex.from_frame(keys)
+
+        def cumulative_sum(rows, index, columns, dtype=float):
+            """Sums of 'columns' of 'rows' per gameweek and entry of 'index', cumulated over gameweeks"""
+            sums = np.zeros((size + 1, len(index), len(columns)), dtype=dtype)
+            missing = np.zeros((size + 1, len(index), len(columns)), dtype=np.int64)
+            g = np.searchsorted(gameweeks, rows["gameweek"].to_numpy()) + 1
+            i = index.get_indexer(pd.MultiIndex.from_frame(rows[KEYS]))
+            values = rows[columns].to_numpy(dtype=float)
+            np.add.at(sums, (g, i), np.nan_to_num(values).astype(dtype))
+            np.add.at(missing, (g, i), np.isnan(values).astype(np.int64))
+
+            return sums.cumsum(axis=0), missing.cumsum(axis=0)
+
+        def first_rows(rows, index, column, last=False):
+            """Fixture index and 'column' of the first(or last two) rows of each entry of 'index' in each gameweek"""
+            slots = 2 if last else 1
+            fixture_index = np.full((size, slots, len(index)), -1 if last else np.iinfo(np.int64).max, dtype=np.int64)
+            values = np.zeros((size, slots, len(index)), dtype=object if column == "age" else float)
+            ranks = rows.groupby(["gameweek"] + KEYS).cumcount(ascending=not last).to_numpy()
+            chosen = rows[ranks < slots]
+            g = np.searchsorted(gameweeks, chosen["gameweek"].to_numpy())
+            i = index.get_indexer(pd.MultiIndex.from_frame(chosen[KEYS]))
+            fixture_index[g, ranks[ranks < slots], i] = chosen["fixture_index"].to_numpy()
+            values[g, ranks[ranks < slots], i] = chosen[column].to_numpy()
+
+            return fixture_index, values
+
+        def regridded(array, index):
+            """Cumulative 'array' over the gameweeks and entries of 'index' added, the latest previous gameweek's
+            totals standing for those of gameweeks added"""
+            grown = np.zeros((size + 1, len(index), array.shape[2]), dtype=array.dtype)
+            grown[:, :array.shape[1]] = array[np.r_[0, np.searchsorted(
+                previous_gameweeks, gameweeks, side="right")]]
+            return grown
+
+        def merged(previous, rows, last):
+            """First(or last two) rows of 'previous' and 'rows', both from 'first_rows', in each gameweek"""
+            fixture_index, values = rows
+            slots = fixture_index.shape[1]
+            positions = np.searchsorted(gameweeks, previous_gameweeks)
+            fixture_index = np.concatenate([fixture_index, fixture_index], axis=1)
+            values = np.concatenate([values, values], axis=1)
+            fixture_index[:, slots:] = -1 if last else np.iinfo(np.int64).max
+            fixture_index[positions, slots:, :previous[0].shape[2]] = previous[0]
+            values[positions, slots:, :previous[1].shape[2]] = previous[1]
+
+            order = np.argsort(-fixture_index if last else fixture_index, axis=1, kind="stable")[:, :slots]
+            return np.take_along_axis(fixture_index, order, axis=1), np.take_along_axis(values, order, axis=1)
+
+        plyr_matches, gk_matches, fpl_matches = matches["player_stats"], matches["gk_stats"], matches["fpl"]
+        index = {"player_index": entries(state["player_index"], plyr_matches),
+                 "gk_index": entries(state["gk_index"], gk_matches)}
+
+        def first_played(rows, index):
+            """Least 'played' key of 'rows' per gameweek, entry of 'index' and position, merged with the previous"""
+            played = np.full((size, len(index), len(POSITION_COLUMNS)), np.iinfo(np.int64).max, dtype=np.int64)
+            p = pd.Index(POSITION_COLUMNS).get_indexer(rows["position"])
+            rows, p = rows[p >= 0], p[p >= 0]
+            g = np.searchsorted(gameweeks, rows["gameweek"].to_numpy())
+            i = index.get_indexer(pd.MultiIndex.from_frame(rows[KEYS]))
+            np.minimum.at(played, (g, i, p), rows["played"].to_numpy())
+
+            previous = state["positions_played"]
+            g = np.searchsorted(gameweeks, previous_gameweeks)
+            played[g, :previous.shape[1]] = np.minimum(played[g, :previous.shape[1]], previous)
+            return played
+
+        position_played = position_rows(plyr_matches)
+        positions = pd.get_dummies(position_played["position"]).reindex(
+            columns=POSITION_COLUMNS, fill_value=0).astype(int).join(position_played[["gameweek"] + KEYS])
+
+        sums = {}
+        sums["player_sums"], sums["player_missing"] = cumulative_sum(plyr_matches, index["player_index"], plyr_numeric)
+        sums["player_counts"], _ = cumulative_sum(plyr_matches, index["player_index"], EXTRAS[:5], dtype=np.int64)
+        sums["fpl_sums"], sums["fpl_missing"] = cumulative_sum(fpl_matches, index["player_index"], EXTRAS[5:-2])
+        sums["positions"], _ = cumulative_sum(positions, index["player_index"], POSITION_COLUMNS, dtype=np.int64)
+        sums["gk_sums"], sums["gk_missing"] = cumulative_sum(gk_matches, index["gk_index"], gk_numeric)
+        sums["gk_counts"], _ = cumulative_sum(gk_matches, index["gk_index"], ["appearances"], dtype=np.int64)
+
+        rows = {"player_stats": plyr_matches, "gk_stats": gk_matches, "fpl": fpl_matches}
+        for name, (table, index_name, column, last) in FIRST_ROWS.items():
+            state[name] = merged(state[name], first_rows(rows[table], index[index_name], column, last), last)
+        state["positions_played"] = first_played(position_played, index["player_index"])
+
+        for name, index_name in CUMULATED.items():
+            state[name] = regridded(state[name], index[index_name]) + sums[name]
+
+        team_matches = self.team_match_lister(matches["reports"], played_fixtures)
+        state["team_matches"] = pd.concat([state["team_matches"], team_matches]).sort_values(
+            "fixture_index", kind="stable").reset_index(drop=True)
+
+        state.update(index)
+        state["gameweeks"] = gameweeks
+        state["fixtures"].update(zip(fixture_names[new], played_fixtures.index[new].tolist()))
+        state["sources"]["gameweeks"].update(sources)
+
+        return int(new.sum())
+
+    def update(self):
+        """
+        Reads the season's fixtures, players and FPL gameweeks again, checks the totals against the files they were
+        read from(see 'cumulative_reader') and adds fixtures played since the totals were last updated(new report
+        folders and 'gw{n}.csv' files) to them, see 'cumulative_updater'
+
+        :return: int, number of fixtures added
+        """
+
+        for name in ["fixtures", "fixture_table", "players", "reports_path"]:
+            self.__dict__.pop(name, None)
+        self.store = None
+        self.fpl_index = None
+        self.cube = None
+        self.cache.clear()
+
+        self.cumulative = self.cumulative_reader()
+        added = self.cumulative_updater()
+        if added:
+            self.cumulative_writer()
+
+        return added
+
+    def match_records_lister(self, **options):
+        """
+        Stats of each player in each match of the fixtures selected by **options(see 'data_lister'), read in one pass
+        over the season's reports, as long-format records and as a dense array for sequence models
+
+        Matches are numbered per team in fixture order, so the n-th match of every player of a team is its team's n-th
+        fixture.
+
+        :return: dict,
+            'records'(pandas DataFrame, one row per player per match with 'fixture_index', 'gameweek', 'squad',
+                'match', 'player', 'position', 'age', the stats of 'columns' and FPL fields of the gameweek, NaN when the
+                player is not matched to FPL data),
+            'stats'(numpy float32 array of shape (player, match, stat), NaN for matches not played),
+            'mask'(numpy bool array of shape (player, match), whether the player played in the match),
+            'fixture_index'(numpy array of shape (player, match), fixture of each match, -1 past the team's last),
+            'players'(pandas MultiIndex of (squad, player) of each row) and 'columns'(names of the stats)
+        """
+
+        played_fixtures, team_list = self.fixtures_filter(**options)
+
+        # Fixtures are identified by their index in the fixtures file
+        season_fixtures = self.fixtures.dropna()
+        fixture_index = pd.Series(season_fixtures.index,
+                                  index=season_fixtures["squad_a"] + " v " + season_fixtures["squad_b"])
+        selected = fixture_index[played_fixtures["squad_a"] + " v " + played_fixtures["squad_b"]].to_numpy()
+        matches = self.match_lister(season_fixtures.loc[np.sort(selected)], team_list)
+
+        plyr_numeric, _ = self.player_columns()
+        columns = plyr_numeric + EXTRAS[:5] + EXTRAS[5:-1]
+
+        team_matches = pd.DataFrame([(index, squad) for index, _, squad, _, _ in matches["reports"]],
+                                    columns=["fixture_index", "squad"])
+        team_matches["match"] = team_matches.groupby("squad").cumcount()
+
+        records = matches["player_stats"][["fixture_index", "gameweek", "squad", "player", "position", "age"]
+                                          + plyr_numeric + EXTRAS[:5]].merge(
+            team_matches, on=["fixture_index", "squad"]).merge(
+            matches["fpl"][["fixture_index"] + KEYS + EXTRAS[5:-1]], on=["fixture_index"] + KEYS, how="left")
+        records = records[["fixture_index", "gameweek", "squad", "match", "player", "position", "age"] + columns]
+        records[columns] = records[columns].astype(float)
+
+        players = pd.MultiIndex.from_frame(records[KEYS].drop_duplicates().sort_values(KEYS))
+        rows = players.get_indexer(pd.MultiIndex.from_frame(records[KEYS]))
+        size = team_matches["match"].max() + 1 if len(team_matches) else 0
+
+        stats = np.full((len(players), size, len(columns)), np.nan, dtype=np.float32)
+        stats[rows, records["match"].to_numpy()] = records[columns].to_numpy()
+        mask = np.zeros((len(players), size), dtype=bool)
+        mask[rows, records["match"].to_numpy()] = True
+
+        teams = pd.Index(sorted(set(team_list)))
+        fixtures = np.full((len(teams), size), -1, dtype=np.int64)
+        fixtures[teams.get_indexer(team_matches["squad"]), team_matches["match"].to_numpy()] = team_matches[
+            "fixture_index"].to_numpy()
+
+        return {
+            "records": records,
+            "stats": stats,
+            "mask": mask,
+            "fixture_index": fixtures[teams.get_indexer(players.get_level_values("squad"))],
+            "players": players,
+            "columns": columns
+        }
+
+    def cube_builder(self):
+        """
+        Writes the season's cube(see 'season_cube') from the reports of every played fixture: the stats of
+        'player_columns' and the appearance columns of each player in each fixture
+        """
+
+        played_fixtures = self.fixtures.dropna().sort_values("gameweek", kind="stable")
+        # Season files and the files of every played gameweek, see 'file_fingerprint'
+        sources = self.cube_sources()
+        plyr_matches = self.match_lister(played_fixtures, sorted(self.players.keys()))["player_stats"]
+        plyr_numeric, _ = self.player_columns()
+        stats = plyr_numeric + EXTRAS[:5]
+
+        # Players of a squad are next to one another and fixtures in gameweek order, so teams and windows are slices
+        players = plyr_matches[KEYS].drop_duplicates().sort_values(KEYS, kind="stable")
+        rows = pd.MultiIndex.from_frame(players).get_indexer(pd.MultiIndex.from_frame(plyr_matches[KEYS]))
+        columns = played_fixtures.index.get_indexer(plyr_matches["fixture_index"])
+
+        def fill(cube):
+            cube[rows, columns] = plyr_matches[stats].to_numpy(dtype=float)
+
+        fixtures = [{"fixture": f"{squad_a} v {squad_b}", "fixture_index": int(index), "gameweek": int(gameweek)}
+                    for index, squad_a, squad_b, gameweek in zip(played_fixtures.index, played_fixtures["squad_a"],
+                                                                  played_fixtures["squad_b"], played_fixtures["gameweek"])]
+        season_cube.cube_write(self.season, self.competition, fill, players.values.tolist(), fixtures, stats, sources)
+        self.cube = None
+
+    def cube_sources(self):
+        """
+        Fingerprints of the files the season's cube is built from, as saved in JSON: those of 'season_sources' and
+        the 'gameweek_sources' of every played gameweek
+        """
+
+        played_fixtures = self.fixtures.dropna()
+        sources = {
+            "season": self.season_sources(),
+            "gameweeks": {str(int(gameweek)): self.gameweek_sources(int(gameweek), fixtures)
+                          for gameweek, fixtures in played_fixtures.groupby("gameweek")}
+        }
+
+        return json.loads(json.dumps(sources))
+
+    def cube_lister(self):
+        """
+        Opens the season's cube memory-mapped, building it first when it is missing, or when fixtures have been played
+        or files it was built from have changed since it was built, see 'cube_sources'
+
+        :return: (numpy memmap, dict of its indexes), see 'season_cube.cube_read'
+        """
+
+        if self.cube is None:
+            if not season_cube.cube_exists(self.season, self.competition):
+                self.cube_builder()
+            cube, index = season_cube.cube_read(self.season, self.competition)
+            if index.get("sources") != self.cube_sources():
+                del cube
+                self.cube_builder()
+                cube, index = season_cube.cube_read(self.season, self.competition)
+            self.cube = (cube, index)
+
+        return self.cube
+
+    def cube_slicer(self, gameweek_range=None, team=None, player=None):
+        """
+        Player stats of a window of gameweeks, a team or one of its players, as a view of the season's cube: nothing
+        is copied, and pages are only read from disk(or shared from the page cache) when values are used
+
+        :param
+            gameweek_range: int | list -> gameweek(s), as in 'data_lister'
+            team: str -> players of a team
+            player: str -> a player of 'team'
+
+        :return: dict, 'stats'(numpy array of players x fixtures x stats, NaN for fixtures a player did not play
+            in), 'players'(list of [squad, player]), 'fixtures'(list of fixtures, see 'season_cube.cube_write') and
+            'columns'(names of the stats)
+        """
+
+        cube, index = self.cube_lister()
+
+        rows = slice(0, len(index["players"]))
+        if team is not None:
+            if team not in index["teams"]:
+                raise Exception(f"Team name - {team} is invalid or has no match.")
+            rows = slice(*index["teams"][team])
+        if player is not None:
+            if team is None:
+                raise Exception("'player' expects 'team' to be specified.")
+            names = [name for _, name in index["players"][rows]]
+            if player not in names:
+                raise Exception(f"Player - {player} has no match for {team}.")
+            rows = slice(rows.start + names.index(player), rows.start + names.index(player) + 1)
+
+        columns = slice(0, len(index["fixtures"]))
+        if gameweek_range is not None:
+            gameweeks = [fixture["gameweek"] for fixture in index["fixtures"]]
+            gameweek_range = [gameweek_range] if type(gameweek_range) == int else gameweek_range
+            if len(gameweek_range) == 1:
+                columns = slice(np.searchsorted(gameweeks, gameweek_range[0], side="left"),
+                                np.searchsorted(gameweeks, gameweek_range[0], side="right"))
+            else:
+                # Gameweeks from the start up to, but not including, the end
+                columns = slice(np.searchsorted(gameweeks, gameweek_range[0], side="left"),
+                                np.searchsorted(gameweeks, gameweek_range[1], side="left"))
+
+        return {
+            "stats": cube[rows, columns],
+            "players": index["players"][rows],
+            "fixtures": index["fixtures"][columns],
+            "columns": index["stats"]
+        }
+
+    def gameweek_bounds(self, gameweek_range):
+        """Positions in the season's played gameweeks of the start and end of 'gameweek_range'(see 'data_lister')"""
+        gameweeks = self.cumulative_lister()["gameweeks"]
+        gameweek_range = [gameweek_range] if type(gameweek_range) == int else gameweek_range
+        if len(gameweek_range) == 1:
+            return (np.searchsorted(gameweeks, gameweek_range[0], side="left"),
+                    np.searchsorted(gameweeks, gameweek_range[0], side="right"))
+
+        # Gameweeks from the start up to, but not including, the end
+        return (np.searchsorted(gameweeks, gameweek_range[0], side="left"),
+                np.searchsorted(gameweeks, gameweek_range[1], side="left"))
+
+    def gameweek_totals(self, lo, hi):
+        """
+        Totals over the played gameweeks between positions 'lo' and 'hi', see 'cumulative_lister'
+
+        :return: dict, 'player_stats' and 'gk_stats' as returned by 'totals_lister', and 'teams_stats'
+            (pandas DataFrame indexed by team name)
+        """
+
+        cumulative = self.cumulative_lister()
+        plyr_numeric, gk_numeric = self.player_columns()
+
+        def window_sum(sums, missing, columns):
+            values = sums[hi] - sums[lo]
+            if missing is not None:
+                values = np.where(missing[hi] - missing[lo] > 0, np.nan, values)
+            return pd.DataFrame(values, columns=columns)
+
+        def first_age(first_rows):
+            # Age in the first fixture of the window
+            fixture_index, ages = first_rows[0][lo:hi, 0], first_rows[1][lo:hi, 0]
+            first = fixture_index.argmin(axis=0)
+            return pd.Series(ages[first, np.arange(ages.shape[1])], name="age")
+
+        # PLAYER STATS
+        plyr_index = cumulative["player_index"]
+        fpl_values = cumulative["fpl_values"]
+        counts = window_sum(cumulative["player_counts"], None, EXTRAS[:5])
+        played = (counts["appearances"] > 0).to_numpy()
+
+        # 'value' is the latest matched value, 'value_change' the change since the previous one in the window
+        fixture_index = fpl_values[0][lo:hi].reshape(-1, len(plyr_index))
+        values = fpl_values[1][lo:hi].reshape(-1, len(plyr_index))
+        columns = np.arange(len(plyr_index))
+        last = fixture_index.argmax(axis=0)
+        value = np.where(fixture_index[last, columns] >= 0, values[last, columns], 0.0)
+        previous_index = fixture_index.copy()
+        previous_index[last, columns] = -1
+        previous = previous_index.argmax(axis=0)
+        previous_value = np.where(previous_index[previous, columns] >= 0, values[previous, columns], 0.0)
+
+        position_counts = window_sum(cumulative["positions"], None, POSITION_COLUMNS)
+        position_played = cumulative["positions_played"][lo:hi].min(axis=0, initial=np.iinfo(np.int64).max)
+        plyr_positions = place_counts(position_counts).assign(place=player_places(
+            position_counts.to_numpy(), position_played))
+
+        plyr_totals = pd.concat([window_sum(cumulative["player_sums"], cumulative["player_missing"], plyr_numeric), counts,
+                                 window_sum(cumulative["fpl_sums"], cumulative["fpl_missing"], EXTRAS[5:-2]),
+                                 pd.DataFrame({"value": value, "value_change": value - previous_value}),
+                                 first_age(cumulative["player_ages"]), plyr_positions],
+                                axis=1)[played].set_axis(plyr_index[played], axis=0)
+
+        # GOALKEEPER STATS
+        gk_index = cumulative["gk_index"]
+        counts = window_sum(cumulative["gk_counts"], None, ["appearances"])
+        played = (counts["appearances"] > 0).to_numpy()
+        gk_totals = pd.concat([window_sum(cumulative["gk_sums"], cumulative["gk_missing"], gk_numeric), counts,
+                               first_age(cumulative["gk_ages"])], axis=1)[played].set_axis(gk_index[played], axis=0)
+
+        # TEAM STATS
+        team_matches = cumulative["team_matches"]
+        window_matches = team_matches[team_matches["gameweek"].isin(cumulative["gameweeks"][lo:hi])]
+        teams_stats = self.team_stats_lister(window_matches, cumulative["team_list"])
+
+        return {
+            "player_stats": plyr_totals,
+            "gk_stats": gk_totals,
+            "teams_stats": teams_stats
+        }
+
     def data_lister(self, **options):
         """
             Uses the filters specified in **options to collate data pertaining player stats, goalkeeper stats and team stats.
@@ -65,7 +1334,8 @@ class PlayerData:
                     home: str(team name) | list -> matches in which the team(s) is/are home
                     away: str(team name) | list -> matches in which the team(s) is/are away
                     team: str(team name) | list -> matches in which the team(s) is featured
-                    date_range: str(YYYY-MM-DD) | list -> matches with date range specified
+                    date_range: str(YYYY-MM-DD) | list -> matches with date range specified, before a single date or
+                        strictly between two dates
 
                 Integer-based inputs -> expects 
                     match_range: int | list -> number of matches to be considered
@@ -73,7 +1343,16 @@ class PlayerData:
 
                 ~ list is expected to have a length of 2 specifying a start and end
 
+                Queries with 'gameweek_range' alone are answered from the season's cumulative totals, see 'cumulative_lister'
+
+                profile: bool -> records the time, calls and peak memory of each phase and the files read, see
+                    'data_lister_many'
+
             :return: dict, a dictionary containing each team with its corresponding player stats and goalkeeper stats(both as pandas Dataframe), team stats(pandas DataFrame)
+                ~ player stats count matches played in each position and place(POSITION_COLUMNS, PLACE_COLUMNS), hold
+                  the 'place' of the position played in most(see 'player_places') and are stored with compact dtypes,
+                  see 'compact_stats'
+                ~ team names, 'team_name' of team stats and 'squad_a' and 'squad_b' of the played fixtures, are categorical
 
             :raises: Exception, when any option is not valid i.e.
                 - invalid option is inputted
@@ -85,6 +1364,17 @@ class PlayerData:
 
         """
 
+        profile = options.pop("profile", None)
+
+        return self.data_lister_many([options], profile=profile)[0]
+
+    def fixtures_filter(self, **options):
+        """
+        Played fixtures and teams selected by the filters in **options, see 'data_lister'
+
+        :return: (pandas DataFrame, fixtures selected | list, teams selected, all teams when no team is filtered)
+        """
+
         VALID_OPTIONS = {
             "home": "matches in which the team(s) is/are home",
             "away": "matches in which the team(s) is/are away",
@@ -94,43 +1384,6 @@ class PlayerData:
             "gameweek_range": "matches with gameweek(s) to be considered*"
         }
 
-        # Teams corresponding to season
-        VALID_TEAMS = sorted(list(set(self.fixtures["squad_a"])))
-
-        TEAM_STATS_TEMPLATE = {
-            "matches_played": 0,
-            "pts": 0,
-            "home_pts": 0,
-            "away_pts": 0,
-            "xG": 0,
-            "wins": 0,
-            "draws": 0,
-            "losses": 0,
-            "home_wins": 0,
-            "away_wins": 0,
-            "home_draws": 0,
-            "away_draws": 0,
-            "home_losses": 0,
-            "away_losses": 0,
-            "form": [],
-            "home_form": [],
-            "away_form": [],
-            "cleansheets": 0,
-            "home_cleansheets": 0,
-            "away_cleansheets": 0,
-            "number_of_players": 0,
-            "active_players": 0,
-            "goals_for": 0,
-            "goals_against": 0,
-            "home_goals_for": 0,
-            "home_goals_against": 0,
-            "away_goals_for": 0,
-            "away_goals_against": 0,
-            "pct_possession": 0,
-            "manager(s)": [],
-            "formation(s)": [],
-        }
-
         # ERROR DETECTION
 
         # If key specified in not in valid options, raise an error
@@ -138,56 +1391,81 @@ class PlayerData:
             if key not in list(VALID_OPTIONS.keys()):
                 raise Exception(f"{key} not in valid options.")
 
-        # drop matches that have not been played
-        played_fixtures = self.fixtures.dropna()
+        # Played fixtures are selected as sorted positions in 'fixture_table', narrowed by each option in turn
+        table = self.fixture_table
+        selected = np.arange(len(table["played"]))
         team_names = list(self.players.keys())
+        ranged = False  # 'match_range' keeps the fixtures file index of the fixtures as an 'index' column
 
         team_list = []
 
+        def lookup(team_positions, teams):
+            return np.unique(np.concatenate([team_positions.get(team, np.array([], dtype=int)) for team in teams]))
+
         # OPTIONS
         for option_key, option_value in options.items():
-            optn_value = [option_value] if type(option_value) == str or type(
-                option_value) == int else option_value
+            optn_value = list(option_value) if isinstance(option_value, (list, tuple, set, np.ndarray)) else [
+                option_value]
 
             # checks for string-based inputs
             if option_key in ["home", "away", "team"]:
+                # An empty team list selects no fixtures
+                if len(optn_value) == 0:
+                    raise Exception(
+                        "There are no fixtures corresponding with your query.\nCheck the 'fixtures' to see how the fixtures are distributed.")
                 # Check if team is in current season
                 for value in optn_value:
                     if value not in team_names:
                         raise Exception(
-                            f"Team name - {value} is invalid.\nTeams:\n{VALID_TEAMS}.")
+                            f"Team name - {value} is invalid.\nTeams:\n{sorted(set(self.fixtures['squad_a']))}.")
                 if option_key == "home":
-                    filtr = (played_fixtures["squad_a"].isin(optn_value))
+                    matches = lookup(table["home"], optn_value)
 
                 elif option_key == "away":
-                    filtr = (played_fixtures["squad_b"].isin(optn_value))
+                    matches = lookup(table["away"], optn_value)
 
                 elif option_key == "team":
-                    filtr = ((played_fixtures["squad_a"].isin(
-                        optn_value) | played_fixtures["squad_b"].isin(optn_value)))
+                    matches = lookup(table["teams"], optn_value)
 
                 team_list += list(optn_value)
 
             # check for integer-based inputs
             else:
+                if option_key in ["match_range", "gameweek_range"]:
+                    for value in optn_value:
+                        if isinstance(value, bool) or not isinstance(value, (int, np.integer)):
+                            raise Exception(
+                                f"{option_key} expects integers but got {value!r}.\nCheck the 'fixtures' to see how the fixtures are distributed.")
+                elif option_key == "date_range":
+                    for value in optn_value:
+                        if not isinstance(value, (str, pd.Timestamp)):
+                            raise Exception(
+                                f"date_range expects YYYY-MM-DD dates but got {value!r}.\nCheck the 'fixtures' to see how the fixtures are distributed.")
+
+                if len(optn_value) == 0:
+                    raise Exception(
+                        f"{option_key} expected one or two options but got none.\nCheck the 'fixtures' to see how the fixtures are distributed.")
+
                 # Check if date range is in current season
                 if option_key == "date_range":
                     if len(optn_value) > 2:
                         raise Exception(
                             "Date range expected one or two options but got more.\nCheck the 'fixtures' to see how the fixtures are distributed.")
 
-                    elif len(optn_value) == 1:
-                        filtr = (played_fixtures["date"] < optn_value[0])
+                    try:
+                        bounds = [pd.Timestamp(value) for value in optn_value]
+                    except ValueError:
+                        raise Exception(
+                            "Date range is not valid.\nCheck the 'fixtures' to see how the fixtures are distributed.")
 
+                    # Matches before the date, else strictly between both dates
+                    if len(bounds) == 1:
+                        lo, hi = 0, table["dates"].searchsorted(bounds[0], side="left")
                     else:
-                        try:
-                            filtr = (played_fixtures["date"] > optn_value[0]) and (
-                                played_fixtures["date"] < optn_value[1])
-                        except ValueError:
-                            raise Exception(
-                                "Date range is not valid.\nCheck the 'fixtures' to see how the fixtures are distributed.")
-                        else:
-                            pass
+                        lo = table["dates"].searchsorted(bounds[0], side="right")
+                        hi = table["dates"].searchsorted(bounds[1], side="left")
+                    matches = np.sort(table["date_order"][lo:max(lo, hi)])
+
                 # Check if match range is in current season
                 elif option_key == "match_range":
                     if len(optn_value) > 2:
@@ -195,11 +1473,10 @@ class PlayerData:
                             "Match range expected one or two options but got more.\nCheck the 'fixtures' to see how the fixtures are distributed.")
 
                     elif len(optn_value) == 1:
-                        played_fixtures = played_fixtures.reset_index(
-                        ).loc[:optn_value[0] - 1]
+                        selected = selected[:max(optn_value[0], 0)]
                     else:
-                        played_fixtures = played_fixtures.reset_index(
-                        ).loc[optn_value[0]:optn_value[1] - 1]
+                        selected = selected[max(optn_value[0], 0):max(optn_value[1], 0)]
+                    ranged = True
 
                 # Check if gameweek range is in current season
                 elif option_key == "gameweek_range":
@@ -207,375 +1484,206 @@ class PlayerData:
                         raise Exception(
                             "Gameweek range is not valid.\nCheck the 'fixtures' to see how the fixtures are distributed.")
                     elif len(optn_value) == 1:
-                        filtr = (played_fixtures["gameweek"] == optn_value[0])
+                        lo = np.searchsorted(table["gameweeks"], optn_value[0], side="left")
+                        hi = np.searchsorted(table["gameweeks"], optn_value[0], side="right")
                     else:
-                        filtr = (played_fixtures["gameweek"].isin(
-                            range(optn_value[0], optn_value[1])))
+                        # Gameweeks from the start up to, but not including, the end
+                        lo = np.searchsorted(table["gameweeks"], optn_value[0], side="left")
+                        hi = np.searchsorted(table["gameweeks"], optn_value[1], side="left")
+                    matches = np.sort(table["gameweek_order"][lo:max(lo, hi)])
 
             if option_key != "match_range":
-                played_fixtures = played_fixtures[filtr]
+                selected = np.intersect1d(selected, matches, assume_unique=True)
 
             # Raise error if query yields an empty fixture list
-            if played_fixtures.empty:
+            if len(selected) == 0:
                 raise Exception(
                     "There are no fixtures corresponding with your query.\nCheck the 'fixtures' to see how the fixtures are distributed.")
 
-        played_fixtures = played_fixtures.reset_index(drop=True)
-
-        # data dictionary to store players and teams's stats
-        data = {}
+        played_fixtures = table["played"].iloc[selected].reset_index(drop=not ranged)
 
         team_list = sorted(list(self.players.keys())) if len(
             team_list) == 0 else team_list
 
-        # column names for player data
-        plyr_column_names = []
-        for stat in self.headers["header"].values():
-            plyr_column_names += stat
-
-        gk_columns_names = self.headers["gk_header"]
-
-        # Collate data for teams mentioned in team list, if empty, get for all teams
-        for team in team_list:
-            # Collate player names and initialise a dataframe
-            player_names = self.players[team]["outfield"] + \
-                self.players[team]["goalkeeper"]
-            plyr_stats_df = pd.DataFrame(
-                sorted(player_names), columns=['player'])
+        return played_fixtures, team_list
 
-            # Contains FPL related columns names and appearance related column names
-            extras = ["appearances", "starts", "sub_ins", "sub_outs", "played_60", "influence", "creativity", "threat", "ict_index",
-                      "total_points", "transfers_balance", "transfers_in", "transfers_out", "bonus", "bps", "value", "value_change"]
+    def data_lister_many(self, queries, profile=None):
+        """
+        Collates the data of several queries at once, see 'data_lister'
 
-            # Create player stats dataframe with specified column names and player names and fill with zero
-            plyr_stats_df = plyr_stats_df.reindex(
-                columns=plyr_column_names+extras, fill_value=0)
+        Match reports of the fixtures of every query are read and matched to FPL data once, then split between the
+        queries. Queries with 'gameweek_range' alone share the season's cumulative totals.
 
-            # Initialise 'position' column to empty dictionary
-            plyr_stats_df["position"] = [{} for _ in range(len(player_names))]
+        :param
+            queries: list, dictionaries of the options of each query e.g. [{'team': 'Arsenal'}, {'home': 'Arsenal'}]
+            profile: bool, records the time, calls and peak memory of each phase and the files read, then prints the
+                summary, saves it(see 'phase_stats') and keeps it in 'profile_summary'. Within another profiled call,
+                the summary is nested in that call's instead. Defaults to whether FPL_PROFILE is set
 
-            # Store player stats dataframe
-            data[team] = {"player_stats": plyr_stats_df}
+        :return: list, the data of each query in order, as returned by 'data_lister'
+        """
 
-            # Collate goalkeeper names
-            gk_names = self.players[team]["goalkeeper"]
-            gk_stats_df = pd.DataFrame(sorted(gk_names), columns=["player"])
+        if not profiling_enabled(profile):
+            return self.queries_lister(queries)
 
-            # Create goalkeeper stats dataframe with specified column names and goalkeeper names and fill with zero
-            gk_stats_df = gk_stats_df.reindex(
-                columns=gk_columns_names+["appearances"], fill_value=0)
+        self.profile = PhaseStats(f"data_lister {season_name(self.season)}")
+        try:
+            return self.queries_lister(queries, PhaseClock(self.profile))
+        finally:
+            self.profile_summary = self.profile.finish()
+            self.profile = None
 
-            # Store goalkeeper stats dataframe
-            data[team]["gk_stats"] = gk_stats_df
+    def queries_lister(self, queries, clock=None):
+        """Collates the data of each of 'queries', see 'data_lister_many'. 'clock' times its phases"""
+        clock = PhaseClock() if clock is None else clock
 
-        # Create teams stats dataframe with specified column names and team names and fill with zero
-        teams_stats_df = pd.DataFrame(sorted(team_list), columns=["team_name"])
-        teams_stats_df = teams_stats_df.reindex(
-            columns=["team_name"]+list(TEAM_STATS_TEMPLATE.keys()), fill_value=0)
+        TEAM_STATS_TEMPLATE = {
+            "matches_played": 0,
+            "pts": 0,
+            "home_pts": 0,
+            "away_pts": 0,
+            "xG": 0,
+            "wins": 0,
+            "draws": 0,
+            "losses": 0,
+            "home_wins": 0,
+            "away_wins": 0,
+            "home_draws": 0,
+            "away_draws": 0,
+            "home_losses": 0,
+            "away_losses": 0,
+            "form": [],
+            "home_form": [],
+            "away_form": [],
+            "cleansheets": 0,
+            "home_cleansheets": 0,
+            "away_cleansheets": 0,
+            "number_of_players": 0,
+            "active_players": 0,
+            "goals_for": 0,
+            "goals_against": 0,
+            "home_goals_for": 0,
+            "home_goals_against": 0,
+            "away_goals_for": 0,
+            "away_goals_against": 0,
+            "pct_possession": 0,
+            "manager(s)": [],
+            "formation(s)": [],
+        }
 
-        # Initialise specified columns to empty dictionaries
-        for column in ["formation(s)", "manager(s)", "form", "home_form", "away_form"]:
-            teams_stats_df[column] = [[] for _ in range(len(team_list))]
+        # column names for player data
+        plyr_column_names = []
+        for stat in self.headers["header"].values():
+            plyr_column_names += stat
 
-        # Store teams stats dataframe
-        data["teams_stats"] = teams_stats_df
+        gk_columns_names = self.headers["gk_header"]
 
-        # Store fixtures over which data was collated
-        data['played_fixtures'] = played_fixtures
+        # Fixtures and teams of each query
+        filtered = [self.fixtures_filter(**options) for options in queries]
+        windowed = [list(options.keys()) == ["gameweek_range"] for options in queries]
+        self.count("queries", len(queries))
+        clock.lap("filter")
+
+        # Position of each fixture among the season's played fixtures
+        season_fixtures = self.fixture_table["played"].reset_index(drop=True)
+        fixture_positions = self.fixture_table["positions"]
+
+        def positions(played_fixtures):
+            return fixture_positions[played_fixtures["squad_a"] + " v " + played_fixtures["squad_b"]].to_numpy()
+
+        # Reports of every fixture and team queried, outside gameweek windows, are read once for all queries
+        shared = [(positions(played_fixtures), team_list)
+                  for (played_fixtures, team_list), window in zip(filtered, windowed) if not window]
+        if shared:
+            all_matches = self.match_lister(season_fixtures.loc[np.unique(np.concatenate([p for p, _ in shared]))],
+                                            sorted(set().union(*[team_list for _, team_list in shared])))
+            self.count("fixtures_read", len({report[0] for report in all_matches["reports"]}))
+            clock.lap("read")
+
+        # Team names are categorical like 'player' and 'place'(see 'compact_stats'), over every team of the season
+        teams = pd.CategoricalDtype(sorted(self.players.keys()))
+
+        results = []
+        for options, (played_fixtures, team_list), window in zip(queries, filtered, windowed):
+            # data dictionary to store players and teams's stats
+            data = {}
+
+            # Collate data for teams mentioned in team list, if empty, get for all teams
+            for team in team_list:
+                # Collate player names and initialise a dataframe
+                player_names = self.players[team]["outfield"] + \
+                    self.players[team]["goalkeeper"]
+                plyr_stats_df = pd.DataFrame(
+                    sorted(player_names), columns=['player'])
 
-        number_of_fixtures = len(played_fixtures.index)
+                # Create player stats dataframe with specified column names and player names and fill with zero.
+                # Positions are counted in position and place columns, 'place' is the one played in most
+                plyr_stats_df = plyr_stats_df.reindex(
+                    columns=[column for column in plyr_column_names if column != "position"] + EXTRAS + POSITION_COLUMNS
+                    + PLACE_COLUMNS, fill_value=0).assign(place="Nil")
 
-        # DATA COLLECTION FOR EACH FIXTURE IN 'played_fixtures'
-        for index in range(number_of_fixtures):
-            # Get home and away teams corresponding to fixture
-            squads = (played_fixtures["squad_a"][index],
-                      played_fixtures["squad_b"][index])
+                # Store player stats dataframe
+                data[team] = {"player_stats": plyr_stats_df}
 
-            # Get score and gameweek for fixture
-            score = played_fixtures["score"][index].split('–')
-            gameweek = played_fixtures["gameweek"][index]
+                # Collate goalkeeper names
+                gk_names = self.players[team]["goalkeeper"]
+                gk_stats_df = pd.DataFrame(sorted(gk_names), columns=["player"])
 
-            # Read FPL data for corresponding gameweek
-            fpl_data = pd.read_csv(
-                f"data/Fantasy Premier League/20{self.season}-{self.season + 1} gws/gw{gameweek}.csv", encoding="ISO-8859-1")
-
-            # Given every season after 17/18 season had a different way of storing names of players (presence of '_' and number in 'name' column)
-            # Process it to align with names gotten from 'players'
-            if self.season >= 18:
-                names = [name.split("_") for name in list(fpl_data["name"])]
-                names = [n[0] + ' ' + n[1]
-                         if len(n) > 1 else n[0] for n in names]
-                fpl_data["name"] = names
-            else:
-                names = [name.replace("_", ' ')
-                         for name in list(fpl_data["name"])]
-                fpl_data["name"] = names
+                # Create goalkeeper stats dataframe with specified column names and goalkeeper names and fill with zero
+                gk_stats_df = gk_stats_df.reindex(
+                    columns=gk_columns_names+["appearances"], fill_value=0)
 
-            # Path to report folder corresponding to fixture
-            path = f"data/Premier League/reports/20{self.season}-{self.season + 1}/{squads[0]} v {squads[1]}"
+                # Store goalkeeper stats dataframe
+                data[team]["gk_stats"] = gk_stats_df
 
-            is_home = True  # help decipher between home and away team in fixture to seperate data collection for team data
+            # Create teams stats dataframe with specified column names and team names and fill with zero
+            teams_stats_df = pd.DataFrame({"team_name": pd.Categorical(sorted(team_list), dtype=teams)})
+            teams_stats_df = teams_stats_df.reindex(
+                columns=["team_name"]+list(TEAM_STATS_TEMPLATE.keys()), fill_value=0)
 
-            for squad in squads:
-                if squad in team_list:
-                    # Collate match_info stats which includes substitutes information
-                    squad_stats_df = pd.read_csv(
-                        f"{path}/{squad} stats.csv")
-                    with open(f"{path}/match_info.json", encoding="utf-8") as match_file:
-                        match_info = json.load(match_file)
+            # Initialise specified columns to empty dictionaries
+            for column in ["formation(s)", "manager(s)", "form", "home_form", "away_form"]:
+                teams_stats_df[column] = [[] for _ in range(len(team_list))]
 
-                    subs = match_info["substitutes"][squad]
+            # Store teams stats dataframe
+            data["teams_stats"] = teams_stats_df
 
-                    # PLAYER STATS
-                    # Player names corresponding to team currently be checked
-                    plyr_names = sorted(list(squad_stats_df["player"]))
-
-                    for name in plyr_names:
-                        # # input age for player
-                        filtr = (data[squad]["player_stats"]["player"] == name)
-                        sq_filtr = (squad_stats_df["player"] == name)
-                        fpl_fltr = (fpl_data["name"] == name)
-
-                        if filtr.any():
-                            # update stats for each player
-                            for column in plyr_column_names:
-                                # specifies columns that are not string-based
-                                if column not in ["player", "position", "age"]:
-                                    data[squad]["player_stats"].loc[filtr,
-                                                                    column] += float(squad_stats_df.loc[sq_filtr, column])
-                                    if column == "minutes":
-                                        mins = float(
-                                            squad_stats_df.loc[sq_filtr, column])
-                                        if mins > 60:  # check if minutes played in match are more than 60
-                                            data[squad]["player_stats"].loc[filtr,
-                                                                            "played_60"] += 1
-
-                                        # if player was not subbed in, player started match, thus increment 'starts'
-                                        if name not in list(subs.values()):
-                                            data[squad]["player_stats"].loc[filtr,
-                                                                            "starts"] += 1
-                                        else:  # player was subbed in, increment 'sub_ins'
-                                            data[squad]["player_stats"].loc[filtr,
-                                                                            "sub_ins"] += 1
-
-                                        # player among those subbed out, increment 'sub_outs'
-                                        if name in list(subs.keys()):
-                                            data[squad]["player_stats"].loc[filtr,
-                                                                            "sub_outs"] += 1
-
-                                else:
-                                    if column == "age":  # input age for player
-                                        age = data[squad]["player_stats"].loc[filtr,
-                                                                              column].values
-                                        if age == 0:
-                                            age_string = squad_stats_df.loc[sq_filtr, column].astype(
-                                                "str").values
-                                            data[squad]["player_stats"].loc[filtr,
-                                                                            column] = age_string
-
-                                    elif column == "position":  # input position for each player
-                                        positions = data[squad]["player_stats"].loc[filtr, column].to_dict(
-                                        )
-                                        row_num = list(positions.keys())[0]
-                                        positions = positions[row_num]
-
-                                        # Collating position played by player in match
-                                        pstn = squad_stats_df.loc[sq_filtr, column].values.tolist(
-                                        )
-                                        pstns = pstn[0].split(",")
-
-                                        for p in pstns:
-                                            if p not in list(positions.keys()):
-                                                positions[p] = 1
-                                            else:
-                                                positions[p] += 1
-
-                            # Increment appearances for player
-                            data[squad]["player_stats"].loc[filtr,
-                                                            "appearances"] += 1
-
-                            # FPL related data
-                            for column in extras[5:-1]:
-                                value = fpl_data.loc[fpl_fltr, column].values
-                                if len(value) == 1:
-                                    if column != 'value':  # increment value of column, if not 'value' column
-                                        data[squad]["player_stats"].loc[filtr,
-                                                                        column] += float(value)
-                                    else:  # if 'value' column, calculate value change and store 'value'
-                                        prev_value = float(
-                                            data[squad]["player_stats"].loc[filtr, column].values)
-                                        data[squad]["player_stats"].loc[filtr, 'value_change'] = (
-                                            float(value) - prev_value)
-                                        data[squad]["player_stats"].loc[filtr, column] = float(
-                                            value)
-
-                    # GOALKEEPER STATS
-                    # Goalkeeper name(s) corresponding to team currently be checked
-                    gk_squad_stats_df = pd.read_csv(
-                        f"{path}/{squad} gk_stats.csv")
-                    glkpr_names = sorted(list(gk_squad_stats_df["player"]))
-
-                    for name in glkpr_names:
-                        # Filter squad data by goalkeeper name
-                        filtr = (data[squad]["gk_stats"]["player"] == name)
-                        sq_filtr = (gk_squad_stats_df["player"] == name)
-
-                        for column in gk_columns_names:
-                            if column not in ["player", "age"]:
-                                data[squad]["gk_stats"].loc[filtr,
-                                                            column] += float(gk_squad_stats_df.loc[sq_filtr, column])
-                            else:
-                                if column == "age":  # input age for player
-                                    age = data[squad]["gk_stats"].loc[filtr,
-                                                                      column].values
-                                    if age == 0:
-                                        age_string = gk_squad_stats_df.loc[sq_filtr, column].astype(
-                                            "str").values
-                                        data[squad]["gk_stats"].loc[filtr,
-                                                                    column] = age_string
-
-                        data[squad]["gk_stats"].loc[filtr, "appearances"] += 1
-
-                    # Collate manager for each team
-                    mngrs = (
-                        match_info["managers_captains"][0].split(": ")[-1],
-                        match_info["managers_captains"][2].split(": ")[-1]
-                    )
-                    mngrs = {squads[i]: mngrs[i] for i in range(2)}
-
-                    # Collate manager for each team
-                    pssn = match_info["possession"]
-                    pssn = {squads[i]: pssn[i] for i in range(2)}
-
-                    # Store formations used by team
-                    frmtns = list(match_info["formations"].values())
-                    frmtns = {squads[i]: frmtns[i] for i in range(2)}
-
-                    # Store xG for each team
-                    xgs = match_info["score_xgs"]
-                    xgs = {squads[i]: xgs[i] for i in range(2)}
-
-                    tm_filtr = (data["teams_stats"]["team_name"] == squad)
-
-                    data["teams_stats"].loc[tm_filtr,
-                                            "pct_possession"] += int(pssn[squad])
-
-                    # Collate and store manager for each team in list
-                    managers = data["teams_stats"].loc[tm_filtr,
-                                                       "manager(s)"].values
-                    if mngrs[squad] not in managers.tolist()[0]:
-                        managers[0].append(mngrs[squad])
-                    data["teams_stats"].loc[tm_filtr, "manager(s)"] = managers
-
-                    # Collate and store formations used by each team in list
-                    formations = data["teams_stats"].loc[tm_filtr,
-                                                         "formation(s)"].values
-                    if frmtns[squad] not in formations.tolist()[0]:
-                        formations[0].append(frmtns[squad])
-                    data["teams_stats"].loc[tm_filtr,
-                                            "formation(s)"] = formations
-
-                    data["teams_stats"].loc[tm_filtr,
-                                            "xG"] += float(xgs[squad])
-
-                    # score additions
-                    result = None
-                    if is_home:  # if team is at home, increment corresponding home stats
-                        data["teams_stats"].loc[tm_filtr,
-                                                "goals_for"] += int(score[0])
-                        data["teams_stats"].loc[tm_filtr,
-                                                "goals_against"] += int(score[1])
-                        data["teams_stats"].loc[tm_filtr, "cleansheets"] = data["teams_stats"].loc[tm_filtr,
-                                                                                                   "cleansheets"] + 1 if int(score[1]) == 0 else data["teams_stats"].loc[tm_filtr, "cleansheets"]
-                        data["teams_stats"].loc[tm_filtr, "home_cleansheets"] = data["teams_stats"].loc[tm_filtr,
-                                                                                                        "home_cleansheets"] + 1 if int(score[1]) == 0 else data["teams_stats"].loc[tm_filtr, "home_cleansheets"]
-                        data["teams_stats"].loc[tm_filtr,
-                                                "home_goals_for"] += int(score[0])
-                        data["teams_stats"].loc[tm_filtr,
-                                                "home_goals_against"] += int(score[1])
-
-                        # Determine results and append points accordingly
-                        if score[0] > score[1]:
-                            result = 'W'
-                            data["teams_stats"].loc[tm_filtr, "wins"] += 1
-                            data["teams_stats"].loc[tm_filtr, "home_wins"] += 1
-                            data["teams_stats"].loc[tm_filtr, "pts"] += 3
-                            data["teams_stats"].loc[tm_filtr, "home_pts"] += 3
-
-                        elif score[0] == score[1]:
-                            result = 'D'
-                            data["teams_stats"].loc[tm_filtr, "draws"] += 1
-                            data["teams_stats"].loc[tm_filtr, "home_draws"] += 1
-                            data["teams_stats"].loc[tm_filtr, "pts"] += 1
-                            data["teams_stats"].loc[tm_filtr, "home_pts"] += 1
-
-                        else:
-                            result = 'L'
-                            data["teams_stats"].loc[tm_filtr, "losses"] += 1
-                            data["teams_stats"].loc[tm_filtr, "home_losses"] += 1
-
-                        # Form data stores form for the last 5 home matches
-                        h_form = data["teams_stats"].loc[tm_filtr,
-                                                         "home_form"].values
-                        if len(h_form.tolist()[0]) == 5:
-                            h_form[0] = h_form[0][1:] + [result]
-                        else:
-                            h_form[0].append(result)
-                        data["teams_stats"].loc[tm_filtr, "home_form"] = h_form
-
-                    else:  # if team is at away, increment corresponding away stats
-                        data["teams_stats"].loc[tm_filtr,
-                                                "goals_for"] += int(score[1])
-                        data["teams_stats"].loc[tm_filtr,
-                                                "goals_against"] += int(score[0])
-                        data["teams_stats"].loc[tm_filtr, "cleansheets"] = data["teams_stats"].loc[tm_filtr,
-                                                                                                   "cleansheets"] + 1 if int(score[0]) == 0 else data["teams_stats"].loc[tm_filtr, "cleansheets"]
-                        data["teams_stats"].loc[tm_filtr, "away_cleansheets"] = data["teams_stats"].loc[tm_filtr,
-                                                                                                        "away_cleansheets"] + 1 if int(score[1]) == 0 else data["teams_stats"].loc[tm_filtr, "away_cleansheets"]
-                        data["teams_stats"].loc[tm_filtr,
-                                                "away_goals_for"] += int(score[1])
-                        data["teams_stats"].loc[tm_filtr,
-                                                "away_goals_against"] += int(score[0])
-
-                        # Determine results and append points accordingly
-                        if score[1] > score[0]:
-                            result = 'W'
-                            data["teams_stats"].loc[tm_filtr, "wins"] += 1
-                            data["teams_stats"].loc[tm_filtr, "away_wins"] += 1
-                            data["teams_stats"].loc[tm_filtr, "pts"] += 3
-                            data["teams_stats"].loc[tm_filtr, "away_pts"] += 3
-
-                        elif score[1] == score[0]:
-                            result = 'D'
-                            data["teams_stats"].loc[tm_filtr, "draws"] += 1
-                            data["teams_stats"].loc[tm_filtr, "away_draws"] += 1
-                            data["teams_stats"].loc[tm_filtr, "pts"] += 1
-                            data["teams_stats"].loc[tm_filtr, "away_pts"] += 1
-
-                        else:
-                            result = 'L'
-                            data["teams_stats"].loc[tm_filtr, "losses"] += 1
-                            data["teams_stats"].loc[tm_filtr, "away_losses"] += 1
-
-                        # Form data stores form for the last 5 away matches
-                        a_form = data["teams_stats"].loc[tm_filtr,
-                                                         "away_form"].values
-                        if len(a_form.tolist()[0]) == 5:
-                            a_form[0] = a_form[0][1:] + [result]
-                        else:
-                            a_form[0].append(result)
-                        data["teams_stats"].loc[tm_filtr, "away_form"] = a_form
-
-                    form = data["teams_stats"].loc[tm_filtr, "form"].values
-                    if len(form.tolist()[0]) == 5:
-                        form[0] = form[0][1:] + [result]
-                    else:
-                        form[0].append(result)
-                    data["teams_stats"].loc[tm_filtr, "form"] = form
+            # Store fixtures over which data was collated
+            data['played_fixtures'] = played_fixtures.astype({"squad_a": teams, "squad_b": teams})
+            clock.lap("setup")
 
-                    data["teams_stats"].loc[tm_filtr, "matches_played"] += 1
+            if window:
+                # A window of gameweeks is the difference between the season's cumulative totals at its ends
+                totals = self.gameweek_totals(*self.gameweek_bounds(options["gameweek_range"]))
+                clock.lap("window")
 
-                is_home = False
+            else:
+                matches = self.match_slicer(
+                    all_matches, positions(played_fixtures), team_list)
+                totals = self.totals_lister(matches)
+                clock.lap("totals")
+
+                totals["teams_stats"] = self.team_stats_lister(
+                    self.team_match_lister(matches["reports"], season_fixtures), team_list)
+                clock.lap("team_stats")
+
+            for column in totals["teams_stats"].columns:
+                data["teams_stats"][column] = totals["teams_stats"][column].reindex(
+                    data["teams_stats"]["team_name"]).values
+
+            # Players and goalkeepers without a match keep their zeros
+            for team in set(team_list):
+                for stats_key in ["player_stats", "gk_stats"]:
+                    stats_df = data[team][stats_key]
+                    team_stats = totals[stats_key][totals[stats_key].index.get_level_values(
+                        "squad") == team].droplevel("squad")
+                    team_totals = team_stats.reindex(stats_df["player"], fill_value=0).reset_index(drop=True)
+                    if "place" in team_totals.columns:
+                        team_totals["place"] = team_totals["place"].where(
+                            stats_df["player"].isin(team_stats.index).to_numpy(), "Nil")
+                    data[team][stats_key] = pd.concat([stats_df.drop(columns=team_totals.columns), team_totals],
+                                                      axis=1)[stats_df.columns]
+                    clock.lap({"player_stats": "players", "gk_stats": "goalkeepers"}[stats_key])
 
             # team totals: columns are summed and added to the 'team_stats'
             team_totals = {}
@@ -591,39 +1699,46 @@ class PlayerData:
 
             for stat in stats_total:
                 data["teams_stats"][stat] = team_totals[stat]
+            clock.lap("team_stats")
+
+            for key, value in data.items():
+                if key not in ['teams_stats', 'played_fixtures']:
+                    total_aerials = value["player_stats"]["aerials_lost"] + \
+                        value["player_stats"]["aerials_won"]  # total aerials is sum of aerials won and lost
+                    value["player_stats"]["aerials_won_pct"] = (
+                        value["player_stats"]["aerials_won"] / total_aerials)  # calculate aerials won percentage
+
+                    dribble_tackles = value["player_stats"]["dribble_tackles"] + \
+                        value["player_stats"]["dribbled_past"] # total dribble tackles is sum of dribble tackles and dribbles past
+                    value["player_stats"]["dribble_tackles_pct"] = (
+                        value["player_stats"]["dribble_tackles"] / dribble_tackles) # calculate dribble tackles percentage
+
+                    value["player_stats"]['dribbles_completed_pct'] = (
+                        value["player_stats"]['dribbles_completed'] / value["player_stats"]['dribbles']) # calculate dribbles completed percentage
+
+                    value["player_stats"]['passes_pct'] = (
+                        value["player_stats"]['passes_completed'] / value["player_stats"]['passes']) # calculate passes completed percentage
+                    value["player_stats"]['passes_pct_medium'] = (
+                        value["player_stats"]['passes_completed_medium'] / value["player_stats"]['passes_medium']) # calculate passes medium completed percentage
+                    value["player_stats"]['passes_pct_long'] = (
+                        value["player_stats"]['passes_completed_long'] / value["player_stats"]['passes_long']) # calculate passes long completed percentage
+
+                    value["player_stats"]['passes_received_pct'] = (
+                        value["player_stats"]['passes_received'] / value["player_stats"]['pass_targets']) # calculate passed received percentage
+                    value["player_stats"]['pressure_regain_pct'] = (
+                        value["player_stats"]['pressure_regains'] / value["player_stats"]['pressures']) # calculate pressure regain percentage
+
+                    # Fill NaNs to zeros
+                    value["player_stats"].fillna(0, inplace=True)
+
+                    # if player change is greater than 30, this implies there has not been any change in value
+                    value["player_stats"]["value_change"] = np.where(
+                        value["player_stats"]["value_change"] > 30, 0, value["player_stats"]["value_change"])
+
+                    value["player_stats"] = compact_stats(value["player_stats"])
+                    value["gk_stats"] = compact_stats(value["gk_stats"])
+
+            clock.lap("ratios")
+            results.append(data)
 
-        for key, value in data.items():
-            if key not in ['teams_stats', 'played_fixtures']:
-                total_aerials = value["player_stats"]["aerials_lost"] + \
-                    value["player_stats"]["aerials_won"]  # total aerials is sum of aerials won and lost
-                value["player_stats"]["aerials_won_pct"] = (
-                    value["player_stats"]["aerials_won"] / total_aerials)  # calculate aerials won percentage
-
-                dribble_tackles = value["player_stats"]["dribble_tackles"] + \
-                    value["player_stats"]["dribbled_past"] # total dribble tackles is sum of dribble tackles and dribbles past
-                value["player_stats"]["dribble_tackles_pct"] = (
-                    value["player_stats"]["dribble_tackles"] / dribble_tackles) # calculate dribble tackles percentage
-
-                value["player_stats"]['dribbles_completed_pct'] = (
-                    value["player_stats"]['dribbles_completed'] / value["player_stats"]['dribbles']) # calculate dribbles completed percentage
-
-                value["player_stats"]['passes_pct'] = (
-                    value["player_stats"]['passes_completed'] / value["player_stats"]['passes']) # calculate passes completed percentage
-                value["player_stats"]['passes_pct_medium'] = (
-                    value["player_stats"]['passes_completed_medium'] / value["player_stats"]['passes_medium']) # calculate passes medium completed percentage
-                value["player_stats"]['passes_pct_long'] = (
-                    value["player_stats"]['passes_completed_long'] / value["player_stats"]['passes_long']) # calculate passes long completed percentage
-
-                value["player_stats"]['passes_received_pct'] = (
-                    value["player_stats"]['passes_received'] / value["player_stats"]['pass_targets']) # calculate passed received percentage
-                value["player_stats"]['pressure_regain_pct'] = (
-                    value["player_stats"]['pressure_regains'] / value["player_stats"]['pressures']) # calculate pressure regain percentage
-
-                # Fill NaNs to zeros
-                value["player_stats"].fillna(0, inplace=True)
-
-                # if player change is greater than 30, this implies there has not been any change in value
-                value["player_stats"]["value_change"] = np.where(
-                    value["player_stats"]["value_change"] > 30, 0, value["player_stats"]["value_change"])
-
-        return data
+        return results
@@ -0,0 +1,213 @@
+import json
+import os
+import shutil
+import time
+
+import pandas as pd
+
+from catalog import COMPETITION, catalog_path, season_name
+
+# Columnar copy of the match reports, one dataset per season of a competition with a partition per gameweek and table:
+# data/<competition>/store/<season>/<table>/gameweek=<n>/part.parquet
+TABLES = ["match_info", "player_stats", "gk_stats", "shot_stats"]
+# Columns of the report .csv files holding text. They are read as text so every partition stores them with the same
+# type, e.g. a shot's minute is '45+2' in stoppage time and would otherwise be read as a number in files without one
+TEXT_COLUMNS = ["minute", "player", "squad", "position", "age", "nationality", "outcome", "body_part", "notes",
+                "sca_1_player", "sca_1_type", "sca_2_player", "sca_2_type"]
+
+
+def store_path(season, competition=COMPETITION):
+    """Folder holding the store of a season"""
+    return catalog_path("store", season, competition)
+
+
+def store_partitions(season, table, competition=COMPETITION):
+    """
+    Written partitions of a table of a season's store. Folders of partitions being written, or left by a write that
+    failed, hold no 'part.parquet' and are skipped
+
+    :return: dict, gameweek -> partition folder, in gameweek order
+    """
+
+    table_path = f"{store_path(season, competition)}/{table}"
+    if not os.path.isdir(table_path):
+        return {}
+
+    partitions = {}
+    for name in os.listdir(table_path):
+        key, _, value = name.partition("=")
+        if key == "gameweek" and value.isdigit() and os.path.isfile(f"{table_path}/{name}/part.parquet"):
+            partitions[int(value)] = f"{table_path}/{name}"
+
+    return dict(sorted(partitions.items()))
+
+
+def store_exists(season, competition=COMPETITION):
+    """Whether a season has a store"""
+    return len(store_partitions(season, "match_info", competition)) > 0
+
+
+def reports_path(season, competition=COMPETITION):
+    """Folder holding the report folders of a season, as written by data_retriever or as read by PlayerData"""
+    path = catalog_path("reports", season, competition)
+    if not os.path.isdir(path):
+        path = catalog_path("reports_short", season, competition)
+
+    return path
+
+
+def report_tables(fixture, report):
+    """
+    Rows of each store table for one fixture
+
+    :param
+        fixture: str -> 'squad_a v squad_b'
+        report: dict -> 'match_info'(dict), 'shot_stats'(pandas DataFrame), 'player_stats' and 'gk_stats'(dict of team
+            name -> pandas DataFrame), as returned by 'data_retriever.parse_match_report' or 'folder_report'
+    """
+
+    tables = {
+        "match_info": pd.DataFrame({"fixture": [fixture], "match_info": [json.dumps(report["match_info"])]}),
+        "shot_stats": report["shot_stats"].assign(fixture=fixture)
+    }
+    for table in ["player_stats", "gk_stats"]:
+        tables[table] = pd.concat([df.assign(fixture=fixture, squad=team) for team, df in report[table].items()],
+                                  ignore_index=True)
+
+    return tables
+
+
+def csv_read(file_path):
+    """Reads a report .csv file, with the columns of TEXT_COLUMNS as text"""
+    return pd.read_csv(file_path, dtype={column: str for column in TEXT_COLUMNS})
+
+
+def folder_report(folder_path):
+    """Reads a report folder into the form returned by 'data_retriever.parse_match_report'"""
+    with open(f"{folder_path}/match_info.json", encoding="utf-8") as match_file:
+        match_info = json.load(match_file)
+
+    teams = list(match_info["formations"].keys())
+    return {
+        "match_info": match_info,
+        "shot_stats": csv_read(f"{folder_path}/shot_stats.csv"),
+        "player_stats": {team: csv_read(f"{folder_path}/{team} stats.csv") for team in teams},
+        "gk_stats": {team: csv_read(f"{folder_path}/{team} gk_stats.csv") for team in teams}
+    }
+
+
+def store_write(season, gameweek, reports, competition=COMPETITION):
+    """
+    Adds fixtures to the gameweek partitions of a season's store, replacing rows of fixtures already stored
+
+    reports: dict -> fixture('squad_a v squad_b') -> report(see 'report_tables')
+    """
+
+    new_tables = [report_tables(fixture, report)
+                  for fixture, report in reports.items()]
+
+    for table in TABLES:
+        table_path = f"{store_path(season, competition)}/{table}"
+        partition = f"{table_path}/gameweek={gameweek}"
+        # The partition is written into a sibling folder and moved into place, the previous one kept aside until then
+        partition_tmp = f"{table_path}/.gameweek={gameweek}.tmp"
+        partition_old = f"{table_path}/.gameweek={gameweek}.old"
+
+        # A write interrupted between both moves leaves the previous partition aside, it is put back first
+        if not os.path.isfile(f"{partition}/part.parquet") and os.path.isfile(f"{partition_old}/part.parquet"):
+            shutil.rmtree(partition, ignore_errors=True)
+            os.replace(partition_old, partition)
+
+        frames = []
+        if os.path.isfile(f"{partition}/part.parquet"):
+            stored = pd.read_parquet(f"{partition}/part.parquet")
+            frames.append(stored[~stored["fixture"].isin(reports.keys())])
+        frames += [tables[table] for tables in new_tables]
+
+        df = pd.concat(frames, ignore_index=True)
+        shutil.rmtree(partition_tmp, ignore_errors=True)
+        os.makedirs(partition_tmp)
+        try:
+            df.to_parquet(f"{partition_tmp}/part.parquet", index=False)
+        except BaseException:
+            shutil.rmtree(partition_tmp, ignore_errors=True)
+            raise
+
+        shutil.rmtree(partition_old, ignore_errors=True)
+        if os.path.isdir(partition):
+            os.replace(partition, partition_old)
+        os.replace(partition_tmp, partition)
+        shutil.rmtree(partition_old, ignore_errors=True)
+
+
+def store_read(season, gameweeks=None, tables=TABLES, competition=COMPETITION):
+    """
+    Reads tables of a season's store, only opening the partitions of 'gameweeks'(all when None)
+
+    :return: dict, table -> pandas DataFrame with a 'gameweek' column
+    """
+
+    data = {}
+    for table in tables:
+        frames = []
+        for gameweek, partition in store_partitions(season, table, competition).items():
+            if gameweeks is None or gameweek in gameweeks:
+                df = pd.read_parquet(f"{partition}/part.parquet")
+                frames.append(df.assign(gameweek=gameweek))
+
+        data[table] = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+            columns=["fixture", "gameweek"])
+
+    return data
+
+
+def store_fixtures(season, competition=COMPETITION):
+    """Fixtures held in a season's store"""
+    if not store_exists(season, competition):
+        return set()
+
+    return set(store_read(season, tables=["match_info"], competition=competition)["match_info"]["fixture"])
+
+
+def store_convert(season, fixtures=None, remove_folders=False, competition=COMPETITION):
+    """
+    Copies report folders of a season into its store
+
+    :param
+        season: int -> season to convert
+        fixtures: list | None -> fixtures('squad_a v squad_b') to copy, all played fixtures when None
+        remove_folders: bool -> delete the report folders of each gameweek once its partitions are written. Kept
+            otherwise
+        competition: str -> competition of the season, see 'catalog'
+    """
+
+    start = time.perf_counter()
+    fixtures_df = pd.read_csv(catalog_path("fixtures", season, competition)).dropna()
+    fixtures_df["fixture"] = fixtures_df["squad_a"] + " v " + fixtures_df["squad_b"]
+    if fixtures is not None:
+        fixtures_df = fixtures_df[fixtures_df["fixture"].isin(fixtures)]
+
+    path = reports_path(season, competition)
+    converted = []
+    files = 0
+    for gameweek, gameweek_df in fixtures_df.groupby("gameweek"):
+        reports = {}
+        for fixture in gameweek_df["fixture"]:
+            folder_path = f"{path}/{fixture}"
+            try:
+                reports[fixture] = folder_report(folder_path)
+            except (FileNotFoundError, KeyError, ValueError):
+                continue  # fixture not downloaded or incomplete
+            files += len(os.listdir(folder_path))
+
+        if reports:
+            store_write(season, int(gameweek), reports, competition)
+            converted += list(reports.keys())
+
+            # Only folders whose rows are written are removed, a failed write leaves them to be converted again
+            if remove_folders:
+                for fixture in reports:
+                    shutil.rmtree(f"{path}/{fixture}")
+
+    elapsed = time.perf_counter() - start
+    print(f"{season_name(season)}: {len(converted)} fixtures({files} files) stored in {elapsed:.1f}s")
@@ -0,0 +1,168 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+
+CACHE_PATH = "data/cache"
+CACHE_MAX_SIZE = 2 * 1024 ** 3  # bytes kept on disk before least recently used pages are evicted
+INDEX_SAVE_EVERY = 100  # pages stored between writes of the index, reads are only saved along with them
+
+
+class ResponseCache:
+    """
+    On-disk cache for raw page responses.
+
+    Page bodies are stored once per content hash under 'objects/', and 'index.json' maps each url to its content hash,
+    size, time fetched, time last read and time to live(ttl) in seconds. A ttl of None means the page never expires.
+    When the cache grows past 'max_size' bytes, the least recently read pages are evicted.
+
+    The index is kept in memory and written every 'save_every' pages stored, by 'flush' and when the process exits.
+    Bodies are written as they are stored, so an index lost to a crash only costs downloading its pages again.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_size=CACHE_MAX_SIZE, save_every=INDEX_SAVE_EVERY):
+        self.path = path
+        self.max_size = max_size
+        self.save_every = save_every
+        self.index = None  # loaded on first use
+        self.size = 0  # bytes of the bodies in 'index', each counted once
+        self.references = {}  # content hash -> number of urls whose body it is
+        self.unsaved = 0  # pages stored since the index was last written
+        self.dirty = False  # whether the index changed since it was last written
+        self.lock = threading.RLock()
+        atexit.register(self.flush)
+
+    def _load(self):
+        if self.index is None:
+            try:
+                with open(f"{self.path}/index.json", encoding="utf-8") as index_file:
+                    self.index = json.load(index_file)
+            except FileNotFoundError:
+                self.index = {}
+
+            self.size = 0
+            self.references = {}
+            for entry in self.index.values():
+                self._reference(entry)
+
+    def _reference(self, entry):
+        if entry["hash"] not in self.references:
+            self.size += entry["size"]
+        self.references[entry["hash"]] = self.references.get(entry["hash"], 0) + 1
+
+    def _dereference(self, entry):
+        """Forgets an entry removed from the index, returning whether no other url shares its body"""
+        self.references[entry["hash"]] -= 1
+        if self.references[entry["hash"]]:
+            return False
+
+        del self.references[entry["hash"]]
+        self.size -= entry["size"]
+        return True
+
+    def _save(self):
+        os.makedirs(self.path, exist_ok=True)
+        tmp_path = f"{self.path}/index.json.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as index_file:
+            json.dump(self.index, index_file)
+        os.replace(tmp_path, f"{self.path}/index.json")
+        self.unsaved = 0
+        self.dirty = False
+
+    def flush(self):
+        """Writes the index, with the times pages were last read, if it changed since it was last written"""
+        with self.lock:
+            if self.index is not None and self.dirty:
+                self._save()
+
+    def _object_path(self, digest):
+        return f"{self.path}/objects/{digest[:2]}/{digest}"
+
+    def get(self, url):
+        """Returns the cached body of 'url', None if it is not cached or has expired"""
+        with self.lock:
+            self._load()
+            entry = self.index.get(url)
+            if entry is None:
+                return None
+
+            if entry["ttl"] is not None and time.time() - entry["fetched"] > entry["ttl"]:
+                return None
+
+            try:
+                with open(self._object_path(entry["hash"]), "rb") as obj:
+                    body = obj.read()
+            except FileNotFoundError:
+                self._dereference(self.index.pop(url))
+                self.dirty = True
+                return None
+
+            entry["last_access"] = time.time()
+            self.dirty = True
+
+        return body.decode("utf-8")
+
+    def put(self, url, body, ttl=None):
+        """Stores 'body' as the response of 'url' for 'ttl' seconds(None never expires)"""
+        data = body.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        obj_path = self._object_path(digest)
+
+        with self.lock:
+            self._load()
+            if not os.path.exists(obj_path):
+                os.makedirs(os.path.dirname(obj_path), exist_ok=True)
+                with open(f"{obj_path}.tmp", "wb") as obj:
+                    obj.write(data)
+                os.replace(f"{obj_path}.tmp", obj_path)
+
+            now = time.time()
+            if url in self.index:
+                self._dereference(self.index[url])
+            self.index[url] = {
+                "hash": digest,
+                "size": len(data),
+                "fetched": now,
+                "last_access": now,
+                "ttl": ttl
+            }
+            self._reference(self.index[url])
+            self.dirty = True
+            self._evict()
+
+            self.unsaved += 1
+            if self.unsaved >= self.save_every:
+                self._save()
+
+    def _evict(self):
+        """Removes least recently read pages until the cache fits in 'max_size'"""
+        # Pages sharing a body are only counted once, see 'references'
+        if self.size <= self.max_size:
+            return
+
+        for url in sorted(self.index, key=lambda u: self.index[u]["last_access"]):
+            if self.size <= self.max_size:
+                break
+            entry = self.index.pop(url)
+            if self._dereference(entry):
+                try:
+                    os.remove(self._object_path(entry["hash"]))
+                except FileNotFoundError:
+                    pass
+        self.dirty = True
+
+    def clear(self):
+        """Removes every cached page"""
+        with self.lock:
+            self._load()
+            for entry in self.index.values():
+                try:
+                    os.remove(self._object_path(entry["hash"]))
+                except FileNotFoundError:
+                    pass
+            self.index = {}
+            self.size = 0
+            self.references = {}
+            self._save()
@@ -0,0 +1,114 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from catalog import COMPETITION, catalog_path, season_name
+
+STAGES = ["fetch", "parse", "frame", "write"]  # network, BeautifulSoup parsing, DataFrame building, file writing
+COUNTERS = ["bytes_downloaded", "cache_hits", "pages_parsed", "rows_written"]
+
+
+def empty_record():
+    return {**{f"{stage}_seconds": 0.0 for stage in STAGES}, **{counter: 0 for counter in COUNTERS}}
+
+
+class StageClock:
+    """
+    Splits the time spent in a function between stages, accumulating the seconds since the previous lap in 'timings'
+
+    'timings' may be None, in which case nothing is recorded.
+    """
+
+    def __init__(self, timings=None):
+        self.timings = timings
+        self.last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        if self.timings is not None:
+            self.timings[stage] = self.timings.get(stage, 0.0) + now - self.last
+        self.last = now
+
+
+class ScrapeStats:
+    """
+    Wall time per stage and bytes downloaded, pages parsed and rows written by a scrape, per fixture and per season.
+
+    Stages are those of STAGES. Times and counts not belonging to a fixture(season, squad and schedule pages) only
+    count towards the season totals. Requests, retries, failures and latency of each endpoint are those the FetchSession
+    'session' sent during the run. Safe to share between threads.
+    """
+
+    def __init__(self, season, competition=COMPETITION, session=None):
+        self.season = season
+        self.competition = competition
+        self.session = session
+        self.session_start = session.stats() if session is not None else {}
+        self.start = time.perf_counter()
+        self.started_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.totals = empty_record()
+        self.fixtures = {}
+        self.lock = threading.Lock()
+
+    def add(self, fixture=None, **values):
+        """Adds 'values'(e.g. fetch_seconds=0.5, rows_written=40) to the season totals and to those of 'fixture'"""
+        with self.lock:
+            records = [self.totals]
+            if fixture is not None:
+                records.append(self.fixtures.setdefault(fixture, empty_record()))
+            for record in records:
+                for key, value in values.items():
+                    record[key] += value
+
+    def add_timings(self, timings, fixture=None):
+        """Adds the seconds per stage collected by a StageClock"""
+        self.add(fixture, **{f"{stage}_seconds": seconds for stage, seconds in timings.items()})
+
+    @contextmanager
+    def stage(self, name, fixture=None):
+        """Times the body of a 'with' block as stage 'name'"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(fixture, **{f"{name}_seconds": time.perf_counter() - start})
+
+    def summary(self):
+        """Returns the season totals, the totals of each fixture and the elapsed seconds of the run"""
+        with self.lock:
+            return {
+                "season": season_name(self.season),
+                "started_at": self.started_at,
+                "elapsed_seconds": time.perf_counter() - self.start,
+                "totals": dict(self.totals),
+                "endpoints": self.session.stats_since(self.session_start) if self.session is not None else {},
+                "fixtures": {fixture: dict(record) for fixture, record in sorted(self.fixtures.items())}
+            }
+
+    def save(self):
+        """Writes the summary to the season's scrape stats folder, one JSON file per run, and returns its path"""
+        summary = self.summary()
+        folder_path = catalog_path("scrape_stats", self.season, self.competition)
+        os.makedirs(folder_path, exist_ok=True)
+        file_path = f"{folder_path}/{summary['started_at'].replace(':', '')}.json"
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(summary, file, indent=4)
+
+        return file_path
+
+    def report(self):
+        summary = self.summary()
+        totals = summary["totals"]
+        stages = ", ".join(f"{stage} {totals[f'{stage}_seconds']:.1f}s" for stage in STAGES)
+        print(f"{stages}; {totals['bytes_downloaded'] / 1024 ** 2:.1f} MB downloaded, {totals['cache_hits']} cache hits, "
+              f"{totals['pages_parsed']} pages parsed, {totals['rows_written']} rows written")
+        for name, record in summary["endpoints"].items():
+            print(f"    {name}: {record['requests']} requests, {record['retries']} retries, {record['failures']} failures, "
+                  f"latency mean {record['mean_latency']:.2f}s max {record['max_latency']:.2f}s")
+
+    def finish(self):
+        """Prints the season totals and saves the summary, see 'save'"""
+        self.report()
+        print(f"Scrape stats saved to '{self.save()}'")
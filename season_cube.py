@@ -0,0 +1,70 @@
+import json
+import os
+
+import numpy as np
+
+from catalog import COMPETITION, catalog_path
+
+# Player stats of a season as a players x fixtures x stats array, stored as .npy and opened memory-mapped so processes
+# reading it share the OS page cache: data/<competition>/cube/<season>/stats.npy with its indexes in index.json
+CUBE_DTYPE = np.float32  # stats of fixtures a player did not play in are NaN
+
+
+def cube_path(season, competition=COMPETITION):
+    """Folder holding the cube of a season"""
+    return catalog_path("cube", season, competition)
+
+
+def cube_exists(season, competition=COMPETITION):
+    """Whether a season has a cube"""
+    return os.path.exists(f"{cube_path(season, competition)}/index.json")
+
+
+def cube_write(season, competition, fill, players, fixtures, stats, sources=None):
+    """
+    Writes the cube of a season, replacing any previous one
+
+    :param
+        competition: str -> competition of the season, see 'catalog'
+        fill: callable -> fills the array it is given, of shape (len(players), len(fixtures), len(stats))
+        players: list -> [squad, player] of each row, players of a squad next to one another
+        fixtures: list -> {'fixture': 'squad_a v squad_b', 'fixture_index', 'gameweek'} of each column, in gameweek
+            order
+        stats: list -> name of each stat
+        sources: dict | None -> fingerprints of the files the cube is built from, saved to tell when it is out of date
+    """
+
+    folder_path = cube_path(season, competition)
+    os.makedirs(folder_path, exist_ok=True)
+
+    cube = np.lib.format.open_memmap(f"{folder_path}/stats.npy.tmp", mode="w+", dtype=CUBE_DTYPE,
+                                     shape=(len(players), len(fixtures), len(stats)))
+    cube[:] = np.nan
+    fill(cube)
+    cube.flush()
+    del cube
+    os.replace(f"{folder_path}/stats.npy.tmp", f"{folder_path}/stats.npy")
+
+    # Rows of each squad, as [start, stop)
+    teams = {}
+    for row, (squad, _) in enumerate(players):
+        teams.setdefault(squad, [row, row])[1] = row + 1
+
+    with open(f"{folder_path}/index.json.tmp", "w", encoding="utf-8") as index_file:
+        json.dump({"players": players, "fixtures": fixtures, "stats": stats, "teams": teams, "sources": sources},
+                  index_file, ensure_ascii=False)
+    os.replace(f"{folder_path}/index.json.tmp", f"{folder_path}/index.json")
+
+
+def cube_read(season, competition=COMPETITION):
+    """
+    Opens the cube of a season read-only and memory-mapped
+
+    :return: (numpy memmap, dict of its indexes as written by 'cube_write')
+    """
+
+    folder_path = cube_path(season, competition)
+    with open(f"{folder_path}/index.json", encoding="utf-8") as index_file:
+        index = json.load(index_file)
+
+    return np.load(f"{folder_path}/stats.npy", mmap_mode="r"), index
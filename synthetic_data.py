@@ -0,0 +1,265 @@
+import argparse
+import json
+import os
+import random
+
+import numpy as np
+import pandas as pd
+
+from catalog import COMPETITION, catalog_path, competition_info, fpl_id_names, season_name
+from data_retriever import COLUMNS, STATS_CATEGORIES
+
+# Writes a synthetic data tree laid out like the one 'data_retriever' scrapes, for benchmarks and for trying changes
+# without the real data: headers, scores and fixtures, player information, match report folders and FPL gameweeks
+
+SYNTHETIC_SEASONS = range(17, 21)  # seasons read by 'dataset_generator'
+SYNTHETIC_TEAMS = 20
+SYNTHETIC_SQUAD_SIZE = 25  # outfield players and goalkeepers of a squad
+SQUAD_GOALKEEPERS = 3
+MATCHDAY_SQUAD = 14  # players of a squad taking part in a match, 3 of them as substitutes
+GK_COLUMNS = ["player", "age", "minutes", "gk_shots_on_target_against", "gk_goals_against", "gk_saves", "gk_save_pct",
+              "gk_psxg"]
+SH_COLUMNS = ["minute", "player", "squad", "xg_shot", "psxg_shot", "outcome", "distance", "body_part"]
+FPL_COLUMNS = ["influence", "creativity", "threat", "ict_index", "total_points", "transfers_balance", "transfers_in",
+               "transfers_out", "bonus", "bps", "value"]
+POSITION_CHOICES = ["GK", "DF", "CB", "LB", "RB", "WB", "MF", "DM", "CM", "LM", "RM", "AM", "FW", "LW", "RW"]
+FIRST_NAMES = ["Adam", "Ben", "Callum", "Daniel", "Emile", "Fabio", "Gabriel", "Harry", "Ivan", "James", "Kai", "Luke",
+               "Mason", "Nathan", "Oliver", "Pedro", "Reece", "Sam", "Tom", "Wilfried"]
+LAST_NAMES = ["Adams", "Barnes", "Cole", "Dias", "Evans", "Fernandes", "Gomez", "Hughes", "Ings", "James", "Kane",
+              "Lamptey", "Mount", "Neves", "Ogbonna", "Pope", "Rice", "Saka", "Traore", "Walker"]
+
+
+def player_names(count):
+    """'count' distinct two word names, FPL names being split on their first '_'"""
+    names = []
+    for indx in range(count):
+        first = FIRST_NAMES[indx % len(FIRST_NAMES)]
+        last = LAST_NAMES[indx // len(FIRST_NAMES) % len(LAST_NAMES)]
+        repeat = indx // (len(FIRST_NAMES) * len(LAST_NAMES))
+        names.append(f"{first} {last}{repeat if repeat else ''}")
+
+    return names
+
+
+def fixture_rounds(teams):
+    """
+    Double round robin of 'teams' by the circle method, each team playing once per gameweek
+
+    :return: list, (squad_a, squad_b) pairs of each gameweek
+    """
+
+    teams = list(teams) + ([None] if len(teams) % 2 else [])
+    rounds = []
+    for _ in range(len(teams) - 1):
+        rounds.append([(teams[i], teams[-1 - i]) for i in range(len(teams) // 2)
+                       if teams[i] is not None and teams[-1 - i] is not None])
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+
+    return rounds + [[(b, a) for a, b in pairs] for pairs in rounds]
+
+
+def headers_write(competition=COMPETITION):
+    """Writes the player, goalkeeper and shots stats header information"""
+    path = catalog_path("headers", competition=competition)
+    os.makedirs(path, exist_ok=True)
+
+    categories = np.array_split(np.array(COLUMNS), len(STATS_CATEGORIES))
+    with open(f"{path}/headers.json", "w", encoding="utf-8") as hdr:
+        json.dump({category: list(map(str, columns)) for category, columns in zip(STATS_CATEGORIES, categories)}, hdr)
+    with open(f"{path}/gk_headers.json", "w", encoding="utf-8") as gk_hdr:
+        json.dump({"List": GK_COLUMNS}, gk_hdr)
+    with open(f"{path}/sh_headers.json", "w", encoding="utf-8") as sh_hdr:
+        json.dump({"List": SH_COLUMNS}, sh_hdr)
+
+
+def player_stats_table(rng, names, positions, minutes):
+    """Player stats of a squad in a match, COLUMNS of the players in 'names'"""
+    table = {}
+    for column in COLUMNS:
+        if column == "player":
+            table[column] = names
+        elif column == "position":
+            table[column] = positions
+        elif column == "age":
+            table[column] = [f"{rng.integers(17, 36)}-{rng.integers(0, 365):03d}" for _ in names]
+        elif column == "minutes":
+            table[column] = minutes
+        elif "_pct" in column:
+            table[column] = np.round(rng.uniform(0, 100, len(names)), 1)
+        else:
+            table[column] = rng.poisson(2, len(names)).astype(float)
+
+    table = pd.DataFrame(table)
+
+    # Stats fbref leaves blank now and then
+    blanks = rng.random(table.shape) < 0.005
+    blanks[:, :COLUMNS.index("minutes") + 1] = False
+    return table.mask(blanks)
+
+
+def season_write(season, teams=SYNTHETIC_TEAMS, squad_size=SYNTHETIC_SQUAD_SIZE, played_gameweeks=None, seed=0,
+                 competition=COMPETITION):
+    """
+    Writes a synthetic season of a competition to its paths in 'catalog': scores and fixtures, player information, a
+    report folder for each played fixture and, for competitions with FPL data, an FPL file for each played gameweek
+
+    :param
+        season: int -> season written, e.g. 20 for 2020-2021
+        teams: int -> number of teams, each playing every other team home and away
+        squad_size: int -> players of each team, SQUAD_GOALKEEPERS of them goalkeepers
+        played_gameweeks: int | None -> gameweeks with results and reports, every gameweek when None
+        seed: int -> seed the season is drawn from, together with 'season'
+        competition: str -> competition of the season
+    """
+
+    if squad_size < MATCHDAY_SQUAD + SQUAD_GOALKEEPERS:
+        raise Exception(f"'squad_size' expects at least {MATCHDAY_SQUAD + SQUAD_GOALKEEPERS} players")
+
+    rng = np.random.default_rng([seed, season])
+    shuffle = random.Random(seed * 100 + season)
+    team_names = [f"{LAST_NAMES[indx % len(LAST_NAMES)]}{indx // len(LAST_NAMES) or ''} Town" for indx in range(teams)]
+    names = iter(player_names(teams * squad_size))
+    squads = {}
+    for team in team_names:
+        squad = [next(names) for _ in range(squad_size)]
+        squads[team] = {"outfield": squad[SQUAD_GOALKEEPERS:], "goalkeeper": squad[:SQUAD_GOALKEEPERS]}
+    elements = {name: element for element, name in enumerate(
+        (name for squad in squads.values() for name in squad["goalkeeper"] + squad["outfield"]), start=1)}
+
+    reports_path = catalog_path("reports", season, competition)
+    os.makedirs(reports_path, exist_ok=True)
+    for kind in ["fixtures", "players"]:
+        os.makedirs(os.path.dirname(catalog_path(kind, season, competition)), exist_ok=True)
+    with open(catalog_path("players", season, competition), "w", encoding="utf-8") as file:
+        json.dump(squads, file, ensure_ascii=False)
+
+    # Scores and fixtures, one gameweek a week from August
+    rounds = fixture_rounds(team_names)
+    shuffle.shuffle(rounds)
+    played_gameweeks = len(rounds) if played_gameweeks is None else played_gameweeks
+    start = pd.Timestamp(f"{2000 + season}-08-10")
+    rows = []
+    for gameweek, pairs in enumerate(rounds, start=1):
+        for indx, (squad_a, squad_b) in enumerate(pairs):
+            played = gameweek <= played_gameweeks
+            rows.append({
+                "gameweek": gameweek,
+                "date": (start + pd.Timedelta(days=7 * (gameweek - 1) + indx % 3)).strftime("%Y-%m-%d"),
+                "squad_a": squad_a,
+                "score": f"{rng.poisson(1.5)}–{rng.poisson(1.2)}" if played else None,
+                "squad_b": squad_b,
+                "match_report": f"/en/matches/{season}{len(rows):05d}/{squad_a}-{squad_b}" if played else None
+            })
+    fixtures = pd.DataFrame(rows)
+    fixtures.to_csv(catalog_path("fixtures", season, competition), index=False)
+
+    # Match report folders
+    for fixture in fixtures.dropna().itertuples():
+        squad_a, squad_b = fixture.squad_a, fixture.squad_b
+        goals = [int(goal) for goal in fixture.score.split("–")]
+        report_path = f"{reports_path}/{squad_a} v {squad_b}"
+        os.makedirs(report_path, exist_ok=True)
+
+        substitutes = {}
+        shots = []
+        for side, squad in enumerate([squad_a, squad_b]):
+            goalkeeper = squads[squad]["goalkeeper"][int(rng.integers(0, 2))]
+            outfield = list(rng.choice(squads[squad]["outfield"], MATCHDAY_SQUAD - 1, replace=False))
+            starters, bench = [goalkeeper] + outfield[:10], outfield[10:]
+            off = list(rng.choice(starters[1:], len(bench), replace=False))
+            substitutes[squad] = dict(zip(off, bench))
+
+            minute_off = {name: int(rng.integers(46, 90)) for name in off}
+            players = starters + bench
+            positions = ["GK"] + [",".join(rng.choice(POSITION_CHOICES[1:], int(rng.integers(1, 3)), replace=False))
+                                  for _ in players[1:]]
+            minutes = [minute_off.get(name, 90) for name in starters] + \
+                      [90 - minute_off[name] for name in off]
+            player_stats_table(rng, players, positions, minutes).to_csv(f"{report_path}/{squad} stats.csv",
+                                                                         index=False)
+
+            against = goals[1 - side]
+            on_target = against + int(rng.integers(0, 5))
+            pd.DataFrame({
+                "player": [goalkeeper],
+                "age": [f"{rng.integers(20, 36)}-{rng.integers(0, 365):03d}"],
+                "minutes": [90],
+                "gk_shots_on_target_against": [on_target],
+                "gk_goals_against": [against],
+                "gk_saves": [on_target - against],
+                "gk_save_pct": [round(100 * (on_target - against) / on_target, 1) if on_target else None],
+                "gk_psxg": [round(rng.uniform(0, 3), 1)]
+            }).to_csv(f"{report_path}/{squad} gk_stats.csv", index=False)
+
+            for shot in range(goals[side] + int(rng.integers(3, 12))):
+                shots.append([int(rng.integers(1, 91)), players[int(rng.integers(1, len(players)))], squad,
+                              round(rng.uniform(0, 0.8), 2), round(rng.uniform(0, 0.9), 2),
+                              "Goal" if shot < goals[side] else shuffle.choice(["Saved", "Off Target", "Blocked"]),
+                              int(rng.integers(3, 35)), shuffle.choice(["Right Foot", "Left Foot", "Head"])])
+
+        pd.DataFrame(sorted(shots), columns=SH_COLUMNS).to_csv(f"{report_path}/shot_stats.csv", index=False)
+        possession = int(rng.integers(30, 71))
+        with open(f"{report_path}/match_info.json", "w", encoding="utf-8") as file:
+            json.dump({
+                "managers_captains": [f"Manager: {squad_a} Manager", f"Captain: {squads[squad_a]['outfield'][0]}",
+                                      f"Manager: {squad_b} Manager", f"Captain: {squads[squad_b]['outfield'][0]}"],
+                "score_xgs": [f"{rng.uniform(0, 3.5):.1f}", f"{rng.uniform(0, 3.5):.1f}"],
+                "formations": {squad_a: shuffle.choice(["4-4-2", "4-3-3", "3-5-2"]),
+                               squad_b: shuffle.choice(["4-2-3-1", "4-3-3", "5-3-2"])},
+                "possession": [str(possession), str(100 - possession)],
+                "substitutes": substitutes
+            }, file, ensure_ascii=False)
+
+    if not competition_info(competition)["fpl"]:
+        return
+
+    # FPL gameweeks, every player of every squad. Names end with their element id in seasons listed so in the catalog
+    fpl_path = catalog_path("fpl_gameweeks", season, competition)
+    os.makedirs(fpl_path, exist_ok=True)
+    fpl_names = [name.replace(" ", "_") + (f"_{element}" if fpl_id_names(season, competition) else "")
+                 for name, element in elements.items()]
+    values = rng.integers(40, 130, len(elements))
+    for gameweek in sorted(fixtures.dropna()["gameweek"].unique()):
+        values = np.clip(values + rng.integers(-2, 3, len(values)), 35, 150)
+        fpl_data = pd.DataFrame({"name": fpl_names, "element": list(elements.values()),
+                                 **{column: rng.integers(0, 100, len(elements)) for column in FPL_COLUMNS}})
+        fpl_data["value"] = values
+        fpl_data.to_csv(f"{fpl_path}/gw{gameweek}.csv", index=False)
+
+
+def synthetic_data(root, seasons=SYNTHETIC_SEASONS, teams=SYNTHETIC_TEAMS, squad_size=SYNTHETIC_SQUAD_SIZE,
+                   played_gameweeks=None, seed=0, competition=COMPETITION):
+    """
+    Writes a synthetic data tree under 'root', see 'season_write'. The data tree is read from the folder PlayerData
+    and 'dataset_generator' are run in, so they are run in 'root' to read it
+    """
+
+    cwd = os.getcwd()
+    os.makedirs(root, exist_ok=True)
+    os.chdir(root)
+    try:
+        headers_write(competition)
+        for season in seasons:
+            season_write(season, teams=teams, squad_size=squad_size, played_gameweeks=played_gameweeks, seed=seed,
+                         competition=competition)
+            print(f"{competition} {season_name(season)} written")
+    finally:
+        os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Write a synthetic fbref and FPL data tree")
+    parser.add_argument("root", help="folder the data tree is written to")
+    parser.add_argument("--seasons", type=int, nargs="+", default=list(SYNTHETIC_SEASONS),
+                        help="seasons written, e.g. 20 for 2020-2021")
+    parser.add_argument("--teams", type=int, default=SYNTHETIC_TEAMS)
+    parser.add_argument("--squad-size", type=int, default=SYNTHETIC_SQUAD_SIZE)
+    parser.add_argument("--played-gameweeks", type=int, default=None,
+                        help="gameweeks with results, every gameweek by default")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--competition", default=COMPETITION)
+    args = parser.parse_args()
+
+    synthetic_data(args.root, seasons=args.seasons, teams=args.teams, squad_size=args.squad_size,
+                   played_gameweeks=args.played_gameweeks, seed=args.seed, competition=args.competition)
@@ -0,0 +1,82 @@
+import os
+
+import pandas as pd
+import pytest
+
+import report_store
+
+pytest.importorskip("pyarrow", exc_type=ImportError)  # also skipped when installed but unusable
+
+SEASON = 20
+
+
+def report(home, away):
+    """Report of a fixture between 'home' and 'away', in the form read by 'report_store.folder_report'"""
+    def stats():
+        return pd.DataFrame({"player": ["A", "B"], "position": ["FW", "GK"], "age": ["25-100", "30-001"],
+                             "minutes": [90, 90]})
+
+    return {
+        "match_info": {"formations": {home: "4-4-2", away: "4-3-3"}, "substitutes": {home: {}, away: {}}},
+        "shot_stats": pd.DataFrame({"minute": ["45+2"], "player": ["A"], "squad": [home]}),
+        "player_stats": {home: stats(), away: stats()},
+        "gk_stats": {home: stats(), away: stats()}
+    }
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # Store paths are relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    report_store.store_write(SEASON, 1, {"Arsenal v Chelsea": report("Arsenal", "Chelsea")})
+
+
+def failed_write(gameweek, reports):
+    """Runs 'store_write' with every parquet write failing"""
+    def to_parquet(self, *args, **kwargs):
+        raise OSError("disk full")
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(pd.DataFrame, "to_parquet", to_parquet)
+        with pytest.raises(OSError):
+            report_store.store_write(SEASON, gameweek, reports)
+
+
+def test_failed_write_of_a_new_partition_is_not_read(store):
+    failed_write(2, {"Everton v Fulham": report("Everton", "Fulham")})
+
+    assert report_store.store_exists(SEASON)
+    assert report_store.store_fixtures(SEASON) == {"Arsenal v Chelsea"}
+    data = report_store.store_read(SEASON)
+    assert set(data["player_stats"]["gameweek"]) == {1}
+    for table in report_store.TABLES:
+        assert sorted(os.listdir(f"{report_store.store_path(SEASON)}/{table}")) == ["gameweek=1"]
+
+
+def test_failed_write_keeps_the_previous_partition(store):
+    failed_write(1, {"Everton v Fulham": report("Everton", "Fulham")})
+
+    assert report_store.store_fixtures(SEASON) == {"Arsenal v Chelsea"}
+    assert report_store.store_read(SEASON)["shot_stats"]["minute"].tolist() == ["45+2"]
+
+
+def test_interrupted_move_is_recovered(store):
+    # Previous partition moved aside, new one not yet moved into place
+    table_path = f"{report_store.store_path(SEASON)}/match_info"
+    os.replace(f"{table_path}/gameweek=1", f"{table_path}/.gameweek=1.old")
+    os.makedirs(f"{table_path}/.gameweek=1.tmp")
+
+    assert report_store.store_partitions(SEASON, "match_info") == {}
+    report_store.store_write(SEASON, 1, {"Everton v Fulham": report("Everton", "Fulham")})
+
+    assert report_store.store_fixtures(SEASON) == {"Arsenal v Chelsea", "Everton v Fulham"}
+    assert sorted(os.listdir(table_path)) == ["gameweek=1"]
+
+
+def test_store_without_written_partitions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(f"{report_store.store_path(SEASON)}/match_info/gameweek=3")
+
+    assert not report_store.store_exists(SEASON)
+    assert report_store.store_fixtures(SEASON) == set()
+    assert len(report_store.store_read(SEASON)["match_info"]) == 0